@@ -0,0 +1,334 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .client import AerospikeClient
+from .protocol.general import MessageType, pack_header
+from .protocol.message import (
+    CITRUSLEAF_EPOCH,
+    SIZE_FORMAT,
+    Info1Flags,
+    Info2Flags,
+    Info3Flags,
+    Message,
+    OperationTypes,
+)
+from .protocol.result_code import ResultCode
+
+# Backup file is MAGIC followed by every record as a 4 bytes size and the
+# record message exactly as streamed by the scan (header, fields, operations),
+# so bins are kept in their wire format and never decoded.
+# Restore turns each record back into a write by patching its header and
+# operation types, writing with GENERATION_GT so records updated since the
+# backup (higher generation) are kept.
+MAGIC = b"AIOASBK1"
+# Operation type byte, right after the operation's size
+OPERATION_TYPE_OFFSET = SIZE_FORMAT.size
+# record_ttl of never expiring records, in responses (void time) and writes
+NO_EXPIRE_VOID_TIME = 0
+NO_EXPIRE_TTL = 0xFFFFFFFF
+
+
+@dataclass
+class BackupStats:
+    records: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class RestoreStats:
+    restored: int = 0
+    # Existing record had the same or a newer generation
+    skipped: int = 0
+    # Expired since the backup
+    expired: int = 0
+    failed: int = 0
+    result_codes: Counter = field(default_factory=Counter)
+
+
+async def backup(
+    client: AerospikeClient,
+    namespace: str,
+    set_name: str,
+    path: str,
+    bins: Optional[List[str]] = None,
+) -> BackupStats:
+    """
+    Streams the set (the whole namespace when set_name is empty) to path,
+    the file only appears once the scan is complete.
+    """
+    stats = BackupStats()
+    partial_path = f"{path}.part"
+    with open(partial_path, "wb", buffering=1 << 20) as f:
+        f.write(MAGIC)
+        async for record in client.scan_raw(namespace, set_name, bins):
+            f.write(SIZE_FORMAT.pack(len(record)))
+            f.write(record)
+            stats.records += 1
+            stats.bytes += SIZE_FORMAT.size + len(record)
+    os.replace(partial_path, path)
+    return stats
+
+
+def read_records(f: BinaryIO) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yields the records from the current position of f, with the file offset
+    right after each record
+    """
+    offset = f.tell()
+    while True:
+        size_data = f.read(SIZE_FORMAT.size)
+        if not size_data:
+            return
+        (size,) = SIZE_FORMAT.unpack(size_data)
+        record = f.read(size)
+        if len(record) != size:
+            raise ValueError(f"Truncated backup record at offset {offset}")
+        offset += SIZE_FORMAT.size + size
+        yield record, offset
+
+
+def restore_message(record: bytes, now: int) -> Optional[bytes]:
+    """
+    Converts a backed up record to a GENERATION_GT write of the same bins,
+    with its proto header. Returns None if the record expired since (now is
+    seconds since the citrusleaf epoch).
+    """
+    (
+        _size,
+        _info1,
+        _info2,
+        _info3,
+        _result_code,
+        generation,
+        void_time,
+        _transaction_ttl,
+        fields_count,
+        operations_count,
+    ) = Message.FORMAT.unpack_from(record)
+    if void_time == NO_EXPIRE_VOID_TIME:
+        ttl = NO_EXPIRE_TTL
+    elif void_time <= now:
+        return None
+    else:
+        ttl = void_time - now
+
+    message = bytearray(record)
+    Message.FORMAT.pack_into(
+        message,
+        0,
+        Message.FORMAT.size,
+        Info1Flags.EMPTY,
+        Info2Flags.WRITE | Info2Flags.GENERATION_GT,
+        Info3Flags.EMPTY,
+        0,
+        generation,
+        ttl,
+        1000,
+        fields_count,
+        operations_count,
+    )
+    offset = Message.FORMAT.size
+    for _i in range(fields_count):
+        offset += SIZE_FORMAT.size + SIZE_FORMAT.unpack_from(message, offset)[0]
+    for _i in range(operations_count):
+        message[offset + OPERATION_TYPE_OFFSET] = OperationTypes.WRITE
+        offset += SIZE_FORMAT.size + SIZE_FORMAT.unpack_from(message, offset)[0]
+    return pack_header(MessageType.MESSAGE, len(message)) + message
+
+
+class _Restore:
+    """
+    A reader queueing batches of writes, and writers pipelining them
+    """
+
+    def __init__(
+        self,
+        path: str,
+        writers: int,
+        batch_size: int,
+        state_path: Optional[str],
+    ) -> None:
+        self.path = path
+        self.writers = writers
+        self.batch_size = batch_size
+        self.state_path = state_path
+        self.stats = RestoreStats()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=2 * writers)
+        # Batch sequence -> file offset after it, for batches done out of order
+        # (None for failed ones)
+        self._done: Dict[int, Optional[int]] = {}
+        self._next_done = 0
+
+    def start_offset(self) -> int:
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return len(MAGIC)
+        with open(self.state_path) as f:
+            return json.load(f)["offset"]
+
+    async def read(self) -> None:
+        offset = self.start_offset()
+        with open(self.path, "rb", buffering=1 << 20) as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a backup file")
+            f.seek(offset)
+            now = int(time.time()) - CITRUSLEAF_EPOCH
+            sequence = 0
+            messages: List[bytes] = []
+            end = offset
+            for record, end in read_records(f):
+                message = restore_message(record, now)
+                if message is None:
+                    self.stats.expired += 1
+                    continue
+                messages.append(message)
+                if len(messages) == self.batch_size:
+                    await self.queue.put((sequence, end, messages))
+                    sequence += 1
+                    messages = []
+            await self.queue.put((sequence, end, messages))
+        for _ in range(self.writers):
+            await self.queue.put(None)
+
+    async def write(self, client: AerospikeClient) -> None:
+        while True:
+            batch = await self.queue.get()
+            if batch is None:
+                return
+            sequence, end, messages = batch
+            failed = False
+            if messages:
+                responses = await client.execute_raw(messages, "restore")
+                for response in responses:
+                    failed |= not self._count(response.result_code)
+            self._batch_done(sequence, None if failed else end)
+
+    def _count(self, result_code: int) -> bool:
+        """
+        Counts a write's result, returns whether the record is restored
+        """
+        if result_code == ResultCode.OK:
+            self.stats.restored += 1
+        elif result_code == ResultCode.GENERATION_ERROR:
+            self.stats.skipped += 1
+        else:
+            self.stats.failed += 1
+            self.stats.result_codes[result_code] += 1
+            return False
+        return True
+
+    def _batch_done(self, sequence: int, end: Optional[int]) -> None:
+        """
+        Saves the progress up to the first batch not done, end is None for
+        a batch with failed writes so progress stops before it for good.
+        """
+        self._done[sequence] = end
+        progress = None
+        while self._done.get(self._next_done) is not None:
+            progress = self._done.pop(self._next_done)
+            self._next_done += 1
+        if progress is not None and self.state_path is not None:
+            partial_path = f"{self.state_path}.part"
+            with open(partial_path, "w") as f:
+                json.dump({"offset": progress}, f)
+            os.replace(partial_path, self.state_path)
+
+
+async def restore(
+    clients: List[AerospikeClient],
+    path: str,
+    batch_size: int = 256,
+    state_path: Optional[str] = None,
+) -> RestoreStats:
+    """
+    Restores the backup with a writer per client, each pipelining batches of
+    batch_size writes, at most two batches per writer are held in memory.
+    The offset up to which every record is restored is saved to state_path
+    after each batch, and restore resumes from it when the file exists.
+    It stops before the first batch with failed writes, so running restore
+    again retries them (records restored since are skipped, their
+    generation being the same), the file is removed once none failed.
+    """
+    job = _Restore(path, len(clients), batch_size, state_path)
+    tasks = [asyncio.ensure_future(job.read())]
+    tasks += [asyncio.ensure_future(job.write(client)) for client in clients]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    if (
+        not job.stats.failed
+        and state_path is not None
+        and os.path.exists(state_path)
+    ):
+        os.remove(state_path)
+    return job.stats
+
+
+async def _main(args: argparse.Namespace) -> None:
+    connections = args.connections if args.command == "restore" else 1
+    clients = [
+        AerospikeClient(args.host, "", "", port=args.port)
+        for _ in range(connections)
+    ]
+    for client in clients:
+        await client.connect()
+    try:
+        if args.command == "backup":
+            stats = asdict(
+                await backup(
+                    clients[0], args.namespace, args.set, args.output, args.bins
+                )
+            )
+        else:
+            stats = asdict(
+                await restore(
+                    clients,
+                    args.input,
+                    args.batch_size,
+                    args.state or f"{args.input}.state",
+                )
+            )
+    finally:
+        for client in clients:
+            await client.close()
+    print(json.dumps(stats))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m aioaerospike.backup")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup_parser = commands.add_parser("backup", help="dump a set to a file")
+    backup_parser.add_argument("-n", "--namespace", required=True)
+    backup_parser.add_argument(
+        "-s", "--set", default="", help="whole namespace when not given"
+    )
+    backup_parser.add_argument("-o", "--output", required=True)
+    backup_parser.add_argument("--bins", nargs="+")
+
+    restore_parser = commands.add_parser(
+        "restore", help="restore a backup file"
+    )
+    restore_parser.add_argument("-i", "--input", required=True)
+    restore_parser.add_argument(
+        "--connections", type=int, default=4, help="parallel writers"
+    )
+    restore_parser.add_argument("--batch-size", type=int, default=256)
+    restore_parser.add_argument(
+        "--state",
+        help="progress file for resuming, <input>.state by default",
+    )
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
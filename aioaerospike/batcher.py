@@ -0,0 +1,194 @@
+from asyncio import (
+    Future,
+    Task,
+    TimerHandle,
+    ensure_future,
+    gather,
+    get_event_loop,
+)
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from .client import AerospikeClient
+from .exceptions import result_code_exception
+from .protocol.datatypes import AerospikeKeyType, AerospikeValueType
+from .protocol.message import (
+    DEFAULT_WRITE_POLICY,
+    Message,
+    WritePolicy,
+    delete_key,
+    increment,
+    put_key,
+)
+from .protocol.predexp import PredExp
+
+
+def _generation(response: Message) -> int:
+    return response.generation
+
+
+def _no_result(response: Message) -> None:
+    return None
+
+
+def _first_value(response: Message) -> Any:
+    operations = response.operations
+    return operations[0].data_bin.data.value if operations else None
+
+
+@dataclass
+class PendingCommand:
+    message: Message
+    future: Future
+    # Converts a successful response to the caller's result
+    result: Callable[[Message], Any]
+
+
+class WriteBatcher:
+    """
+    Coalesces writes issued by concurrent callers: commands submitted within
+    max_delay seconds (or until max_batch are pending) are pipelined to the
+    server in a single write, and each response is dispatched to its
+    caller's future.
+    Trades up to max_delay of latency for fewer syscalls and packets.
+    Commands are sent in submission order.
+    """
+
+    def __init__(
+        self,
+        client: AerospikeClient,
+        max_delay: float = 0.001,
+        max_batch: int = 256,
+    ) -> None:
+        self.client = client
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._pending: List[PendingCommand] = []
+        self._timer: Optional[TimerHandle] = None
+        self._flushes: Set[Task] = set()
+
+    async def __aenter__(self) -> "WriteBatcher":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def _submit(
+        self, message: Message, result: Callable[[Message], Any]
+    ) -> Future:
+        loop = get_event_loop()
+        future = loop.create_future()
+        self._pending.append(PendingCommand(message, future, result))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        task = ensure_future(self._flush(pending))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, pending: List[PendingCommand]) -> None:
+        try:
+            responses = await self.client._execute_many(
+                [command.message for command in pending], "batched_write"
+            )
+        except Exception as e:
+            for command in pending:
+                if not command.future.done():
+                    command.future.set_exception(e)
+            return
+        except BaseException:
+            # Flush cancelled (loop shutdown), callers would wait forever
+            for command in pending:
+                command.future.cancel()
+            raise
+        for command, response in zip(pending, responses):
+            if command.future.done():
+                continue
+            result_code = response.message.result_code
+            if result_code != 0:
+                command.future.set_exception(
+                    result_code_exception(result_code, write=True)
+                )
+            else:
+                command.future.set_result(command.result(response.message))
+
+    async def flush(self) -> None:
+        """
+        Sends the pending commands now and waits for all in flight batches
+        """
+        self._start_flush()
+        if self._flushes:
+            await gather(*self._flushes)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def _write(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        message: Message,
+        result: Callable[[Message], Any],
+    ) -> Any:
+        try:
+            return await self._submit(message, result)
+        finally:
+            self.client._invalidate_cached(namespace, set_name, key)
+
+    async def put_key(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        bin_: Dict[str, AerospikeValueType],
+        ttl: int = 0,
+        policy: WritePolicy = DEFAULT_WRITE_POLICY,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> int:
+        """
+        Same as AerospikeClient.put_key, returns the record's generation
+        """
+        message = put_key(namespace, set_name, key, bin_, ttl, policy, predexp)
+        return await self._write(namespace, set_name, key, message, _generation)
+
+    async def delete_key(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        policy: WritePolicy = DEFAULT_WRITE_POLICY,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> None:
+        message = delete_key(namespace, set_name, key, policy, predexp)
+        await self._write(namespace, set_name, key, message, _no_result)
+
+    async def increment(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        bin_name: str,
+        delta: Union[int, float] = 1,
+        return_value: bool = False,
+        ttl: int = 0,
+    ) -> Optional[Union[int, float]]:
+        """
+        Same as AerospikeClient.increment, the value is returned only when
+        return_value is set
+        """
+        message = increment(
+            namespace, set_name, key, {bin_name: delta}, return_value, ttl
+        )
+        result = _first_value if return_value else _no_result
+        return await self._write(namespace, set_name, key, message, result)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
+from .protocol.datatypes import AerospikeKeyType, data_to_aerospike_type
+
+CacheKey = Tuple[str, bytes]
+
+
+def cache_key(namespace: str, set_name: str, key: AerospikeKeyType) -> CacheKey:
+    return namespace, data_to_aerospike_type(key).digest(set_name)
+
+
+@dataclass
+class CachedRecord:
+    bins: Dict[str, Any]
+    generation: int
+    # monotonic time of the last read/revalidation from the server
+    fetched_at: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Stale entries confirmed unchanged by a header-only read
+    revalidations: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses + self.revalidations
+        return (self.hits + self.revalidations) / lookups if lookups else 0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+class ReadCache:
+    """
+    Client side LRU cache of whole records read with get_key,
+    keyed by (namespace, digest).
+    Entries are served for up to max_staleness seconds, after which they are
+    revalidated with a header-only read (cheap, no bin data) when revalidate
+    is set, or re-read otherwise.
+    Writes done through the same client invalidate the record's entry,
+    writes by other clients are visible after at most max_staleness.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        max_staleness: float = 1.0,
+        revalidate: bool = True,
+    ) -> None:
+        self.max_size = max_size
+        self.max_staleness = max_staleness
+        self.revalidate = revalidate
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, CachedRecord]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[CachedRecord]:
+        """
+        Returns the entry (fresh or stale) and marks it as recently used
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: CachedRecord) -> bool:
+        return monotonic() - entry.fetched_at < self.max_staleness
+
+    def put(self, key: CacheKey, bins: Dict[str, Any], generation: int) -> None:
+        self._entries[key] = CachedRecord(bins, generation, monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: CacheKey) -> None:
+        if self._entries.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,39 +1,149 @@
-from asyncio import StreamReader, StreamWriter, open_connection
+import random
+from asyncio import CancelledError, Lock, TimeoutError as AsyncTimeoutError
+from base64 import b64encode
 from functools import wraps
-from typing import Any, Dict, List, Optional
+from time import monotonic, perf_counter_ns
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from .cache import ReadCache, cache_key
+from .columnar import ColumnarResult
+from .connection import Connection, open_connection
+from .exceptions import (
+    CircuitOpenError,
+    ClientOverloadError,
+    UDFError,
+    raise_for_result_code,
+)
+from .metrics import ClientMetrics, CommandSample, NodeLoadSample
+from .overload import (
+    AdaptiveLimiter,
+    BreakerPolicy,
+    CircuitBreaker,
+    CircuitState,
+    LimitPolicy,
+)
 from .protocol.datatypes import AerospikeKeyType, AerospikeValueType
-from .protocol.general import AerospikeHeader, AerospikeMessage
+from .protocol.general import (
+    HEADER_FORMAT,
+    MESSAGE_TYPE_TO_CLASS,
+    AerospikeMessage,
+)
+from .protocol.info import InfoMessage
 from .protocol.message import (
+    DEFAULT_WRITE_POLICY,
+    INFO3_OFFSET,
+    RESULT_CODE_OFFSET,
+    SIZE_FORMAT,
+    TRANSACTION_TTL_OFFSET,
     Field,
+    FieldTypes,
     Info1Flags,
     Info2Flags,
     Info3Flags,
+    Message,
     Operation,
+    RecordHeader,
+    WritePolicy,
+    append,
+    apply,
     delete_key,
     get_key,
+    get_many,
+    increment,
     key_exists,
     operate,
+    prepend,
     put_key,
+    scan,
+    scan_apply,
+    touch,
+    void_time_to_ttl,
 )
+from .protocol.partition import PartitionStatus, partition_id
+from .protocol.predexp import PredExp
+from .protocol.result_code import CONGESTION_RESULT_CODES, ResultCode
+
+HEADER_SIZE = HEADER_FORMAT.size
+# Failures congesting the node, besides CONGESTION_RESULT_CODES
+# (cancellation is usually the caller's timeout)
+CONGESTION_ERRORS = (OSError, EOFError, CancelledError, AsyncTimeoutError)
 
 
 class AerospikeClientNotConnected(Exception):
     pass
 
 
+def _select_bins(
+    record: Dict[str, AerospikeValueType], bins: Optional[List[str]]
+) -> Dict[str, AerospikeValueType]:
+    """
+    Copies the record, so callers can't modify cached records
+    """
+    if bins is None:
+        return dict(record)
+    return {name: record[name] for name in bins if name in record}
+
+
+def _record_digest(record: Message) -> bytes:
+    return next(
+        field.data
+        for field in record.fields
+        if field.field_type == FieldTypes.DIGEST
+    )
+
+
+def _record_bins(record: Message) -> Dict[str, AerospikeValueType]:
+    return {
+        op.data_bin.name: op.data_bin.data.value for op in record.operations
+    }
+
+
 def require_connection(func):
     @wraps(func)
     async def wrapper(
         self: "AerospikeClient", *args: List[Any], **kwargs: Dict[Any, Any]
     ) -> Any:
-        if not self._reader or not self._writer:
+        if not self._connection:
             raise AerospikeClientNotConnected()
         return await func(self, *args, **kwargs)
 
     return wrapper
 
 
+def invalidates_cache(func):
+    """
+    Drops the record's read cache entry once the write is done,
+    also on failure as the write may have been applied.
+    """
+
+    @wraps(func)
+    async def wrapper(
+        self: "AerospikeClient",
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        *args: List[Any],
+        **kwargs: Dict[Any, Any],
+    ) -> Any:
+        try:
+            return await func(self, namespace, set_name, key, *args, **kwargs)
+        finally:
+            self._invalidate_cached(namespace, set_name, key)
+
+    return wrapper
+
+
 class AerospikeClient:
 
     __slots__ = [
@@ -42,8 +152,14 @@ class AerospikeClient:
         "_user",
         "_password",
         "_use_ssl",
-        "_reader",
-        "_writer",
+        "_use_streams",
+        "_connection",
+        "_connection_stale",
+        "_lock",
+        "_metrics",
+        "_read_cache",
+        "_limiter",
+        "_breaker",
     ]
 
     def __init__(
@@ -53,29 +169,399 @@ class AerospikeClient:
         password: str,
         use_ssl: bool = False,
         port: int = 3000,
+        metrics: Optional[ClientMetrics] = None,
+        read_cache: Optional[ReadCache] = None,
+        use_streams: bool = False,
+        limit_policy: Optional[LimitPolicy] = None,
+        breaker_policy: Optional[BreakerPolicy] = None,
     ):
         self.host: str = host
         self.port: int = port
         self._user: str = user
         self._password: str = password
         self._use_ssl: bool = use_ssl
-        self._reader: Optional[StreamReader] = None
-        self._writer: Optional[StreamWriter] = None
+        self._use_streams: bool = use_streams
+        self._connection: Optional[Connection] = None
+        # A command was interrupted after sending, its reply may still arrive
+        self._connection_stale = False
+        self._lock: Optional[Lock] = None
+        self._metrics: Optional[ClientMetrics] = metrics
+        self._read_cache: Optional[ReadCache] = read_cache
+        self._limiter: Optional[AdaptiveLimiter] = (
+            AdaptiveLimiter(limit_policy) if limit_policy else None
+        )
+        self._breaker: Optional[CircuitBreaker] = (
+            CircuitBreaker(breaker_policy) if breaker_policy else None
+        )
+
+    @property
+    def node(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def metrics(self) -> Optional[ClientMetrics]:
+        """
+        Per node and command metrics, None unless given to the constructor.
+        """
+        return self._metrics
+
+    @property
+    def read_cache(self) -> Optional[ReadCache]:
+        """
+        get_key read cache, None unless given to the constructor.
+        """
+        return self._read_cache
+
+    @property
+    def limiter(self) -> Optional[AdaptiveLimiter]:
+        """
+        Node's adaptive concurrency limit, None without a limit policy.
+        """
+        return self._limiter
+
+    @property
+    def breaker(self) -> Optional[CircuitBreaker]:
+        """
+        Node's circuit breaker, None without a breaker policy.
+        """
+        return self._breaker
 
     async def connect(self):
-        self._reader, self._writer = await open_connection(self.host, self.port)
+        self._lock = Lock()
+        self._connection = await open_connection(
+            self.host, self.port, self._use_streams
+        )
+        self._connection_stale = False
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+        self._connection = None
+
+    async def _reopen(self) -> None:
+        """
+        Replaces the connection of an interrupted command, so its reply
+        isn't read by the next command. Called holding the lock.
+        """
+        try:
+            await self._connection.close()
+        except OSError:
+            pass
+        self._connection = await open_connection(
+            self.host, self.port, self._use_streams
+        )
+        self._connection_stale = False
+
+    def _invalidate_cached(
+        self, namespace: str, set_name: str, key: AerospikeKeyType
+    ) -> None:
+        if self._read_cache is not None:
+            self._read_cache.invalidate(cache_key(namespace, set_name, key))
+
+    async def _admit(self) -> Optional[float]:
+        """
+        Fails fast while the circuit is open and waits for a slot under the
+        concurrency limit, returns the start to pass to _settle
+        (None without limit and breaker policies).
+        """
+        if self._limiter is None and self._breaker is None:
+            return None
+        probe = False
+        try:
+            if self._breaker is not None:
+                probe = self._breaker.allow()
+            start = (
+                monotonic()
+                if self._limiter is None
+                else await self._limiter.acquire()
+            )
+        except BaseException as error:
+            if probe:
+                self._breaker.abort()
+            if isinstance(error, CircuitOpenError):
+                self._record_load("circuit_open")
+            elif isinstance(error, ClientOverloadError):
+                self._record_load("overload")
+            raise
+        self._record_load()
+        return start
+
+    def _settle(
+        self,
+        start: Optional[float],
+        result_codes: Iterable[int] = (),
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Releases the command's slot and records whether the node was
+        congested, after its response or failure
+        """
+        if start is None:
+            return
+        congested = isinstance(error, CONGESTION_ERRORS) or any(
+            code in CONGESTION_RESULT_CODES for code in result_codes
+        )
+        if self._limiter is not None:
+            self._limiter.release(start, congested)
+        if self._breaker is not None:
+            self._breaker.record(congested)
+        self._record_load()
+
+    def _record_load(self, shed: Optional[str] = None) -> None:
+        if self._metrics is None:
+            return
+        limiter = self._limiter
+        self._metrics.record_load(
+            NodeLoadSample(
+                node=self.node,
+                limit=int(limiter.limit) if limiter else 0,
+                in_flight=limiter.in_flight if limiter else 0,
+                queued=limiter.queued if limiter else 0,
+                circuit=(
+                    self._breaker.state
+                    if self._breaker
+                    else CircuitState.CLOSED
+                ),
+                shed=shed,
+            )
+        )
+
+    @require_connection
+    async def _request(self, message: Any, command: str) -> AerospikeMessage:
+        """
+        Sends a single message and parses its response, once admitted by
+        the limit and breaker policies.
+        """
+        start = await self._admit()
+        if start is None:
+            return await self._send(message, command)
+        try:
+            response = await self._send(message, command)
+        except BaseException as error:
+            self._settle(start, error=error)
+            raise
+        self._settle(start, (getattr(response.message, "result_code", 0),))
+        return response
+
+    async def _send(self, message: Any, command: str) -> AerospikeMessage:
+        """
+        Sends a single message and parses its response,
+        the connection is used by a single command at a time.
+        """
+        metrics = self._metrics
+        if metrics is None:
+            data = AerospikeMessage(message).pack()
+            async with self._lock:
+                if self._connection_stale:
+                    await self._reopen()
+                try:
+                    self._connection.write(data)
+                    await self._connection.drain()
+                    message_type, body = await self._connection.read_frame()
+                except BaseException:
+                    self._connection_stale = True
+                    raise
+            return AerospikeMessage(
+                MESSAGE_TYPE_TO_CLASS[message_type].parse(body)
+            )
+
+        start = perf_counter_ns()
+        data = AerospikeMessage(message).pack()
+        encoded = perf_counter_ns()
+        async with self._lock:
+            if self._connection_stale:
+                await self._reopen()
+            locked = perf_counter_ns()
+            try:
+                self._connection.write(data)
+                await self._connection.drain()
+                written = perf_counter_ns()
+                message_type, body = await self._connection.read_frame()
+            except BaseException:
+                self._connection_stale = True
+                raise
+            received = perf_counter_ns()
+        response = AerospikeMessage(
+            MESSAGE_TYPE_TO_CLASS[message_type].parse(body)
+        )
+        metrics.record(
+            CommandSample(
+                node=self.node,
+                command=command,
+                connection_wait=locked - encoded,
+                encode=encoded - start,
+                write=written - locked,
+                wait=received - written,
+                decode=perf_counter_ns() - received,
+                bytes_out=len(data),
+                bytes_in=HEADER_SIZE + len(body),
+                result_code=getattr(response.message, "result_code", 0),
+            )
+        )
+        return response
 
     @require_connection
-    async def _get_response(self) -> AerospikeMessage:
-        header_data = await self._reader.readexactly(
-            AerospikeHeader.FORMAT.sizeof()
+    async def _execute(
+        self, message: Message, command: str
+    ) -> AerospikeMessage:
+        return await self._request(message, command)
+
+    async def _execute_multi(
+        self,
+        message: Message,
+        command: str,
+        parse: Callable[[bytes], Any] = Message.parse,
+    ) -> AsyncIterator[Any]:
+        """
+        Sends a multi-record command (batch, scan) and yields the record
+        messages until the one flagged Info3Flags.LAST, each converted with
+        parse (pass bytes to get the raw record messages).
+        The connection is held until the iteration ends, so the client can't
+        be used for other commands while iterating. When the iteration stops
+        before the last message, the connection is replaced before the next
+        command as the rest of the response is still on its way.
+        """
+        start = perf_counter_ns()
+        data = AerospikeMessage(message).pack()
+        encoded = perf_counter_ns()
+        wait = decode = bytes_in = result_code = 0
+        admitted = await self._admit()
+        try:
+            async with self._lock:
+                if self._connection_stale:
+                    await self._reopen()
+                locked = perf_counter_ns()
+                try:
+                    self._connection.write(data)
+                    await self._connection.drain()
+                except BaseException:
+                    self._connection_stale = True
+                    raise
+                written = perf_counter_ns()
+                last = False
+                try:
+                    while not last:
+                        _, body = await self._connection.read_frame()
+                        received = perf_counter_ns()
+                        if not wait:
+                            wait = received - written
+                        bytes_in += HEADER_SIZE + len(body)
+                        records = []
+                        offset = 0
+                        while offset < len(body):
+                            if body[offset + INFO3_OFFSET] & Info3Flags.LAST:
+                                result_code = body[offset + RESULT_CODE_OFFSET]
+                                last = True
+                                break
+                            end = Message.skip(body, offset)
+                            records.append(parse(body[offset:end]))
+                            offset = end
+                        decode += perf_counter_ns() - received
+                        for record in records:
+                            yield record
+                    if result_code not in (
+                        ResultCode.OK,
+                        ResultCode.KEY_NOT_FOUND,
+                    ):
+                        raise_for_result_code(result_code)
+                finally:
+                    if not last:
+                        self._connection_stale = True
+                    if self._metrics is not None:
+                        self._metrics.record(
+                            CommandSample(
+                                node=self.node,
+                                command=command,
+                                connection_wait=locked - encoded,
+                                encode=encoded - start,
+                                write=written - locked,
+                                wait=wait,
+                                decode=decode,
+                                bytes_out=len(data),
+                                bytes_in=bytes_in,
+                                result_code=result_code,
+                            )
+                        )
+        except BaseException as error:
+            self._settle(admitted, (result_code,), error)
+            raise
+        self._settle(admitted, (result_code,))
+
+    @require_connection
+    async def _execute_many(
+        self, messages: List[Message], command: str
+    ) -> List[AerospikeMessage]:
+        """
+        Pipelines the messages over the connection in a single write,
+        responses are returned in the same order as the messages.
+        """
+        start = perf_counter_ns()
+        data = b"".join(
+            AerospikeMessage(message).pack() for message in messages
         )
-        header = AerospikeHeader.parse(header_data)
-        message_data = await self._reader.readexactly(header.length)
-        message = AerospikeMessage.parse(header_data + message_data)
-        return message
+        parsed = await self._execute_packed(data, len(messages), command, start)
+        return [AerospikeMessage(message) for message in parsed]
+
+    async def _execute_packed(
+        self,
+        data: bytes,
+        count: int,
+        command: str,
+        start: Optional[int] = None,
+    ) -> List[Message]:
+        """
+        Pipelines count already packed messages (with their proto headers)
+        in a single write, returns the responses in order.
+        start is when encoding began, for metrics.
+        """
+        admitted = await self._admit()
+        try:
+            parsed = await self._send_packed(data, count, command, start)
+        except BaseException as error:
+            self._settle(admitted, error=error)
+            raise
+        self._settle(admitted, (message.result_code for message in parsed))
+        return parsed
+
+    async def _send_packed(
+        self, data: bytes, count: int, command: str, start: Optional[int]
+    ) -> List[Message]:
+        encoded = perf_counter_ns()
+        async with self._lock:
+            if self._connection_stale:
+                await self._reopen()
+            locked = perf_counter_ns()
+            try:
+                self._connection.write(data)
+                await self._connection.drain()
+                written = perf_counter_ns()
+                frames = [
+                    await self._connection.read_frame() for _ in range(count)
+                ]
+            except BaseException:
+                self._connection_stale = True
+                raise
+            received = perf_counter_ns()
+        parsed = [Message.parse(body) for _, body in frames]
+        if self._metrics is not None:
+            self._metrics.record(
+                CommandSample(
+                    node=self.node,
+                    command=command,
+                    connection_wait=locked - encoded,
+                    encode=encoded - (start or encoded),
+                    write=written - locked,
+                    wait=received - written,
+                    decode=perf_counter_ns() - received,
+                    bytes_out=len(data),
+                    bytes_in=sum(HEADER_SIZE + len(body) for _, body in frames),
+                    result_code=max(m.result_code for m in parsed),
+                )
+            )
+        return parsed
 
     @require_connection
+    @invalidates_cache
     async def put_key(
         self,
         namespace: str,
@@ -83,57 +569,213 @@ class AerospikeClient:
         key: str,
         bin_: Dict[str, AerospikeValueType],
         ttl: int = 0,
-    ) -> None:
-        message = put_key(namespace, set_name, key, bin_)
-        data = AerospikeMessage(message).pack()
-        self._writer.write(data)
-        await self._writer.drain()
-        response = await self._get_response()
+        policy: WritePolicy = DEFAULT_WRITE_POLICY,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> int:
+        """
+        Writes the bins to the record according to the write policy,
+        returns the record's generation after the write.
+        When predexp is set, the write is applied only if the existing record
+        matches it (result code 27 otherwise).
+        """
+        message = put_key(namespace, set_name, key, bin_, ttl, policy, predexp)
+        response = await self._execute(message, "put_key")
         if response.message.result_code != 0:
-            raise Exception(
-                f"Unexpected result code {response.message.result_code}"
-            )
+            raise_for_result_code(response.message.result_code, write=True)
+        return response.message.generation
 
     @require_connection
-    async def get_key(self, namespace: str, set_name: str, key: str) -> Any:
-        message = get_key(namespace, set_name, key)
-        data = AerospikeMessage(message).pack()
-        self._writer.write(data)
-        await self._writer.drain()
-        response = await self._get_response()
+    async def get_key(
+        self,
+        namespace: str,
+        set_name: str,
+        key: str,
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> Any:
+        """
+        Returns a dict of the record's bins, only the given bins are sent
+        by the server when bins is set.
+        Records not matching predexp are returned as empty.
+        Served from the read cache when the client has one (predexp reads
+        always go to the server).
+        """
+        if self._read_cache is not None and not predexp:
+            return await self._cached_get_key(namespace, set_name, key, bins)
+        message = get_key(namespace, set_name, key, bins, predexp)
+        response = await self._execute(message, "get_key")
+        result_code = response.message.result_code
+        if result_code not in (ResultCode.OK, ResultCode.KEY_NOT_FOUND) and (
+            result_code != ResultCode.FILTERED_OUT or not predexp
+        ):
+            raise_for_result_code(result_code)
         return {
             op.data_bin.name: op.data_bin.data.value
             for op in response.message.operations
         }
 
+    async def _cached_get_key(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        bins: Optional[List[str]],
+    ) -> Dict[str, AerospikeValueType]:
+        cache = self._read_cache
+        record_key = cache_key(namespace, set_name, key)
+        entry = cache.get(record_key)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                cache.stats.hits += 1
+                return _select_bins(entry.bins, bins)
+            if cache.revalidate:
+                message = key_exists(namespace, set_name, key)
+                response = await self._execute(message, "get_header")
+                result_code = response.message.result_code
+                if result_code == ResultCode.KEY_NOT_FOUND:
+                    cache.invalidate(record_key)
+                    cache.stats.misses += 1
+                    return {}
+                if (
+                    result_code == ResultCode.OK
+                    and response.message.generation == entry.generation
+                ):
+                    entry.fetched_at = monotonic()
+                    cache.stats.revalidations += 1
+                    return _select_bins(entry.bins, bins)
+
+        cache.stats.misses += 1
+        response = await self._execute(
+            get_key(namespace, set_name, key), "get_key"
+        )
+        result_code = response.message.result_code
+        if result_code not in (ResultCode.OK, ResultCode.KEY_NOT_FOUND):
+            raise_for_result_code(result_code)
+        record = {
+            op.data_bin.name: op.data_bin.data.value
+            for op in response.message.operations
+        }
+        if result_code == ResultCode.OK:
+            cache.put(record_key, record, response.message.generation)
+        else:
+            cache.invalidate(record_key)
+        return _select_bins(record, bins)
+
     @require_connection
-    async def delete_key(self, namespace: str, set_name: str, key: str) -> None:
-        message = delete_key(namespace, set_name, key)
-        data = AerospikeMessage(message).pack()
-        self._writer.write(data)
-        await self._writer.drain()
-        response = await self._get_response()
+    async def get_many(
+        self,
+        namespace: str,
+        set_name: str,
+        keys: List[AerospikeKeyType],
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> List[Dict[str, AerospikeValueType]]:
+        """
+        Reads the keys in a single batch command, returns a dict of bins per
+        key in the same order as keys.
+        Missing records and records not matching predexp are returned as
+        empty.
+        """
+        message = get_many(namespace, set_name, keys, bins, predexp)
+        results: List[Dict[str, AerospikeValueType]] = [{} for _ in keys]
+        # Raised once the response is read so the connection stays usable
+        error_code = ResultCode.OK
+        async for record in self._execute_multi(message, "get_many"):
+            if record.result_code in (
+                ResultCode.OK,
+                ResultCode.KEY_NOT_FOUND,
+                ResultCode.FILTERED_OUT,
+            ):
+                results[record.transaction_ttl] = {
+                    op.data_bin.name: op.data_bin.data.value
+                    for op in record.operations
+                }
+            elif error_code == ResultCode.OK:
+                error_code = record.result_code
+        if error_code != ResultCode.OK:
+            raise_for_result_code(error_code)
+        return results
+
+    @require_connection
+    async def get_many_columnar(
+        self,
+        namespace: str,
+        set_name: str,
+        keys: List[AerospikeKeyType],
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> ColumnarResult:
+        """
+        Same as get_many, decoding the records into columns instead of a
+        dict per record: row i is keys[i], found is 0 for missing records
+        and records not matching predexp.
+        """
+        message = get_many(namespace, set_name, keys, bins, predexp)
+        result = ColumnarResult(len(keys))
+        error_code = ResultCode.OK
+        async for record in self._execute_multi(message, "get_many", bytes):
+            result_code = record[RESULT_CODE_OFFSET]
+            if result_code == ResultCode.OK:
+                (index,) = SIZE_FORMAT.unpack_from(
+                    record, TRANSACTION_TTL_OFFSET
+                )
+                result.add(record, index)
+            elif error_code == ResultCode.OK and result_code not in (
+                ResultCode.KEY_NOT_FOUND,
+                ResultCode.FILTERED_OUT,
+            ):
+                error_code = result_code
+        if error_code != ResultCode.OK:
+            raise_for_result_code(error_code)
+        result.finish()
+        return result
+
+    @require_connection
+    async def get_header(
+        self, namespace: str, set_name: str, key: AerospikeKeyType
+    ) -> Optional[RecordHeader]:
+        """
+        Returns the record's generation and ttl without reading bin data,
+        None if the record doesn't exist.
+        """
+        message = key_exists(namespace, set_name, key)
+        response = await self._execute(message, "get_header")
+        if response.message.result_code == ResultCode.KEY_NOT_FOUND:
+            return None
+        elif response.message.result_code != 0:
+            raise_for_result_code(response.message.result_code)
+        return RecordHeader(
+            generation=response.message.generation,
+            ttl=void_time_to_ttl(response.message.record_ttl),
+        )
+
+    @require_connection
+    @invalidates_cache
+    async def delete_key(
+        self,
+        namespace: str,
+        set_name: str,
+        key: str,
+        policy: WritePolicy = DEFAULT_WRITE_POLICY,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> None:
+        message = delete_key(namespace, set_name, key, policy, predexp)
+        response = await self._execute(message, "delete_key")
         if response.message.result_code != 0:
-            raise Exception(
-                f"Unexpected result code {response.message.result_code}"
-            )
+            raise_for_result_code(response.message.result_code, write=True)
 
     @require_connection
     async def key_exists(self, namespace: str, set_name: str, key: str) -> bool:
         message = key_exists(namespace, set_name, key)
-        data = AerospikeMessage(message).pack()
-        self._writer.write(data)
-        await self._writer.drain()
-        response = await self._get_response()
-        if response.message.result_code == 2:
+        response = await self._execute(message, "key_exists")
+        if response.message.result_code == ResultCode.KEY_NOT_FOUND:
             return False
         elif response.message.result_code != 0:
-            raise Exception(
-                f"Unexpected result code {response.message.result_code}"
-            )
+            raise_for_result_code(response.message.result_code)
         return True
 
     @require_connection
+    @invalidates_cache
     async def operate(
         self,
         namespace: str,
@@ -163,7 +805,323 @@ class AerospikeClient:
             ttl,
             generation,
         )
-        data = AerospikeMessage(message).pack()
-        self._writer.write(data)
-        await self._writer.drain()
-        return await self._get_response()
+        return await self._execute(message, "operate")
+
+    @require_connection
+    async def execute_raw(
+        self, messages: List[bytes], command: str = "execute_raw"
+    ) -> List[Message]:
+        """
+        Pipelines already packed messages (each with its proto header, as
+        AerospikeMessage.pack returns them) in a single write, returns the
+        response messages in the same order. command names them in metrics.
+        Writes sent this way don't invalidate the read cache.
+        """
+        return await self._execute_packed(
+            b"".join(messages), len(messages), command
+        )
+
+    @require_connection
+    @invalidates_cache
+    async def increment(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        bin_name: str,
+        delta: Union[int, float] = 1,
+        return_value: bool = True,
+        ttl: int = 0,
+    ) -> Optional[Union[int, float]]:
+        """
+        Atomically adds delta to the bin, creating the record/bin if needed.
+        Returns the value after the increment when return_value is set.
+        """
+        message = increment(
+            namespace, set_name, key, {bin_name: delta}, return_value, ttl
+        )
+        response = await self._execute(message, "increment")
+        if response.message.result_code != 0:
+            raise_for_result_code(response.message.result_code, write=True)
+        if not return_value:
+            return None
+        return response.message.operations[0].data_bin.data.value
+
+    @require_connection
+    async def increment_many(
+        self,
+        namespace: str,
+        set_name: str,
+        counters: Dict[AerospikeKeyType, Dict[str, Union[int, float]]],
+        return_value: bool = False,
+        ttl: int = 0,
+    ) -> Dict[AerospikeKeyType, Dict[str, Union[int, float]]]:
+        """
+        Flushes many counters at once, pipelining one increment message per
+        key in a single write. counters maps key to a dict of bin -> delta.
+        Returns key to a dict of bin -> value after the increment when
+        return_value is set, otherwise an empty dict.
+        """
+        messages = [
+            increment(namespace, set_name, key, bins, return_value, ttl)
+            for key, bins in counters.items()
+        ]
+        try:
+            responses = await self._execute_many(messages, "increment_many")
+        finally:
+            for key in counters:
+                self._invalidate_cached(namespace, set_name, key)
+        results = {}
+        for key, response in zip(counters, responses):
+            if response.message.result_code != 0:
+                raise_for_result_code(response.message.result_code, write=True)
+            if return_value:
+                results[key] = {
+                    op.data_bin.name: op.data_bin.data.value
+                    for op in response.message.operations
+                }
+        return results
+
+    @require_connection
+    @invalidates_cache
+    async def append(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        bin_name: str,
+        value: Union[str, bytes],
+        ttl: int = 0,
+    ) -> None:
+        message = append(namespace, set_name, key, {bin_name: value}, ttl)
+        response = await self._execute(message, "append")
+        if response.message.result_code != 0:
+            raise_for_result_code(response.message.result_code, write=True)
+
+    @require_connection
+    @invalidates_cache
+    async def prepend(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        bin_name: str,
+        value: Union[str, bytes],
+        ttl: int = 0,
+    ) -> None:
+        message = prepend(namespace, set_name, key, {bin_name: value}, ttl)
+        response = await self._execute(message, "prepend")
+        if response.message.result_code != 0:
+            raise_for_result_code(response.message.result_code, write=True)
+
+    @require_connection
+    @invalidates_cache
+    async def touch(
+        self, namespace: str, set_name: str, key: AerospikeKeyType, ttl: int = 0
+    ) -> None:
+        """
+        Resets the record's TTL (0 means namespace default) and bumps its
+        generation without modifying bins.
+        """
+        message = touch(namespace, set_name, key, ttl)
+        response = await self._execute(message, "touch")
+        if response.message.result_code != 0:
+            raise_for_result_code(response.message.result_code, write=True)
+
+    @require_connection
+    async def info(self, *commands: str) -> Dict[str, str]:
+        """
+        Sends info commands to the node, returns command -> value.
+        """
+        response = await self._request(InfoMessage(list(commands)), "info")
+        return response.message.values
+
+    @require_connection
+    async def register_udf(self, filename: str, content: bytes) -> None:
+        """
+        Uploads a Lua UDF module to the cluster, module name is the filename
+        without the .lua suffix. Raises UDFError when the server rejects it.
+        """
+        encoded = b64encode(content).decode("ascii")
+        command = (
+            f"udf-put:filename={filename};content={encoded};"
+            f"content-len={len(encoded)};udf-type=LUA;"
+        )
+        response = await self.info(command)
+        if "error" in response.get(command, ""):
+            raise UDFError(ResultCode.UDF_BAD_RESPONSE, msg=response[command])
+
+    @require_connection
+    @invalidates_cache
+    async def apply(
+        self,
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        module: str,
+        function: str,
+        args: Optional[List[AerospikeValueType]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> Any:
+        """
+        Executes the record UDF module.function on the key,
+        returns the UDF's return value.
+        """
+        message = apply(
+            namespace, set_name, key, module, function, args or [], predexp
+        )
+        response = await self._execute(message, "apply")
+        bins = {
+            op.data_bin.name: op.data_bin.data.value
+            for op in response.message.operations
+            if op.data_bin.data is not None
+        }
+        if response.message.result_code != 0:
+            raise_for_result_code(
+                response.message.result_code,
+                write=True,
+                msg=str(bins.get("FAILURE", "")),
+            )
+        return bins.get("SUCCESS")
+
+    async def scan(
+        self,
+        namespace: str,
+        set_name: str,
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> AsyncIterator[Tuple[bytes, Dict[str, AerospikeValueType]]]:
+        """
+        Streams the set's records (the whole namespace when set_name is
+        empty) as (digest, bins), only the given bins when bins is set.
+        """
+        if not self._connection:
+            raise AerospikeClientNotConnected()
+        message = scan(
+            namespace, set_name, random.getrandbits(63), bins, predexp
+        )
+        async for record in self._execute_multi(message, "scan"):
+            yield _record_digest(record), _record_bins(record)
+
+    async def scan_raw(
+        self,
+        namespace: str,
+        set_name: str,
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Same as scan, streaming each record undecoded as its raw message
+        (header, fields and operations, without the proto header).
+        """
+        if not self._connection:
+            raise AerospikeClientNotConnected()
+        message = scan(
+            namespace, set_name, random.getrandbits(63), bins, predexp
+        )
+        async for record in self._execute_multi(message, "scan", bytes):
+            yield record
+
+    @require_connection
+    async def scan_columnar(
+        self,
+        namespace: str,
+        set_name: str,
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> ColumnarResult:
+        """
+        Same as scan, decoding the records into columns, a row per record
+        with its digest in digests.
+        """
+        message = scan(
+            namespace, set_name, random.getrandbits(63), bins, predexp
+        )
+        result = ColumnarResult(digests=True)
+        async for record in self._execute_multi(message, "scan", bytes):
+            result.append(record)
+        result.finish()
+        return result
+
+    async def scan_partitions(
+        self,
+        namespace: str,
+        set_name: str,
+        partitions: List[PartitionStatus],
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+        records_per_second: int = 0,
+    ) -> AsyncGenerator[Tuple[bytes, Dict[str, AerospikeValueType]], None]:
+        """
+        Same as scan over the partitions not done yet, each resuming after
+        its status digest. A status digest is set to a record's once the
+        iteration resumes after it, and done once the node completed the
+        partition, so the statuses can be saved to resume an interrupted scan.
+        Partitions the node couldn't scan are left not done.
+        records_per_second throttles the scan on the server, 0 for no limit.
+        """
+        if not self._connection:
+            raise AerospikeClientNotConnected()
+        pending = {
+            status.partition: status for status in partitions if not status.done
+        }
+        if not pending:
+            return
+        message = scan(
+            namespace,
+            set_name,
+            random.getrandbits(63),
+            bins,
+            predexp,
+            partitions=[
+                status.partition
+                for status in pending.values()
+                if status.digest is None
+            ],
+            digests=[
+                status.digest
+                for status in pending.values()
+                if status.digest is not None
+            ],
+            records_per_second=records_per_second,
+        )
+        async for record in self._execute_multi(message, "scan"):
+            if record.info3 & Info3Flags.PARTITION_DONE:
+                status = pending.get(record.generation)
+                if status is not None and record.result_code == ResultCode.OK:
+                    status.done = True
+                continue
+            digest = _record_digest(record)
+            yield digest, _record_bins(record)
+            pending[partition_id(digest)].digest = digest
+
+    @require_connection
+    async def scan_apply(
+        self,
+        namespace: str,
+        set_name: str,
+        module: str,
+        function: str,
+        args: Optional[List[AerospikeValueType]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> int:
+        """
+        Starts a background scan executing the record UDF module.function on
+        every record of the set, returns the task id.
+        Progress is available with the info command
+        jobs:module=scan;cmd=get-job;trid=<task id>
+        """
+        task_id = random.getrandbits(63)
+        message = scan_apply(
+            namespace,
+            set_name,
+            task_id,
+            module,
+            function,
+            args or [],
+            predexp,
+        )
+        response = await self._execute(message, "scan_apply")
+        if response.message.result_code != 0:
+            raise_for_result_code(response.message.result_code, write=True)
+        return task_id
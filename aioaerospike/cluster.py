@@ -0,0 +1,367 @@
+import asyncio
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import wraps
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .client import AerospikeClient
+from .protocol.datatypes import (
+    AerospikeKeyType,
+    AerospikeValueType,
+    data_to_aerospike_type,
+)
+from .protocol.partition import (
+    N_PARTITIONS,
+    owns_partition,
+    parse_rack_ids,
+    parse_replicas,
+    partition_id,
+)
+from .protocol.predexp import PredExp
+
+# Errors of a replica that is unreachable, drops the connection mid-read or
+# takes over replica_timeout, the read is retried on the master
+REPLICA_ERRORS = (OSError, EOFError, asyncio.TimeoutError)
+
+
+class ReadPolicy(IntEnum):
+    # Always read from the partition's master
+    MASTER = 0
+    # Read from a replica in the client's rack, the master otherwise
+    PREFER_RACK = 1
+    # Read from the replica with the lowest measured latency
+    LOWEST_LATENCY = 2
+
+
+@dataclass
+class ClusterNode:
+    name: str
+    client: AerospikeClient
+    # namespace -> rack id
+    rack_ids: Dict[str, int] = field(default_factory=dict)
+    # EWMA of command latency in seconds, None until measured
+    latency: Optional[float] = None
+    commands: int = 0
+
+
+def _on_master(method: Callable) -> Callable:
+    """
+    Forwards the method to the master of the key's partition
+    """
+    name = method.__name__
+
+    @wraps(method)
+    async def wrapper(
+        self: "ClusterClient",
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        node = self._replicas(namespace, set_name, key)[0]
+        return await self._timed(
+            node,
+            getattr(node.client, name)(
+                namespace, set_name, key, *args, **kwargs
+            ),
+        )
+
+    return wrapper
+
+
+def _on_read_replica(method: Callable) -> Callable:
+    """
+    Forwards the method to the replica picked by the read policy,
+    falling back to the master if that replica fails (REPLICA_ERRORS)
+    """
+    name = method.__name__
+
+    @wraps(method)
+    async def wrapper(
+        self: "ClusterClient",
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        replicas = self._replicas(namespace, set_name, key)
+        node = self._read_node(namespace, replicas)
+        return await self._read(
+            node,
+            replicas[0],
+            lambda client: getattr(client, name)(
+                namespace, set_name, key, *args, **kwargs
+            ),
+        )
+
+    return wrapper
+
+
+def _group_by_node(
+    nodes: List[ClusterNode], indexes: Iterable[int]
+) -> List[Tuple[ClusterNode, List[int]]]:
+    """
+    Returns (node, its indexes) for the indexes, nodes[i] being index i's
+    """
+    groups: Dict[int, Tuple[ClusterNode, List[int]]] = {}
+    for index in indexes:
+        node = nodes[index]
+        groups.setdefault(id(node), (node, []))[1].append(index)
+    return list(groups.values())
+
+
+class ClusterClient:
+    """
+    Client over several nodes of a cluster, one AerospikeClient each,
+    routing commands with the partition map reported by the nodes.
+    Writes go to the partition master, reads follow read_policy: with
+    PREFER_RACK a replica in rack_id is preferred (saving cross AZ latency
+    and transfer), with LOWEST_LATENCY the replica with the lowest EWMA
+    command latency is used. With a breaker_policy (passed on to each
+    node's client), reads skip replicas whose circuit is open.
+    Reads failing on a replica, or taking over replica_timeout seconds
+    there, are retried on the master.
+    Nodes aren't discovered, hosts should list all the cluster's nodes, call
+    refresh after partitions migrate.
+    """
+
+    def __init__(
+        self,
+        hosts: List[Tuple[str, int]],
+        user: str,
+        password: str,
+        rack_id: Optional[int] = None,
+        read_policy: ReadPolicy = ReadPolicy.MASTER,
+        latency_alpha: float = 0.2,
+        replica_timeout: Optional[float] = None,
+        **client_kwargs: Any,
+    ) -> None:
+        self.hosts = hosts
+        self.rack_id = rack_id
+        self.read_policy = read_policy
+        self.latency_alpha = latency_alpha
+        self.replica_timeout = replica_timeout
+        self._user = user
+        self._password = password
+        self._client_kwargs = client_kwargs
+        self.nodes: List[ClusterNode] = []
+        # namespace -> replica index -> partition -> node
+        self._partitions: Dict[str, List[List[Optional[ClusterNode]]]] = {}
+
+    async def __aenter__(self) -> "ClusterClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        for host, port in self.hosts:
+            client = AerospikeClient(
+                host,
+                self._user,
+                self._password,
+                port=port,
+                **self._client_kwargs,
+            )
+            await client.connect()
+            self.nodes.append(ClusterNode(f"{host}:{port}", client))
+        await self.refresh()
+
+    async def close(self) -> None:
+        for node in self.nodes:
+            await node.client.close()
+        self.nodes = []
+        self._partitions = {}
+
+    async def refresh(self) -> None:
+        """
+        Reloads node names, racks and the partition map from the nodes
+        """
+        partitions: Dict[str, List[List[Optional[ClusterNode]]]] = {}
+        for node in self.nodes:
+            info = await node.client.info("node", "replicas", "rack-ids")
+            node.name = info.get("node") or node.name
+            node.rack_ids = parse_rack_ids(info.get("rack-ids", ""))
+            replicas = parse_replicas(info.get("replicas", ""))
+            for namespace, bitmaps in replicas.items():
+                owners = partitions.setdefault(namespace, [])
+                for index, bitmap in enumerate(bitmaps):
+                    if len(owners) <= index:
+                        owners.append([None] * N_PARTITIONS)
+                    for partition in range(N_PARTITIONS):
+                        if owns_partition(bitmap, partition):
+                            owners[index][partition] = node
+        self._partitions = partitions
+
+    def _replicas(
+        self, namespace: str, set_name: str, key: AerospikeKeyType
+    ) -> List[ClusterNode]:
+        """
+        Returns the nodes holding the key, master first
+        """
+        digest = data_to_aerospike_type(key).digest(set_name)
+        return self.partition_nodes(namespace, partition_id(digest))
+
+    def partition_nodes(
+        self, namespace: str, partition: int
+    ) -> List[ClusterNode]:
+        """
+        Returns the nodes holding the partition, master first
+        """
+        replicas = []
+        for owners in self._partitions.get(namespace, []):
+            node = owners[partition]
+            if node is not None:
+                replicas.append(node)
+        # Unknown partition, any node proxies the command to its owner
+        return replicas or self.nodes[:1]
+
+    def _read_node(
+        self, namespace: str, replicas: List[ClusterNode]
+    ) -> ClusterNode:
+        # Replicas whose circuit is open would fail fast, unless all are
+        replicas = [
+            node
+            for node in replicas
+            if node.client.breaker is None or not node.client.breaker.is_open
+        ] or replicas
+        if self.read_policy == ReadPolicy.PREFER_RACK:
+            for node in replicas:
+                if node.rack_ids.get(namespace) == self.rack_id:
+                    return node
+        elif self.read_policy == ReadPolicy.LOWEST_LATENCY:
+            # Unmeasured nodes first, so every replica gets measured
+            return min(
+                replicas,
+                key=lambda node: -1 if node.latency is None else node.latency,
+            )
+        return replicas[0]
+
+    async def _read(
+        self,
+        node: ClusterNode,
+        master: ClusterNode,
+        read: Callable[[AerospikeClient], Awaitable[Any]],
+    ) -> Any:
+        """
+        Returns read(node's client), retried on the master when node is a
+        replica failing with REPLICA_ERRORS or taking over replica_timeout
+        """
+        if node is master:
+            return await self._timed(node, read(node.client))
+        try:
+            return await self._timed(
+                node, asyncio.wait_for(read(node.client), self.replica_timeout)
+            )
+        except REPLICA_ERRORS:
+            pass
+        return await self._timed(master, read(master.client))
+
+    async def _timed(self, node: ClusterNode, command: Awaitable[Any]) -> Any:
+        start = perf_counter()
+        try:
+            return await command
+        finally:
+            elapsed = perf_counter() - start
+            node.commands += 1
+            if node.latency is None:
+                node.latency = elapsed
+            else:
+                node.latency += self.latency_alpha * (elapsed - node.latency)
+
+    put_key = _on_master(AerospikeClient.put_key)
+    delete_key = _on_master(AerospikeClient.delete_key)
+    operate = _on_master(AerospikeClient.operate)
+    increment = _on_master(AerospikeClient.increment)
+    append = _on_master(AerospikeClient.append)
+    prepend = _on_master(AerospikeClient.prepend)
+    touch = _on_master(AerospikeClient.touch)
+    apply = _on_master(AerospikeClient.apply)
+    get_key = _on_read_replica(AerospikeClient.get_key)
+    get_header = _on_read_replica(AerospikeClient.get_header)
+    key_exists = _on_read_replica(AerospikeClient.key_exists)
+
+    async def get_many(
+        self,
+        namespace: str,
+        set_name: str,
+        keys: List[AerospikeKeyType],
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> List[Dict[str, AerospikeValueType]]:
+        """
+        Same as AerospikeClient.get_many, one batch per node picked by the
+        read policy. When a replica's batch fails (as for single reads), its
+        keys are read from their masters, one batch per master.
+        """
+        masters: List[ClusterNode] = []
+        read_nodes: List[ClusterNode] = []
+        for key in keys:
+            replicas = self._replicas(namespace, set_name, key)
+            masters.append(replicas[0])
+            read_nodes.append(self._read_node(namespace, replicas))
+
+        results: List[Dict[str, AerospikeValueType]] = [{} for _ in keys]
+
+        async def read_batch(node: ClusterNode, indexes: List[int]) -> None:
+            command = self._timed(
+                node,
+                node.client.get_many(
+                    namespace,
+                    set_name,
+                    [keys[index] for index in indexes],
+                    bins,
+                    predexp,
+                ),
+            )
+            if all(masters[index] is node for index in indexes):
+                records = await command
+            else:
+                try:
+                    records = await asyncio.wait_for(
+                        command, self.replica_timeout
+                    )
+                except REPLICA_ERRORS:
+                    await asyncio.gather(
+                        *(
+                            read_batch(master, master_indexes)
+                            for master, master_indexes in _group_by_node(
+                                masters, indexes
+                            )
+                        )
+                    )
+                    return
+            for index, record in zip(indexes, records):
+                results[index] = record
+
+        await asyncio.gather(
+            *(
+                read_batch(node, indexes)
+                for node, indexes in _group_by_node(
+                    read_nodes, range(len(keys))
+                )
+            )
+        )
+        return results
+
+    async def info(self, *commands: str) -> Dict[str, Dict[str, str]]:
+        """
+        Sends the info commands to every node, returns node name -> values
+        """
+        values = await asyncio.gather(
+            *(node.client.info(*commands) for node in self.nodes)
+        )
+        return {node.name: value for node, value in zip(self.nodes, values)}
@@ -0,0 +1,347 @@
+import sys
+from array import array
+from functools import lru_cache
+from struct import Struct
+from typing import Any, Dict, List, Optional, Union, cast
+
+from .protocol.datatypes import AerospikeTypes, parse_raw
+from .protocol.message import (
+    DIGEST_SIZE,
+    SIZE_FORMAT,
+    Bin,
+    FieldTypes,
+    Message,
+    Operation,
+)
+
+# Columnar results decode INTEGER and DOUBLE bins straight from the response
+# buffers into contiguous 8 bytes per row buffers, and STRING and BLOB bins
+# into a single data buffer indexed by per row offsets, so no Python object
+# is created per value. Other bin types (lists, maps, ...) are kept as
+# Python objects, as are bins with values of several types in the records.
+NUMERIC_SIZE = 8
+NUMERIC_TYPECODES = {AerospikeTypes.INTEGER: "q", AerospikeTypes.DOUBLE: "d"}
+NUMERIC_STRUCTS = {
+    AerospikeTypes.INTEGER: Struct("!q"),
+    AerospikeTypes.DOUBLE: Struct("!d"),
+}
+NUMPY_DTYPES = {AerospikeTypes.INTEGER: "i8", AerospikeTypes.DOUBLE: "f8"}
+BINARY_TYPES = (AerospikeTypes.STRING, AerospikeTypes.BLOB)
+# Bin's particle type and name length, after the operation's size and type
+BIN_OFFSET = Operation.FORMAT.size
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """
+    Imported on first use, numpy takes longer to import than the client,
+    None when not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _offsets(rows: int) -> array:
+    return array("q", bytes(rows * NUMERIC_SIZE))
+
+
+def _mask(present: bytearray) -> Any:
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.frombuffer(present, dtype=bool)
+    return present
+
+
+class NumericColumn:
+    """
+    INTEGER or DOUBLE bin values, a numpy int64/float64 array when numpy is
+    installed, an array.array ("q"/"d") otherwise, 0 for rows without the
+    bin (present is 0 for those).
+    """
+
+    def __init__(self, particle_type: AerospikeTypes, rows: int) -> None:
+        self.particle_type = particle_type
+        self.values: Any = None
+        self.present: Any = bytearray(rows)
+        # Big endian values as received, converted once finished
+        self._buffer = bytearray(rows * NUMERIC_SIZE)
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def __getitem__(self, row: int) -> Union[int, float, None]:
+        return self.values[row] if self.present[row] else None
+
+    def _grow(self, rows: int) -> None:
+        self.present += bytes(rows - len(self.present))
+        self._buffer += bytes(rows * NUMERIC_SIZE - len(self._buffer))
+
+    def _set(self, row: int, data: memoryview, start: int, end: int) -> None:
+        if end - start != NUMERIC_SIZE:
+            raise ValueError(f"Invalid numeric bin size {end - start}")
+        offset = row * NUMERIC_SIZE
+        self._buffer[offset : offset + NUMERIC_SIZE] = data[start:end]
+        self.present[row] = 1
+
+    def _value(self, row: int) -> Union[int, float, None]:
+        """
+        Row's value while the column is filled
+        """
+        if not self.present[row]:
+            return None
+        return NUMERIC_STRUCTS[self.particle_type].unpack_from(
+            self._buffer, row * NUMERIC_SIZE
+        )[0]
+
+    def _finish(self, rows: int) -> None:
+        del self._buffer[rows * NUMERIC_SIZE :]
+        del self.present[rows:]
+        numpy = _numpy()
+        if numpy is not None:
+            dtype = NUMPY_DTYPES[self.particle_type]
+            self.values = numpy.frombuffer(self._buffer, ">" + dtype).astype(
+                dtype
+            )
+        else:
+            self.values = array(NUMERIC_TYPECODES[self.particle_type])
+            self.values.frombytes(self._buffer)
+            if sys.byteorder == "little":
+                self.values.byteswap()
+        self.present = _mask(self.present)
+        self._buffer = bytearray()
+
+
+class BinaryColumn:
+    """
+    STRING or BLOB bin values, row i is data[starts[i]:ends[i]] (starts and
+    ends are array.array("q")), empty for rows without the bin.
+    Indexing decodes a single value.
+    """
+
+    def __init__(self, particle_type: AerospikeTypes, rows: int) -> None:
+        self.particle_type = particle_type
+        self.data = bytearray()
+        self.starts = _offsets(rows)
+        self.ends = _offsets(rows)
+        self.present: Any = bytearray(rows)
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def __getitem__(self, row: int) -> Union[str, bytes, None]:
+        if not self.present[row]:
+            return None
+        value = bytes(self.data[self.starts[row] : self.ends[row]])
+        if self.particle_type == AerospikeTypes.STRING:
+            return value.decode("utf-8")
+        return value
+
+    _value = __getitem__
+
+    def _grow(self, rows: int) -> None:
+        added = rows - len(self.present)
+        self.present += bytes(added)
+        self.starts.frombytes(bytes(added * NUMERIC_SIZE))
+        self.ends.frombytes(bytes(added * NUMERIC_SIZE))
+
+    def _set(self, row: int, data: memoryview, start: int, end: int) -> None:
+        self.starts[row] = len(self.data)
+        self.data += data[start:end]
+        self.ends[row] = len(self.data)
+        self.present[row] = 1
+
+    def _finish(self, rows: int) -> None:
+        del self.starts[rows:]
+        del self.ends[rows:]
+        del self.present[rows:]
+        self.present = _mask(self.present)
+
+
+class ObjectColumn:
+    """
+    Values of other bin types, as a list with None for rows without the bin.
+    particle_type is None for a bin with values of several types.
+    """
+
+    def __init__(
+        self, particle_type: Optional[AerospikeTypes], rows: int
+    ) -> None:
+        self.particle_type = particle_type
+        self.values: List[Any] = [None] * rows
+
+    @classmethod
+    def _demote(cls, column: "Column") -> "ObjectColumn":
+        """
+        Mixed type column holding the values of a column being filled
+        """
+        demoted = cls(None, 0)
+        demoted.values = [column._value(row) for row in range(len(column))]
+        return demoted
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[row]
+
+    def _grow(self, rows: int) -> None:
+        self.values += [None] * (rows - len(self.values))
+
+    def _set(self, row: int, data: memoryview, start: int, end: int) -> None:
+        # Mixed type columns are only set with _set_typed
+        particle_type = cast(AerospikeTypes, self.particle_type)
+        self._set_typed(row, particle_type, data, start, end)
+
+    def _set_typed(
+        self,
+        row: int,
+        particle_type: AerospikeTypes,
+        data: memoryview,
+        start: int,
+        end: int,
+    ) -> None:
+        value = parse_raw(particle_type, bytes(data[start:end]))
+        self.values[row] = value.value
+
+    def _value(self, row: int) -> Any:
+        return self.values[row]
+
+    def _finish(self, rows: int) -> None:
+        del self.values[rows:]
+
+
+Column = Union[NumericColumn, BinaryColumn, ObjectColumn]
+
+
+def _column(particle_type: AerospikeTypes, rows: int) -> Column:
+    if particle_type in NUMERIC_TYPECODES:
+        return NumericColumn(particle_type, rows)
+    if particle_type in BINARY_TYPES:
+        return BinaryColumn(particle_type, rows)
+    return ObjectColumn(particle_type, rows)
+
+
+class ColumnarResult:
+    """
+    Records decoded into a column per bin name.
+    found marks the rows a record was returned for (batch reads), digests
+    holds the records' digests (scans), DIGEST_SIZE bytes per row.
+    Rows are preallocated, and grown as needed when appending.
+    """
+
+    def __init__(self, rows: int = 0, digests: bool = False) -> None:
+        self.rows = rows
+        self.columns: Dict[str, Column] = {}
+        self.found: Any = bytearray(rows)
+        self.digests: Optional[bytearray] = (
+            bytearray(rows * DIGEST_SIZE) if digests else None
+        )
+        self._capacity = rows
+        # Columns by encoded bin name, saving a decode per value
+        self._by_name: Dict[bytes, Column] = {}
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def digest(self, row: int) -> bytes:
+        offset = row * DIGEST_SIZE
+        return bytes(self.digests[offset : offset + DIGEST_SIZE])
+
+    def _grow(self, rows: int) -> None:
+        self._capacity = max(rows, self._capacity * 2, 64)
+        self.found += bytes(self._capacity - len(self.found))
+        if self.digests is not None:
+            self.digests += bytes(
+                self._capacity * DIGEST_SIZE - len(self.digests)
+            )
+        for column in self._by_name.values():
+            column._grow(self._capacity)
+
+    def append(self, record: bytes) -> None:
+        """
+        Decodes the raw record message into a new row
+        """
+        if self.rows == self._capacity:
+            self._grow(self.rows + 1)
+        self.rows += 1
+        self.add(record, self.rows - 1)
+
+    def add(self, record: bytes, row: int) -> None:
+        """
+        Decodes the raw record message into the preallocated row
+        """
+        self.found[row] = 1
+        # Values are copied from the record without intermediate bytes
+        view = memoryview(record)
+        offset = Message.FORMAT.size
+        fields_count, operations_count = Message.FORMAT.unpack_from(record)[-2:]
+        for _i in range(fields_count):
+            (size,) = SIZE_FORMAT.unpack_from(record, offset)
+            data_start = offset + SIZE_FORMAT.size + 1
+            if (
+                self.digests is not None
+                and record[offset + SIZE_FORMAT.size] == FieldTypes.DIGEST
+            ):
+                digest_offset = row * DIGEST_SIZE
+                self.digests[digest_offset : digest_offset + DIGEST_SIZE] = (
+                    record[data_start : data_start + DIGEST_SIZE]
+                )
+            offset += SIZE_FORMAT.size + size
+        for _i in range(operations_count):
+            (size,) = SIZE_FORMAT.unpack_from(record, offset)
+            end = offset + SIZE_FORMAT.size + size
+            particle_type, _version, name_length = Bin.FORMAT.unpack_from(
+                record, offset + BIN_OFFSET
+            )
+            if particle_type == AerospikeTypes.UNDEF:
+                # Requested bin the record doesn't have
+                offset = end
+                continue
+            name_start = offset + BIN_OFFSET + Bin.FORMAT.size
+            name = record[name_start : name_start + name_length]
+            column = self._by_name.get(name)
+            if column is None:
+                column = _column(AerospikeTypes(particle_type), self._capacity)
+                self._by_name[name] = column
+                self.columns[name.decode("utf-8")] = column
+            value_start = name_start + name_length
+            if column.particle_type == particle_type:
+                column._set(row, view, value_start, end)
+            else:
+                self._mixed(name, column)._set_typed(
+                    row, AerospikeTypes(particle_type), view, value_start, end
+                )
+            offset = end
+
+    def _mixed(self, name: bytes, column: Column) -> ObjectColumn:
+        """
+        Returns the column of a bin with values of several types, demoting
+        it to an ObjectColumn on the first type mismatch
+        """
+        if isinstance(column, ObjectColumn) and column.particle_type is None:
+            return column
+        mixed = ObjectColumn._demote(column)
+        self._by_name[name] = mixed
+        self.columns[name.decode("utf-8")] = mixed
+        return mixed
+
+    def finish(self) -> None:
+        """
+        Trims the preallocated rows and converts the columns to their final
+        arrays, called once all records were added.
+        """
+        for column in self.columns.values():
+            column._finish(self.rows)
+        del self.found[self.rows :]
+        if self.digests is not None:
+            del self.digests[self.rows * DIGEST_SIZE :]
+        self.found = _mask(self.found)
@@ -0,0 +1,174 @@
+import asyncio
+from collections import deque
+from typing import Deque, Optional, Tuple, Union
+
+from .protocol.general import HEADER_FORMAT, LENGTH_MASK
+
+Frame = Tuple[int, bytes]
+
+# Bytes of received frames not read yet above which ProtocolConnection stops
+# reading from the socket, it resumes once they're read down to half of it
+READ_BUFFER_LIMIT = 1 << 20
+
+
+class StreamConnection:
+    """
+    Connection over asyncio streams, reading each frame with two
+    readexactly calls.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "StreamConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def write(self, data: bytes) -> None:
+        self._writer.write(data)
+
+    async def drain(self) -> None:
+        await self._writer.drain()
+
+    async def read_frame(self) -> Frame:
+        """
+        Returns the message type and body of the next frame
+        """
+        header_data = await self._reader.readexactly(HEADER_FORMAT.size)
+        (header,) = HEADER_FORMAT.unpack(header_data)
+        body = await self._reader.readexactly(header & LENGTH_MASK)
+        return (header >> 48) & 0xFF, body
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+class ProtocolConnection(asyncio.Protocol):
+    """
+    Connection framing responses directly in data_received: every complete
+    frame in the receive buffer is split off at once and queued, so a read
+    carrying several replies wakes the reader once, and a reply already
+    received is returned without suspending.
+    Reading from the socket is paused while over READ_BUFFER_LIMIT bytes of
+    frames are queued, so a fast server can't grow the queue without bound.
+    """
+
+    def __init__(self) -> None:
+        self._transport: Optional[asyncio.Transport] = None
+        self._buffer = bytearray()
+        self._frames: Deque[Frame] = deque()
+        # Body bytes of the queued frames
+        self._frames_size = 0
+        self._reading_paused = False
+        self._waiter: Optional[asyncio.Future] = None
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._paused = False
+        self._exception: Optional[Exception] = None
+        self._closed: Optional[asyncio.Future] = None
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "ProtocolConnection":
+        loop = asyncio.get_event_loop()
+        _, protocol = await loop.create_connection(cls, host, port)
+        return protocol
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore
+        self._closed = asyncio.get_event_loop().create_future()
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        buffer += data
+        size = len(buffer)
+        offset = 0
+        # Copies each body once, slicing the bytearray would copy it twice
+        with memoryview(buffer) as view:
+            while size - offset >= HEADER_FORMAT.size:
+                (header,) = HEADER_FORMAT.unpack_from(buffer, offset)
+                start = offset + HEADER_FORMAT.size
+                end = start + (header & LENGTH_MASK)
+                if end > size:
+                    break
+                self._frames.append(
+                    ((header >> 48) & 0xFF, bytes(view[start:end]))
+                )
+                self._frames_size += end - start
+                offset = end
+        if not offset:
+            return
+        del buffer[:offset]
+        if (
+            self._frames_size > READ_BUFFER_LIMIT
+            and not self._reading_paused
+            and self._transport is not None
+        ):
+            self._reading_paused = True
+            self._transport.pause_reading()
+        self._wake(self._waiter)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._exception = exc or ConnectionResetError("Connection lost")
+        self._wake(self._waiter)
+        self._wake(self._drain_waiter)
+        if self._closed is not None and not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        self._wake(self._drain_waiter)
+
+    @staticmethod
+    def _wake(waiter: Optional[asyncio.Future]) -> None:
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def write(self, data: bytes) -> None:
+        self._transport.write(data)
+
+    async def drain(self) -> None:
+        while self._paused and self._exception is None:
+            self._drain_waiter = asyncio.get_event_loop().create_future()
+            await self._drain_waiter
+        if self._exception is not None:
+            raise self._exception
+
+    async def read_frame(self) -> Frame:
+        """
+        Returns the message type and body of the next frame
+        """
+        while not self._frames:
+            if self._exception is not None:
+                raise self._exception
+            self._waiter = asyncio.get_event_loop().create_future()
+            await self._waiter
+        frame = self._frames.popleft()
+        self._frames_size -= len(frame[1])
+        if self._reading_paused and self._frames_size <= READ_BUFFER_LIMIT // 2:
+            self._reading_paused = False
+            self._transport.resume_reading()
+        return frame
+
+    async def close(self) -> None:
+        if self._transport is None:
+            return
+        self._transport.close()
+        await self._closed
+
+
+Connection = Union[StreamConnection, ProtocolConnection]
+
+
+async def open_connection(
+    host: str, port: int, use_streams: bool = False
+) -> Connection:
+    if use_streams:
+        return await StreamConnection.open(host, port)
+    return await ProtocolConnection.open(host, port)
@@ -0,0 +1,163 @@
+from typing import Dict, NoReturn, Tuple, Type
+
+from .protocol.result_code import (
+    IN_DOUBT_RESULT_CODES,
+    OVERLOAD_RESULT_CODES,
+    RETRYABLE_RESULT_CODES,
+    ResultCode,
+)
+
+
+class AerospikeError(Exception):
+    """
+    Server responded with a non OK result code.
+    is_retryable - the command may succeed when retried.
+    is_overload - server is shedding load, back off before retrying.
+    in_doubt - a write may have been applied even though it failed.
+    """
+
+    def __init__(self, result_code: int, in_doubt: bool = False, msg: str = ""):
+        try:
+            name = ResultCode(result_code).name
+        except ValueError:
+            name = "UNKNOWN"
+        super().__init__(
+            f"Unexpected result code {result_code} ({name}) {msg}".rstrip()
+        )
+        self.result_code = result_code
+        self.in_doubt = in_doubt
+        self.msg = msg
+
+    def __reduce__(
+        self,
+    ) -> Tuple[Type["AerospikeError"], Tuple[int, bool, str]]:
+        return type(self), (self.result_code, self.in_doubt, self.msg)
+
+    @property
+    def is_retryable(self) -> bool:
+        return self.result_code in RETRYABLE_RESULT_CODES
+
+    @property
+    def is_overload(self) -> bool:
+        return self.result_code in OVERLOAD_RESULT_CODES
+
+
+class ServerError(AerospikeError):
+    pass
+
+
+class RecordNotFound(AerospikeError):
+    pass
+
+
+class GenerationError(AerospikeError):
+    pass
+
+
+class ParameterError(AerospikeError):
+    pass
+
+
+class RecordExists(AerospikeError):
+    pass
+
+
+class BinTypeError(AerospikeError):
+    pass
+
+
+class RecordTooBig(AerospikeError):
+    pass
+
+
+class FilteredOut(AerospikeError):
+    pass
+
+
+class InvalidNamespace(AerospikeError):
+    pass
+
+
+class ServerTimeout(AerospikeError):
+    pass
+
+
+class ClusterError(AerospikeError):
+    pass
+
+
+class OverloadError(AerospikeError):
+    pass
+
+
+class KeyBusy(OverloadError):
+    pass
+
+
+class DeviceOverload(OverloadError):
+    pass
+
+
+class SecurityError(AerospikeError):
+    pass
+
+
+class UDFError(AerospikeError):
+    pass
+
+
+class ClientOverloadError(Exception):
+    """
+    Command shed without being sent, the node's concurrency limit is reached
+    and its queue is full.
+    """
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Command failed without being sent, the node's circuit breaker is open.
+    Being a ConnectionError, ClusterClient reads fall back to the master.
+    """
+
+
+RESULT_CODE_TO_EXCEPTION: Dict[int, Type[AerospikeError]] = {
+    ResultCode.SERVER_ERROR: ServerError,
+    ResultCode.KEY_NOT_FOUND: RecordNotFound,
+    ResultCode.GENERATION_ERROR: GenerationError,
+    ResultCode.PARAMETER_ERROR: ParameterError,
+    ResultCode.KEY_EXISTS: RecordExists,
+    ResultCode.CLUSTER_KEY_MISMATCH: ClusterError,
+    ResultCode.SERVER_MEM_ERROR: OverloadError,
+    ResultCode.TIMEOUT: ServerTimeout,
+    ResultCode.PARTITION_UNAVAILABLE: ClusterError,
+    ResultCode.BIN_TYPE_ERROR: BinTypeError,
+    ResultCode.RECORD_TOO_BIG: RecordTooBig,
+    ResultCode.KEY_BUSY: KeyBusy,
+    ResultCode.DEVICE_OVERLOAD: DeviceOverload,
+    ResultCode.INVALID_NAMESPACE: InvalidNamespace,
+    ResultCode.FILTERED_OUT: FilteredOut,
+    ResultCode.UDF_BAD_RESPONSE: UDFError,
+    ResultCode.BATCH_QUEUES_FULL: OverloadError,
+    ResultCode.QUERY_QUEUE_FULL: OverloadError,
+}
+RESULT_CODE_TO_EXCEPTION.update(
+    {code: SecurityError for code in ResultCode if 51 <= code <= 81}
+)
+
+
+def result_code_exception(
+    result_code: int, write: bool = False, msg: str = ""
+) -> AerospikeError:
+    """
+    Creates the exception matching the result code,
+    write marks whether the failed command could have modified the record.
+    """
+    exception_class = RESULT_CODE_TO_EXCEPTION.get(result_code, AerospikeError)
+    in_doubt = write and result_code in IN_DOUBT_RESULT_CODES
+    return exception_class(result_code, in_doubt, msg)
+
+
+def raise_for_result_code(
+    result_code: int, write: bool = False, msg: str = ""
+) -> NoReturn:
+    raise result_code_exception(result_code, write, msg)
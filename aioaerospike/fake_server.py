@@ -0,0 +1,804 @@
+import asyncio
+import random
+import re
+import time
+from base64 import b64decode
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .protocol.admin import (
+    AdminCommandsType,
+    AdminMessage,
+    Field as AdminField,
+    FieldTypes as AdminFieldTypes,
+)
+from .protocol.datatypes import (
+    AerospikeDataType,
+    AerospikeDouble,
+    AerospikeInteger,
+    AerospikeList,
+    AerospikeString,
+    data_to_aerospike_type,
+)
+from .protocol.general import AerospikeHeader, MessageType
+from .protocol.info import InfoMessage
+from .protocol.message import (
+    BATCH_FORMAT,
+    BATCH_KEY_FORMAT,
+    BATCH_RECORD_FORMAT,
+    CITRUSLEAF_EPOCH,
+    DIGEST_SIZE,
+    PARTITION_ID_FORMAT,
+    SCAN_RPS_FORMAT,
+    SIZE_FORMAT,
+    Bin,
+    Field,
+    FieldTypes,
+    Info1Flags,
+    Info2Flags,
+    Info3Flags,
+    Message,
+    Operation,
+    OperationTypes,
+)
+from .protocol.partition import (
+    N_PARTITIONS,
+    format_replicas,
+    owns_partition,
+    pack_bitmap,
+    partition_id,
+)
+from .protocol.predexp import (
+    COUNT_FORMAT,
+    INTEGER_FORMAT,
+    UINT32_FORMAT,
+    PredExp,
+    PredExpTags,
+    RegexFlags,
+)
+from .protocol.result_code import ResultCode
+
+# Record TTLs with special meaning in requests
+TTL_NEVER_EXPIRE = 0xFFFFFFFF
+TTL_DONT_UPDATE = 0xFFFFFFFE
+
+# Records per frame in batch and scan responses
+RECORDS_PER_FRAME = 100
+
+# Python UDF, called with the record's bins dict (None if the record doesn't
+# exist) and the UDF arguments. It may modify the bins dict in place,
+# the record is written back unless the UDF returns DELETE_RECORD as second
+# item of a (result, DELETE_RECORD) tuple.
+UDF = Callable[..., Any]
+DELETE_RECORD = object()
+
+
+class FakeServerError(Exception):
+    def __init__(self, result_code: int):
+        super().__init__(f"result code {result_code}")
+        self.result_code = result_code
+
+
+@dataclass
+class FakeRecord:
+    set_name: str
+    bins: Dict[str, AerospikeDataType]
+    generation: int = 0
+    # Server void time, 0 for never
+    void_time: int = 0
+    # Nanoseconds since unix epoch
+    last_update: int = 0
+
+
+@dataclass
+class FakeNodeFaults:
+    """
+    Faults injected into the command handling of the fake server.
+    """
+
+    # Seconds added before every response
+    latency: float = 0
+    # Uniform random jitter added on top of latency
+    jitter: float = 0
+    # Probability of failing a command with error_code
+    error_rate: float = 0
+    error_code: int = ResultCode.TIMEOUT
+    # Result codes returned for the next commands, regardless of error_rate
+    next_errors: List[int] = field(default_factory=list)
+
+
+def server_now() -> int:
+    return int(time.time()) - CITRUSLEAF_EPOCH
+
+
+class FakeAerospikeServer:
+    """
+    In-process asyncio server speaking the Aerospike wire protocol,
+    keeping records in memory keyed by (namespace, digest).
+    Supports single-record commands, batch index reads, scans, info and
+    login, with injectable latency and errors for load tests and benchmarks.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        namespaces: Tuple[str, ...] = ("test",),
+        node_id: str = "BB9FAKE00000001",
+        seed: Optional[int] = None,
+        rack_id: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.namespaces = namespaces
+        self.node_id = node_id
+        self.rack_id = rack_id
+        # namespace -> partition bitmap per replica index, reported with the
+        # "replicas" info command. Masters all partitions when not set.
+        self.replicas: Dict[str, List[bytes]] = {}
+        self.faults = FakeNodeFaults()
+        self.records: Dict[Tuple[str, bytes], FakeRecord] = {}
+        self.udfs: Dict[Tuple[str, str], UDF] = {}
+        self.udf_files: Dict[str, bytes] = {}
+        self.commands: Counter = Counter()
+        self.connections = 0
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections:
+                writer.close()
+            await asyncio.gather(
+                *self._connections.values(), return_exceptions=True
+            )
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeAerospikeServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def register_udf(self, module: str, function: str, udf: UDF) -> None:
+        self.udfs[(module, function)] = udf
+
+    def clear(self) -> None:
+        self.records.clear()
+        self.commands.clear()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self._connections[writer] = asyncio.current_task()
+        header_size = AerospikeHeader.FORMAT.size
+        try:
+            while True:
+                header_data = await reader.readexactly(header_size)
+                header = AerospikeHeader.parse(header_data)
+                body = await reader.readexactly(header.length)
+                response = await self._handle(header.message_type, body)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            del self._connections[writer]
+            writer.close()
+
+    async def _handle(self, message_type: int, body: bytes) -> bytes:
+        faults = self.faults
+        delay = faults.latency
+        if faults.jitter:
+            delay += self._random.uniform(0, faults.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if message_type == MessageType.INFO:
+            self.commands["info"] += 1
+            return self._handle_info(InfoMessage.parse(body))
+        if message_type == MessageType.ADMIN:
+            self.commands["admin"] += 1
+            return self._handle_admin(AdminMessage.parse(body))
+
+        message = Message.parse(body)
+        error = None
+        if faults.next_errors:
+            error = faults.next_errors.pop(0)
+        elif faults.error_rate and self._random.random() < faults.error_rate:
+            error = faults.error_code
+        if error is not None:
+            self.commands["error"] += 1
+            return self._frame([self._response(error, last=True)])
+
+        fields: Dict[int, bytes] = {
+            f.field_type: f.data for f in message.fields
+        }
+        if message.info1 & Info1Flags.BATCH_INDEX:
+            self.commands["batch"] += 1
+            return self._handle_batch(message, fields)
+        if FieldTypes.DIGEST not in fields:
+            self.commands["scan"] += 1
+            return await self._handle_scan(message, fields)
+        self.commands["single"] += 1
+        return self._frame([self._handle_single(message, fields)])
+
+    def _frame(self, messages: List[bytes]) -> bytes:
+        data = b"".join(messages)
+        header = AerospikeHeader(
+            message_type=MessageType.MESSAGE, length=len(data)
+        )
+        return header.pack() + data
+
+    def _response(
+        self,
+        result_code: int,
+        record: Optional[FakeRecord] = None,
+        operations: Optional[List[Operation]] = None,
+        fields: Optional[List[Field]] = None,
+        index: int = 0,
+        last: bool = False,
+    ) -> bytes:
+        return Message(
+            info1=Info1Flags.EMPTY,
+            info2=Info2Flags.EMPTY,
+            info3=Info3Flags.LAST if last else Info3Flags.EMPTY,
+            transaction_ttl=index,
+            fields=fields or [],
+            operations=operations or [],
+            result_code=result_code,
+            generation=record.generation if record else 0,
+            record_ttl=record.void_time if record else 0,
+        ).pack()
+
+    def _handle_info(self, message: InfoMessage) -> bytes:
+        values = []
+        for command in message.commands:
+            values.append(f"{command}\t{self._info_value(command)}\n")
+        data = "".join(values).encode("utf-8")
+        header = AerospikeHeader(
+            message_type=MessageType.INFO, length=len(data)
+        )
+        return header.pack() + data
+
+    def _info_value(self, command: str) -> str:
+        name, _, params = command.partition(":")
+        if name == "node":
+            return self.node_id
+        if name == "build":
+            return "4.8.0.0-fake"
+        if name == "namespaces":
+            return ";".join(self.namespaces)
+        if name == "jobs":
+            return "status=done"
+        if name == "replicas":
+            all_partitions = pack_bitmap(range(N_PARTITIONS))
+            return format_replicas(
+                {
+                    namespace: self.replicas.get(namespace, [all_partitions])
+                    for namespace in self.namespaces
+                }
+            )
+        if name == "rack-ids":
+            return ";".join(
+                f"{namespace}:{self.rack_id}" for namespace in self.namespaces
+            )
+        if name == "udf-put":
+            args = dict(
+                param.split("=", 1) for param in params.split(";") if param
+            )
+            self.udf_files[args["filename"]] = b64decode(args["content"])
+            return ""
+        return ""
+
+    def _handle_admin(self, message: AdminMessage) -> bytes:
+        fields = []
+        if message.command_type == AdminCommandsType.LOGIN:
+            fields.append(
+                AdminField(AdminFieldTypes.SESSION_TOKEN, b"fake-session")
+            )
+        data = AdminMessage(
+            command_type=message.command_type, fields=fields
+        ).pack()
+        header = AerospikeHeader(
+            message_type=MessageType.ADMIN, length=len(data)
+        )
+        return header.pack() + data
+
+    def _get_record(
+        self, namespace: str, digest: bytes
+    ) -> Optional[FakeRecord]:
+        record = self.records.get((namespace, digest))
+        if record is not None and record.void_time:
+            if record.void_time <= server_now():
+                del self.records[(namespace, digest)]
+                return None
+        return record
+
+    def _handle_single(
+        self, message: Message, fields: Dict[int, bytes]
+    ) -> bytes:
+        namespace = fields[FieldTypes.NAMESPACE].decode("utf-8")
+        set_name = fields.get(FieldTypes.SETNAME, b"").decode("utf-8")
+        digest = fields[FieldTypes.DIGEST]
+        if namespace not in self.namespaces:
+            return self._response(ResultCode.INVALID_NAMESPACE)
+        record = self._get_record(namespace, digest)
+
+        predexp = fields.get(FieldTypes.PREDEXP)
+        try:
+            if predexp and record is not None:
+                predexps = PredExp.parse_many(predexp)
+                if not evaluate_predexp(predexps, record, digest):
+                    return self._response(ResultCode.FILTERED_OUT)
+            if FieldTypes.UDF_FUNCTION in fields:
+                return self._apply_udf(
+                    namespace, set_name, digest, record, message, fields
+                )
+            if message.info2 & Info2Flags.WRITE:
+                record, read_ops = self._write(
+                    namespace, set_name, digest, record, message
+                )
+                return self._response(ResultCode.OK, record, read_ops)
+        except FakeServerError as e:
+            return self._response(e.result_code)
+
+        if record is None:
+            return self._response(ResultCode.KEY_NOT_FOUND)
+        return self._response(
+            ResultCode.OK, record, self._read(record, message)
+        )
+
+    def _read(self, record: FakeRecord, message: Message) -> List[Operation]:
+        if message.info1 & Info1Flags.DONT_GET_BIN_DATA:
+            return []
+        if message.info1 & Info1Flags.GET_ALL:
+            names = list(record.bins)
+        else:
+            names = [
+                op.data_bin.name
+                for op in message.operations
+                if op.operation_type == OperationTypes.READ
+            ]
+        return [
+            Operation(OperationTypes.READ, Bin(0, name, record.bins[name]))
+            for name in names
+            if name in record.bins
+        ]
+
+    def _check_write_policy(
+        self, record: Optional[FakeRecord], message: Message
+    ) -> None:
+        info2, info3 = message.info2, message.info3
+        if record is None:
+            if info3 & (Info3Flags.UPDATE_ONLY | Info3Flags.REPLACE_ONLY):
+                raise FakeServerError(ResultCode.KEY_NOT_FOUND)
+            if info2 & Info2Flags.DELETE:
+                raise FakeServerError(ResultCode.KEY_NOT_FOUND)
+            return
+        if info2 & Info2Flags.CREATE_ONLY:
+            raise FakeServerError(ResultCode.KEY_EXISTS)
+        if info2 & Info2Flags.GENERATION:
+            if message.generation != record.generation:
+                raise FakeServerError(ResultCode.GENERATION_ERROR)
+        elif info2 & Info2Flags.GENERATION_GT:
+            if message.generation <= record.generation:
+                raise FakeServerError(ResultCode.GENERATION_ERROR)
+
+    def _write(
+        self,
+        namespace: str,
+        set_name: str,
+        digest: bytes,
+        record: Optional[FakeRecord],
+        message: Message,
+    ) -> Tuple[Optional[FakeRecord], List[Operation]]:
+        self._check_write_policy(record, message)
+        if message.info2 & Info2Flags.DELETE:
+            del self.records[(namespace, digest)]
+            return None, []
+
+        bins = dict(record.bins) if record is not None else {}
+        if message.info3 & (
+            Info3Flags.CREATE_OR_REPLACE | Info3Flags.REPLACE_ONLY
+        ):
+            bins = {}
+        read_ops = []
+        for op in message.operations:
+            name = op.data_bin.name
+            value = op.data_bin.data
+            if op.operation_type == OperationTypes.WRITE:
+                if value is None:
+                    bins.pop(name, None)
+                else:
+                    bins[name] = value
+            elif op.operation_type == OperationTypes.READ:
+                if name in bins:
+                    read_ops.append(
+                        Operation(OperationTypes.READ, Bin(0, name, bins[name]))
+                    )
+            elif op.operation_type in (
+                OperationTypes.INCR,
+                OperationTypes.APPEND,
+                OperationTypes.PREPEND,
+            ):
+                bins[name] = modify_bin(
+                    op.operation_type, bins.get(name), value
+                )
+            elif op.operation_type == OperationTypes.TOUCH:
+                if record is None:
+                    raise FakeServerError(ResultCode.KEY_NOT_FOUND)
+            elif op.operation_type == OperationTypes.DELETE:
+                bins = {}
+            else:
+                raise FakeServerError(ResultCode.UNSUPPORTED_FEATURE)
+
+        if not bins:
+            self.records.pop((namespace, digest), None)
+            return None, read_ops
+        record = self._store(namespace, set_name, digest, record, bins, message)
+        return record, read_ops
+
+    def _store(
+        self,
+        namespace: str,
+        set_name: str,
+        digest: bytes,
+        record: Optional[FakeRecord],
+        bins: Dict[str, AerospikeDataType],
+        message: Message,
+    ) -> FakeRecord:
+        ttl = message.record_ttl
+        if ttl == TTL_DONT_UPDATE and record is not None:
+            void_time = record.void_time
+        elif ttl in (0, TTL_NEVER_EXPIRE, TTL_DONT_UPDATE):
+            void_time = 0
+        else:
+            void_time = server_now() + ttl
+        new_record = FakeRecord(
+            set_name=set_name,
+            bins=bins,
+            generation=(record.generation if record else 0) + 1,
+            void_time=void_time,
+            last_update=time.time_ns(),
+        )
+        self.records[(namespace, digest)] = new_record
+        return new_record
+
+    def _apply_udf(
+        self,
+        namespace: str,
+        set_name: str,
+        digest: bytes,
+        record: Optional[FakeRecord],
+        message: Message,
+        fields: Dict[int, bytes],
+    ) -> bytes:
+        module = fields[FieldTypes.UDF_PACKAGE_NAME].decode("utf-8")
+        function = fields[FieldTypes.UDF_FUNCTION].decode("utf-8")
+        args = AerospikeList.parse(fields[FieldTypes.UDF_ARGLIST]).value
+        udf = self.udfs.get((module, function))
+        if udf is None:
+            failure = Bin.create("FAILURE", f"function not found {function}")
+            return self._response(
+                ResultCode.UDF_BAD_RESPONSE,
+                operations=[Operation(OperationTypes.READ, failure)],
+            )
+
+        bins = (
+            {name: data.value for name, data in record.bins.items()}
+            if record is not None
+            else None
+        )
+        udf_bins = {} if bins is None else dict(bins)
+        try:
+            result = udf(udf_bins, *args)
+        except Exception as e:  # noqa: B902
+            failure = Bin.create("FAILURE", str(e))
+            return self._response(
+                ResultCode.UDF_BAD_RESPONSE,
+                operations=[Operation(OperationTypes.READ, failure)],
+            )
+
+        if isinstance(result, tuple) and result[1:] == (DELETE_RECORD,):
+            self.records.pop((namespace, digest), None)
+            result = result[0]
+            record = None
+        elif udf_bins != (bins or {}):
+            new_bins = {
+                name: data_to_aerospike_type(value)
+                for name, value in udf_bins.items()
+            }
+            record = self._store(
+                namespace, set_name, digest, record, new_bins, message
+            )
+        success = Bin.create("SUCCESS", result)
+        return self._response(
+            ResultCode.OK, record, [Operation(OperationTypes.READ, success)]
+        )
+
+    def _handle_batch(
+        self, message: Message, fields: Dict[int, bytes]
+    ) -> bytes:
+        batch = fields.get(FieldTypes.BATCH_INDEX_WITH_SET)
+        if batch is None:
+            batch = fields[FieldTypes.BATCH_INDEX]
+        predexp = fields.get(FieldTypes.PREDEXP)
+        predexps = PredExp.parse_many(predexp) if predexp else None
+
+        keys_count, _allow_inline = BATCH_FORMAT.unpack_from(batch, 0)
+        offset = BATCH_FORMAT.size
+        responses = []
+        read_message = None
+        namespace = ""
+        for _i in range(keys_count):
+            index, digest, repeat = BATCH_KEY_FORMAT.unpack_from(batch, offset)
+            offset += BATCH_KEY_FORMAT.size
+            if not repeat:
+                info1, fields_count, ops_count = (
+                    BATCH_RECORD_FORMAT.unpack_from(batch, offset)
+                )
+                offset += BATCH_RECORD_FORMAT.size
+                record_fields = []
+                for _j in range(fields_count):
+                    length = SIZE_FORMAT.unpack_from(batch, offset)[0]
+                    end = offset + SIZE_FORMAT.size + length
+                    record_fields.append(Field.parse(batch[offset:end]))
+                    offset = end
+                ops = []
+                for _j in range(ops_count):
+                    length = SIZE_FORMAT.unpack_from(batch, offset)[0]
+                    end = offset + SIZE_FORMAT.size + length
+                    ops.append(Operation.parse(batch[offset:end]))
+                    offset = end
+                namespace = record_fields[0].data.decode("utf-8")
+                read_message = Message(
+                    info1=info1,
+                    info2=Info2Flags.EMPTY,
+                    info3=Info3Flags.EMPTY,
+                    transaction_ttl=0,
+                    fields=[],
+                    operations=ops,
+                )
+            record = self._get_record(namespace, digest)
+            try:
+                if record is None:
+                    response = self._response(
+                        ResultCode.KEY_NOT_FOUND, index=index
+                    )
+                elif predexps and not evaluate_predexp(
+                    predexps, record, digest
+                ):
+                    response = self._response(
+                        ResultCode.FILTERED_OUT, index=index
+                    )
+                else:
+                    ops = self._read(record, read_message)
+                    response = self._response(
+                        ResultCode.OK, record, ops, index=index
+                    )
+            except FakeServerError as e:
+                response = self._response(e.result_code, index=index)
+            responses.append(response)
+        responses.append(self._response(ResultCode.OK, last=True))
+        return self._frames(responses)
+
+    def _frames(self, messages: List[bytes]) -> bytes:
+        return b"".join(
+            self._frame(messages[i : i + RECORDS_PER_FRAME])
+            for i in range(0, len(messages), RECORDS_PER_FRAME)
+        )
+
+    def _scan_records(
+        self, fields: Dict[int, bytes]
+    ) -> List[Tuple[bytes, FakeRecord]]:
+        namespace = fields[FieldTypes.NAMESPACE].decode("utf-8")
+        set_name = fields.get(FieldTypes.SETNAME, b"").decode("utf-8")
+        predexp = fields.get(FieldTypes.PREDEXP)
+        predexps = PredExp.parse_many(predexp) if predexp else None
+        records = []
+        for (record_namespace, digest), record in list(self.records.items()):
+            if record_namespace != namespace:
+                continue
+            if set_name and record.set_name != set_name:
+                continue
+            if self._get_record(namespace, digest) is None:
+                continue
+            if predexps and not evaluate_predexp(predexps, record, digest):
+                continue
+            records.append((digest, record))
+        return records
+
+    def _scan_partitions(
+        self, namespace: str, fields: Dict[int, bytes]
+    ) -> Dict[int, bytes]:
+        """
+        Returns partition -> digest to resume after (empty to scan it all)
+        """
+        partitions = {}
+        pids = fields.get(FieldTypes.PID_ARRAY, b"")
+        for offset in range(0, len(pids), PARTITION_ID_FORMAT.size):
+            (partition,) = PARTITION_ID_FORMAT.unpack_from(pids, offset)
+            partitions[partition] = b""
+        digests = fields.get(FieldTypes.DIGEST_ARRAY, b"")
+        for offset in range(0, len(digests), DIGEST_SIZE):
+            digest = digests[offset : offset + DIGEST_SIZE]
+            partitions[partition_id(digest)] = digest
+        return partitions
+
+    def _owns_partition(self, namespace: str, partition: int) -> bool:
+        bitmaps = self.replicas.get(namespace)
+        return bitmaps is None or owns_partition(bitmaps[0], partition)
+
+    async def _handle_scan(
+        self, message: Message, fields: Dict[int, bytes]
+    ) -> bytes:
+        namespace = fields[FieldTypes.NAMESPACE].decode("utf-8")
+        if namespace not in self.namespaces:
+            return self._frame(
+                [self._response(ResultCode.INVALID_NAMESPACE, last=True)]
+            )
+        try:
+            records = self._scan_records(fields)
+        except FakeServerError as e:
+            return self._frame([self._response(e.result_code, last=True)])
+
+        if FieldTypes.UDF_FUNCTION in fields:
+            for digest, record in records:
+                self._apply_udf(
+                    namespace, record.set_name, digest, record, message, fields
+                )
+            return self._frame([self._response(ResultCode.OK, last=True)])
+
+        partitions = self._scan_partitions(namespace, fields)
+        if partitions:
+            records.sort(key=lambda item: item[0])
+        responses = []
+        for digest, record in records:
+            if partitions:
+                after = partitions.get(partition_id(digest))
+                if after is None or digest <= after:
+                    continue
+                if not self._owns_partition(namespace, partition_id(digest)):
+                    continue
+            record_fields = [
+                Field(FieldTypes.NAMESPACE, namespace.encode("utf-8")),
+                Field(FieldTypes.SETNAME, record.set_name.encode("utf-8")),
+                Field(FieldTypes.DIGEST, digest),
+            ]
+            ops = self._read(record, message)
+            responses.append(
+                self._response(ResultCode.OK, record, ops, fields=record_fields)
+            )
+        rps = fields.get(FieldTypes.SCAN_RPS)
+        if rps:
+            (records_per_second,) = SCAN_RPS_FORMAT.unpack(rps)
+            await asyncio.sleep(len(responses) / records_per_second)
+        for partition in partitions:
+            responses.append(
+                Message(
+                    info1=Info1Flags.EMPTY,
+                    info2=Info2Flags.EMPTY,
+                    info3=Info3Flags.PARTITION_DONE,
+                    transaction_ttl=0,
+                    fields=[],
+                    operations=[],
+                    result_code=(
+                        ResultCode.OK
+                        if self._owns_partition(namespace, partition)
+                        else ResultCode.PARTITION_UNAVAILABLE
+                    ),
+                    generation=partition,
+                ).pack()
+            )
+        responses.append(self._response(ResultCode.OK, last=True))
+        return self._frames(responses)
+
+
+def modify_bin(
+    operation_type: OperationTypes,
+    current: Optional[AerospikeDataType],
+    value: AerospikeDataType,
+) -> AerospikeDataType:
+    if current is None:
+        return value
+    if type(current) is not type(value):
+        raise FakeServerError(ResultCode.BIN_TYPE_ERROR)
+    if operation_type == OperationTypes.INCR:
+        if not isinstance(current, (AerospikeInteger, AerospikeDouble)):
+            raise FakeServerError(ResultCode.BIN_TYPE_ERROR)
+        return type(current)(current.value + value.value)
+    if operation_type == OperationTypes.APPEND:
+        return type(current)(current.value + value.value)
+    return type(current)(value.value + current.value)
+
+
+def _bin_value(record: FakeRecord, name: bytes, value_type: type) -> Any:
+    data = record.bins.get(name.decode("utf-8"))
+    if not isinstance(data, value_type):
+        return None
+    return data.value
+
+
+def evaluate_predexp(
+    predexps: List[PredExp], record: FakeRecord, digest: bytes
+) -> bool:
+    """
+    Evaluates the postfix predicate expressions against the record
+    """
+    stack: List[Any] = []
+    for predexp in predexps:
+        tag, data = predexp.tag, predexp.data
+        if tag == PredExpTags.INTEGER_VALUE:
+            stack.append(INTEGER_FORMAT.unpack(data)[0])
+        elif tag == PredExpTags.STRING_VALUE:
+            stack.append(data.decode("utf-8"))
+        elif tag == PredExpTags.INTEGER_BIN:
+            stack.append(_bin_value(record, data, AerospikeInteger))
+        elif tag == PredExpTags.STRING_BIN:
+            stack.append(_bin_value(record, data, AerospikeString))
+        elif tag == PredExpTags.REC_LAST_UPDATE:
+            stack.append(record.last_update)
+        elif tag == PredExpTags.REC_VOID_TIME:
+            void_time = record.void_time
+            if void_time:
+                void_time = (void_time + CITRUSLEAF_EPOCH) * 10**9
+            stack.append(void_time)
+        elif tag == PredExpTags.REC_DEVICE_SIZE:
+            stack.append(
+                sum(len(value.pack()) for value in record.bins.values())
+            )
+        elif tag == PredExpTags.REC_DIGEST_MODULO:
+            modulo = UINT32_FORMAT.unpack(data)[0]
+            stack.append(int.from_bytes(digest[-4:], "little") % modulo)
+        elif PredExpTags.INTEGER_EQUAL <= tag <= PredExpTags.STRING_UNEQUAL:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(_compare(tag, left, right))
+        elif tag == PredExpTags.STRING_REGEX:
+            flags = RegexFlags(UINT32_FORMAT.unpack(data)[0])
+            pattern = stack.pop()
+            value = stack.pop()
+            re_flags = re.IGNORECASE if flags & RegexFlags.ICASE else 0
+            stack.append(
+                value is not None
+                and re.search(pattern, value, re_flags) is not None
+            )
+        elif tag in (PredExpTags.AND, PredExpTags.OR):
+            count = COUNT_FORMAT.unpack(data)[0]
+            values = [stack.pop() for _ in range(count)]
+            stack.append(all(values) if tag == PredExpTags.AND else any(values))
+        elif tag == PredExpTags.NOT:
+            stack.append(not stack.pop())
+        else:
+            raise FakeServerError(ResultCode.PARAMETER_ERROR)
+    return bool(stack and stack[-1])
+
+
+def _compare(tag: int, left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    if tag in (PredExpTags.INTEGER_EQUAL, PredExpTags.STRING_EQUAL):
+        return left == right
+    if tag in (PredExpTags.INTEGER_UNEQUAL, PredExpTags.STRING_UNEQUAL):
+        return left != right
+    if tag == PredExpTags.INTEGER_GREATER:
+        return left > right
+    if tag == PredExpTags.INTEGER_GREATEREQ:
+        return left >= right
+    if tag == PredExpTags.INTEGER_LESS:
+        return left < right
+    return left <= right
@@ -0,0 +1,332 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Command phases, timed in nanoseconds
+PHASES = ("connection_wait", "encode", "write", "wait", "decode")
+# Node load gauges, from the client's limiter and circuit breaker
+LOAD_GAUGES = ("limit", "in_flight", "queued", "circuit")
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of nanosecond values,
+    each power of two is split into 2**SUB_BUCKET_BITS buckets
+    (~12.5% relative precision) so recording is O(1) and memory is fixed.
+    """
+
+    SUB_BUCKET_BITS = 3
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    BUCKETS = 64 * SUB_BUCKETS
+
+    __slots__ = ["counts", "count", "total", "max"]
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        if value < cls.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - 1 - cls.SUB_BUCKET_BITS
+        return (shift << cls.SUB_BUCKET_BITS) + (value >> shift)
+
+    @classmethod
+    def bucket_upper_bound(cls, index: int) -> int:
+        if index < cls.SUB_BUCKETS:
+            return index
+        shift = (index >> cls.SUB_BUCKET_BITS) - 1
+        top = (index & (cls.SUB_BUCKETS - 1)) + cls.SUB_BUCKETS
+        return ((top + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        value = max(value, 0)
+        self.counts[self.bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> int:
+        """
+        Returns the upper bound of the bucket holding the percentile
+        """
+        if not self.count:
+            return 0
+        target = max(1, int(self.count * percent / 100 + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self.bucket_upper_bound(index), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max,
+        }
+
+
+@dataclass
+class CommandSample:
+    """
+    A single executed command, phases are in nanoseconds.
+    For multi-record commands (batch, scan) wait is the time to the first
+    response frame and decode accumulates all frames.
+    """
+
+    node: str
+    command: str
+    connection_wait: int
+    encode: int
+    write: int
+    wait: int
+    decode: int
+    bytes_out: int
+    bytes_in: int
+    result_code: int
+
+    @property
+    def total(self) -> int:
+        return sum(getattr(self, phase) for phase in PHASES)
+
+
+@dataclass
+class NodeLoadSample:
+    """
+    A node's concurrency limit, commands in flight and queued, and circuit
+    state (overload.CircuitState) after a command was admitted, settled or
+    shed. shed is why a command wasn't sent ("overload" or "circuit_open").
+    limit is 0 without a limit policy.
+    """
+
+    node: str
+    limit: int
+    in_flight: int
+    queued: int
+    circuit: int
+    shed: Optional[str] = None
+
+
+@dataclass
+class CommandMetrics:
+    count: int = 0
+    bytes_out: int = 0
+    bytes_in: int = 0
+    result_codes: Counter = field(default_factory=Counter)
+    total: LatencyHistogram = field(default_factory=LatencyHistogram)
+    phases: Dict[str, LatencyHistogram] = field(
+        default_factory=lambda: {phase: LatencyHistogram() for phase in PHASES}
+    )
+
+    def record(self, sample: CommandSample) -> None:
+        self.count += 1
+        self.bytes_out += sample.bytes_out
+        self.bytes_in += sample.bytes_in
+        self.result_codes[sample.result_code] += 1
+        self.total.record(sample.total)
+        for phase, histogram in self.phases.items():
+            histogram.record(getattr(sample, phase))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "result_codes": dict(self.result_codes),
+            "latency_ns": self.total.snapshot(),
+            "phases_ns": {
+                phase: histogram.snapshot()
+                for phase, histogram in self.phases.items()
+            },
+        }
+
+
+class MetricsHook:
+    """
+    Receives every command sample, subclass to export metrics.
+    """
+
+    def on_command(self, sample: CommandSample) -> None:
+        pass
+
+    def on_load(self, sample: NodeLoadSample) -> None:
+        pass
+
+
+class ClientMetrics:
+    """
+    Aggregates command samples per node and command type,
+    keeps the latest load sample and shed commands per node,
+    and forwards them to the hooks.
+    """
+
+    def __init__(self, hooks: Optional[List[MetricsHook]] = None) -> None:
+        self.hooks: List[MetricsHook] = hooks or []
+        self.nodes: Dict[str, Dict[str, CommandMetrics]] = {}
+        self.load: Dict[str, NodeLoadSample] = {}
+        self.shed: Dict[str, Counter] = {}
+
+    def record(self, sample: CommandSample) -> None:
+        commands = self.nodes.setdefault(sample.node, {})
+        metrics = commands.get(sample.command)
+        if metrics is None:
+            metrics = commands[sample.command] = CommandMetrics()
+        metrics.record(sample)
+        for hook in self.hooks:
+            hook.on_command(sample)
+
+    def record_load(self, sample: NodeLoadSample) -> None:
+        self.load[sample.node] = sample
+        if sample.shed is not None:
+            self.shed.setdefault(sample.node, Counter())[sample.shed] += 1
+        for hook in self.hooks:
+            hook.on_load(sample)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {
+            node: {
+                command: metrics.snapshot()
+                for command, metrics in commands.items()
+            }
+            for node, commands in self.nodes.items()
+        }
+
+    def load_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            node: {
+                **{gauge: getattr(sample, gauge) for gauge in LOAD_GAUGES},
+                "shed": dict(self.shed.get(node, {})),
+            }
+            for node, sample in self.load.items()
+        }
+
+    def reset(self) -> None:
+        self.nodes.clear()
+        self.load.clear()
+        self.shed.clear()
+
+
+class PrometheusHook(MetricsHook):
+    """
+    Exports samples with prometheus_client (optional dependency).
+    """
+
+    def __init__(self, registry: Any = None, prefix: str = "aerospike_client"):
+        from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+
+        registry = registry or REGISTRY
+        self.latency = Histogram(
+            f"{prefix}_command_seconds",
+            "Command latency by phase",
+            ["node", "command", "phase"],
+            registry=registry,
+        )
+        self.bytes = Counter(
+            f"{prefix}_bytes",
+            "Bytes sent and received",
+            ["node", "command", "direction"],
+            registry=registry,
+        )
+        self.results = Counter(
+            f"{prefix}_results",
+            "Command result codes",
+            ["node", "command", "result_code"],
+            registry=registry,
+        )
+        self.load = {
+            gauge: Gauge(
+                f"{prefix}_node_{gauge}",
+                f"Node {gauge} from the limiter and circuit breaker",
+                ["node"],
+                registry=registry,
+            )
+            for gauge in LOAD_GAUGES
+        }
+        self.shed = Counter(
+            f"{prefix}_shed",
+            "Commands not sent, by reason",
+            ["node", "reason"],
+            registry=registry,
+        )
+
+    def on_command(self, sample: CommandSample) -> None:
+        node, command = sample.node, sample.command
+        for phase in PHASES:
+            self.latency.labels(node, command, phase).observe(
+                getattr(sample, phase) / 1e9
+            )
+        self.latency.labels(node, command, "total").observe(sample.total / 1e9)
+        self.bytes.labels(node, command, "out").inc(sample.bytes_out)
+        self.bytes.labels(node, command, "in").inc(sample.bytes_in)
+        self.results.labels(node, command, str(sample.result_code)).inc()
+
+    def on_load(self, sample: NodeLoadSample) -> None:
+        for gauge, metric in self.load.items():
+            metric.labels(sample.node).set(getattr(sample, gauge))
+        if sample.shed is not None:
+            self.shed.labels(sample.node, sample.shed).inc()
+
+
+class OpenTelemetryHook(MetricsHook):
+    """
+    Exports samples with the opentelemetry metrics API (optional dependency).
+    """
+
+    def __init__(self, meter: Any = None, prefix: str = "aerospike.client"):
+        if meter is None:
+            from opentelemetry.metrics import get_meter
+
+            meter = get_meter("aioaerospike")
+        self.latency = meter.create_histogram(
+            f"{prefix}.command.duration", unit="s"
+        )
+        self.bytes = meter.create_counter(f"{prefix}.bytes", unit="By")
+        self.results = meter.create_counter(f"{prefix}.results")
+        # Latest load sample per node, read by the observable gauges
+        self._load: Dict[str, NodeLoadSample] = {}
+        for gauge in LOAD_GAUGES:
+            meter.create_observable_gauge(
+                f"{prefix}.node.{gauge}", callbacks=[self._observer(gauge)]
+            )
+        self.shed = meter.create_counter(f"{prefix}.shed")
+
+    def _observer(self, gauge: str) -> Callable[[Any], List[Any]]:
+        from opentelemetry.metrics import Observation
+
+        def observe(options: Any) -> List[Any]:
+            return [
+                Observation(getattr(sample, gauge), {"node": node})
+                for node, sample in self._load.items()
+            ]
+
+        return observe
+
+    def on_command(self, sample: CommandSample) -> None:
+        attributes = {"node": sample.node, "command": sample.command}
+        for phase in PHASES:
+            self.latency.record(
+                getattr(sample, phase) / 1e9, {**attributes, "phase": phase}
+            )
+        self.latency.record(
+            sample.total / 1e9, {**attributes, "phase": "total"}
+        )
+        self.bytes.add(sample.bytes_out, {**attributes, "direction": "out"})
+        self.bytes.add(sample.bytes_in, {**attributes, "direction": "in"})
+        self.results.add(
+            1, {**attributes, "result_code": str(sample.result_code)}
+        )
+
+    def on_load(self, sample: NodeLoadSample) -> None:
+        self._load[sample.node] = sample
+        if sample.shed is not None:
+            self.shed.add(1, {"node": sample.node, "reason": sample.shed})
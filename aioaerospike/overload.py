@@ -0,0 +1,188 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from time import monotonic
+from typing import Deque, Optional
+
+from .exceptions import CircuitOpenError, ClientOverloadError
+
+# A client talks to a single node, so its limiter and breaker are per node.
+# Commands are congested when the node answers with an overload or timeout
+# result code, the connection fails, or (with a latency_threshold) they are
+# too slow: the concurrency limit is then cut (AIMD), and consecutive
+# congested commands open the circuit.
+
+
+@dataclass
+class LimitPolicy:
+    """
+    AIMD concurrency limit: while the limit is reached, it grows by one per
+    limit commands completing without congestion, a congested command
+    multiplies it by backoff (once per round trip).
+    Commands over the limit wait in a queue of up to max_queue commands for
+    up to queue_timeout seconds, others are shed with ClientOverloadError.
+    """
+
+    initial_limit: int = 16
+    min_limit: int = 1
+    max_limit: int = 256
+    backoff: float = 0.5
+    # Seconds from admission to response, None to only use result codes
+    latency_threshold: Optional[float] = None
+    max_queue: int = 1024
+    queue_timeout: Optional[float] = None
+
+
+@dataclass
+class BreakerPolicy:
+    """
+    The circuit opens after failure_threshold consecutive congested commands,
+    commands then fail fast with CircuitOpenError. After reset_timeout
+    seconds a single probe command is sent, closing the circuit when it
+    succeeds and reopening it otherwise.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 1.0
+
+
+class CircuitState(IntEnum):
+    # Commands are sent
+    CLOSED = 0
+    # Commands fail fast
+    OPEN = 1
+    # A probe command is in flight, others fail fast
+    HALF_OPEN = 2
+
+
+class AdaptiveLimiter:
+    """
+    Admits commands under a concurrency limit adapted with AIMD
+    """
+
+    def __init__(self, policy: LimitPolicy) -> None:
+        self.policy = policy
+        self.limit = float(policy.initial_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Commands admitted before the last decrease don't decrease it again
+        self._decreased_at = float("-inf")
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """
+        Waits for a slot under the limit, returns the admission time to pass
+        to release.
+        """
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return monotonic()
+        if len(self._waiters) >= self.policy.max_queue:
+            raise ClientOverloadError(
+                f"{self.in_flight} commands in flight, {self.queued} queued"
+            )
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.policy.queue_timeout)
+        except BaseException as error:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot as the wait was interrupted
+                self.in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(error, asyncio.TimeoutError):
+                raise ClientOverloadError(
+                    f"Queued for over {self.policy.queue_timeout}s"
+                ) from None
+            raise
+        return monotonic()
+
+    def release(self, start: float, congested: bool) -> None:
+        """
+        Frees the slot of a command admitted at start, adapting the limit
+        """
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        threshold = self.policy.latency_threshold
+        if threshold is not None and monotonic() - start > threshold:
+            congested = True
+        if congested:
+            if start >= self._decreased_at:
+                self.limit = max(
+                    float(self.policy.min_limit),
+                    self.limit * self.policy.backoff,
+                )
+                self._decreased_at = monotonic()
+        elif saturated:
+            self.limit = min(
+                float(self.policy.max_limit), self.limit + 1 / self.limit
+            )
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class CircuitBreaker:
+    """
+    Fails commands fast while the node is unhealthy
+    """
+
+    def __init__(self, policy: BreakerPolicy) -> None:
+        self.policy = policy
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether the next command would fail fast
+        """
+        if self.state == CircuitState.OPEN:
+            return monotonic() - self._opened_at < self.policy.reset_timeout
+        return self.state == CircuitState.HALF_OPEN
+
+    def allow(self) -> bool:
+        """
+        Raises CircuitOpenError unless the command may be sent,
+        returns whether it's the probe.
+        """
+        if self.state == CircuitState.CLOSED:
+            return False
+        if self.is_open:
+            raise CircuitOpenError(
+                f"Circuit open after {self.failures} failures"
+            )
+        self.state = CircuitState.HALF_OPEN
+        return True
+
+    def abort(self) -> None:
+        """
+        The probe wasn't sent, the next command probes instead
+        """
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.OPEN
+
+    def record(self, failed: bool) -> None:
+        if not failed:
+            self.failures = 0
+            self.state = CircuitState.CLOSED
+            return
+        self.failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.policy.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = monotonic()
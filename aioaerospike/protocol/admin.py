@@ -3,7 +3,7 @@ from enum import IntEnum
 from struct import Struct
 from typing import List, Type
 
-from bcrypt import hashpw
+from .slots import slotted
 
 BCRYPT_SALT = b"$2a$10$7EqJtq98hPqEX7fNZaFWoO"
 
@@ -40,6 +40,7 @@ class FieldTypes(IntEnum):
     WHITELIST = 13
 
 
+@slotted
 @dataclass
 class Field:
     FORMAT = Struct("!IB")
@@ -47,48 +48,58 @@ class Field:
     data: bytes
 
     def pack(self) -> bytes:
-        length = len(self.data)
+        length = len(self.data) + 1
         return self.FORMAT.pack(length, self.field_type) + self.data
 
     @classmethod
     def parse(cls: Type["Field"], data: bytes) -> "Field":
         length, field_type = cls.FORMAT.unpack(data[: cls.FORMAT.size])
-        data = data[cls.FORMAT.size : length]
+        data = data[cls.FORMAT.size : cls.FORMAT.size + length - 1]
         return cls(field_type=field_type, data=data)
 
     def __len__(self):
         return len(self.data)
 
 
+@slotted
 @dataclass
 class AdminMessage:
-    FORMAT = Struct("!16xBB")
+    # Unused, result code, command, fields count, 12 unused
+    FORMAT = Struct("!xBBB12x")
     command_type: AdminCommandsType
     fields: List[Field]
+    result_code: int = 0
 
     def pack(self) -> bytes:
         fields_count = len(self.fields)
         fields_data = b""
         for field in self.fields:
             fields_data += field.pack()
-        return self.FORMAT.pack(self.command_type, fields_count) + fields_data
+        base = self.FORMAT.pack(
+            self.result_code, self.command_type, fields_count
+        )
+        return base + fields_data
 
     @classmethod
     def parse(cls: Type["AdminMessage"], data: bytes) -> "AdminMessage":
-        command_type, fields_count = cls.FORMAT.unpack(data[: cls.FORMAT.size])
+        result_code, command_type, fields_count = cls.FORMAT.unpack(
+            data[: cls.FORMAT.size]
+        )
         fields = []
         data_left = data[cls.FORMAT.size :]
         for _i in range(fields_count):
             field = Field.parse(data_left)
             fields.append(field)
             data_left = data_left[Field.FORMAT.size + len(field) :]
-        return cls(fields=fields, command_type=command_type)
+        return cls(
+            fields=fields, command_type=command_type, result_code=result_code
+        )
 
     @classmethod
     def login(cls: Type["AdminMessage"], user: str, password: str) -> bytes:
         hashed_pass = hash_password(password)
         user_field = Field(FieldTypes.USER, user.encode("utf-8"))
-        password_field = Field(FieldTypes.PASSWORD, hashed_pass)
+        password_field = Field(FieldTypes.CREDENTIAL, hashed_pass)
         return cls(
             command_type=AdminCommandsType.LOGIN,
             fields=[user_field, password_field],
@@ -99,4 +110,7 @@ def hash_password(password: str) -> bytes:
     """
     Hashes password according to Aerospike algorithm
     """
+    # Imported on first login, most workloads never authenticate
+    from bcrypt import hashpw
+
     return hashpw(password.encode("utf-8"), BCRYPT_SALT)
@@ -5,8 +5,6 @@ from enum import IntEnum
 from struct import Struct
 from typing import Any, ClassVar, Dict, List, Optional, Type, Union
 
-import msgpack
-
 AerospikeKeyType = Union[str, bytes, float, int]
 AerospikeValueType = Union[str, bytes, float, int, list, dict]
 
@@ -52,6 +50,8 @@ class AerospikeMetaDataType(ABCMeta):
 
 
 class AerospikeDataType(metaclass=AerospikeMetaDataType):
+    # A value is created per bin and per list/map item, no instance __dict__
+    __slots__ = ("value",)
 
     DIGESTABLE = False
     TYPE: Optional[AerospikeTypes] = None
@@ -91,8 +91,9 @@ class AerospikeDataType(metaclass=AerospikeMetaDataType):
 
 
 class AerospikeInteger(AerospikeDataType):
+    __slots__ = ()
     TYPE = AerospikeTypes.INTEGER
-    FORMAT = Struct("!Q")
+    FORMAT = Struct("!q")
     DIGESTABLE = True
 
     def __init__(self, value: int):
@@ -110,6 +111,7 @@ class AerospikeInteger(AerospikeDataType):
 
 
 class AerospikeDouble(AerospikeDataType):
+    __slots__ = ()
     TYPE = AerospikeTypes.DOUBLE
     FORMAT = Struct("!d")
     DIGESTABLE = True
@@ -129,6 +131,7 @@ class AerospikeDouble(AerospikeDataType):
 
 
 class AerospikeString(AerospikeDataType):
+    __slots__ = ()
     TYPE = AerospikeTypes.STRING
     DIGESTABLE = True
 
@@ -147,6 +150,7 @@ class AerospikeString(AerospikeDataType):
 
 
 class AerospikeBytes(AerospikeDataType):
+    __slots__ = ()
     TYPE = AerospikeTypes.BLOB
     DIGESTABLE = True
 
@@ -165,6 +169,7 @@ class AerospikeBytes(AerospikeDataType):
 
 
 class AerospikeNone(AerospikeDataType):
+    __slots__ = ()
     TYPE = AerospikeTypes.UNDEF
 
     def __init__(self, value: None):
@@ -182,6 +187,7 @@ class AerospikeNone(AerospikeDataType):
 
 
 class AerospikeList(AerospikeDataType):
+    __slots__ = ("_size",)
     TYPE = AerospikeTypes.TLIST
     DIGESTABLE = False
 
@@ -190,6 +196,9 @@ class AerospikeList(AerospikeDataType):
         self._size = size
 
     def pack(self) -> bytes:
+        # msgpack is only imported once lists or maps are used
+        import msgpack
+
         aerospike_list = []
         for val in self.value:
             aerospike_list.append(pack_native(val))
@@ -199,6 +208,8 @@ class AerospikeList(AerospikeDataType):
 
     @classmethod
     def parse(cls, data: bytes) -> "AerospikeList":
+        import msgpack
+
         raw_values = msgpack.unpackb(data)
         parsed_values = []
         for value in raw_values:
@@ -212,6 +223,7 @@ class AerospikeList(AerospikeDataType):
 
 
 class AerospikeMap(AerospikeDataType):
+    __slots__ = ("_size",)
     TYPE = AerospikeTypes.TMAP
     DIGESTABLE = False
 
@@ -220,6 +232,8 @@ class AerospikeMap(AerospikeDataType):
         self._size = size
 
     def pack(self) -> bytes:
+        import msgpack
+
         aerospike_dict = {}
         for k, v in self.value.items():
             packed_k = pack_native(k)
@@ -231,6 +245,8 @@ class AerospikeMap(AerospikeDataType):
 
     @classmethod
     def parse(cls, data: bytes) -> "AerospikeMap":
+        import msgpack
+
         raw_dict = msgpack.unpackb(data)
         parsed_dict = {}
         for k, v in raw_dict.items():
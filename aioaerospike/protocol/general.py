@@ -1,11 +1,18 @@
 from dataclasses import dataclass
 from enum import IntEnum
+from struct import Struct
 from typing import Any, Dict, Type, Union
 
-from construct import BytesInteger, Const, Container, Int8ub, Struct
-
 from .admin import AdminMessage
+from .info import InfoMessage
 from .message import Message
+from .slots import slotted
+
+# Proto header as a single integer: version (8 bits), message type (8 bits)
+# and body length (48 bits)
+HEADER_FORMAT = Struct("!Q")
+LENGTH_MASK = (1 << 48) - 1
+PROTO_VERSION = 2
 
 
 class MessageType(IntEnum):
@@ -15,45 +22,51 @@ class MessageType(IntEnum):
     COMPRESSED = 4
 
 
-MESSAGE_TYPE_TO_CLASS: Dict[MessageType, Type[Any]] = {
+MESSAGE_TYPE_TO_CLASS: Dict[int, Type[Any]] = {
+    MessageType.INFO: InfoMessage,
     MessageType.ADMIN: AdminMessage,
     MessageType.MESSAGE: Message,
 }
 
 MESSAGE_CLASS_TO_TYPE = {
+    InfoMessage: MessageType.INFO,
     AdminMessage: MessageType.ADMIN,
     Message: MessageType.MESSAGE,
 }
 
 
+def pack_header(message_type: int, length: int) -> bytes:
+    return HEADER_FORMAT.pack(
+        (PROTO_VERSION << 56) | (message_type << 48) | length
+    )
+
+
+@slotted
 @dataclass
 class AerospikeHeader:
-    # Using construct because it's easier for 48bit integer.
-    FORMAT = Struct(
-        "version" / Const(2, Int8ub),
-        "message_type" / Int8ub,
-        "length" / BytesInteger(6),
-    )
+    FORMAT = HEADER_FORMAT
     message_type: MessageType
     length: int
 
     def pack(self) -> bytes:
-        return self.FORMAT.build(
-            Container(message_type=self.message_type, length=self.length)
-        )
+        return pack_header(self.message_type, self.length)
 
     @classmethod
     def parse(cls: Type["AerospikeHeader"], data: bytes) -> "AerospikeHeader":
-        parsed_data = cls.FORMAT.parse(data)
+        (header,) = cls.FORMAT.unpack(data)
+        version = header >> 56
+        if version != PROTO_VERSION:
+            raise ValueError(f"Unsupported protocol version {version}")
         return cls(
-            message_type=parsed_data.message_type, length=parsed_data.length
+            message_type=(header >> 48) & 0xFF, length=header & LENGTH_MASK
         )
 
 
+@slotted
 @dataclass
 class AerospikeMessage:
 
-    message: Union[Message]
+    message: Union[Message, AdminMessage, InfoMessage]
 
     def pack(self) -> bytes:
         packed_message = self.message.pack()
@@ -65,7 +78,7 @@ class AerospikeMessage:
 
     @classmethod
     def parse(cls: Type["AerospikeMessage"], data: bytes) -> "AerospikeMessage":
-        header = AerospikeHeader.parse(data[: AerospikeHeader.FORMAT.sizeof()])
+        header = AerospikeHeader.parse(data[: AerospikeHeader.FORMAT.size])
         message_class = MESSAGE_TYPE_TO_CLASS[header.message_type]
-        message = message_class.parse(data[AerospikeHeader.FORMAT.sizeof() :])
+        message = message_class.parse(data[AerospikeHeader.FORMAT.size :])
         return cls(message=message)
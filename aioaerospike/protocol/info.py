@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Type
+
+from .slots import slotted
+
+
+@slotted
+@dataclass
+class InfoMessage:
+    """
+    Info protocol message, commands are sent newline separated and responded
+    as name<TAB>value lines.
+    """
+
+    commands: List[str]
+    values: Dict[str, str] = field(default_factory=dict)
+
+    def pack(self) -> bytes:
+        return "".join(f"{command}\n" for command in self.commands).encode(
+            "utf-8"
+        )
+
+    @classmethod
+    def parse(cls: Type["InfoMessage"], data: bytes) -> "InfoMessage":
+        commands = []
+        values = {}
+        for line in data.decode("utf-8").splitlines():
+            if not line:
+                continue
+            command, _, value = line.partition("\t")
+            commands.append(command)
+            values[command] = value
+        return cls(commands=commands, values=values)
@@ -1,16 +1,20 @@
+import time
 from dataclasses import dataclass
 from enum import IntEnum, IntFlag, auto
 from functools import reduce
 from struct import Struct
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, Union
 
 from .datatypes import (
     AerospikeDataType,
     AerospikeKeyType,
+    AerospikeList,
     AerospikeValueType,
     data_to_aerospike_type,
     parse_raw,
 )
+from .predexp import PredExp, pack_predexps
+from .slots import slotted
 
 # Can read about the flag in as_command.h (C client)
 
@@ -44,7 +48,10 @@ class Info3Flags(IntFlag):
     EMPTY = 0
     LAST = auto()
     COMMIT_MASTER = auto()
-    UNUSED = auto()
+    # Partition scans: every partition of the scan is closed by a message
+    # with this flag, partition id in generation and result code
+    # PARTITION_UNAVAILABLE if this node couldn't scan it
+    PARTITION_DONE = auto()
     UPDATE_ONLY = auto()
     CREATE_OR_REPLACE = auto()
     REPLACE_ONLY = auto()
@@ -61,6 +68,10 @@ class FieldTypes(IntEnum):
     SCAN_OPTIONS = 8
     SCAN_TIMEOUT = 9
     SCAN_RPS = 10
+    # Partition ids to scan, 2 bytes little endian each
+    PID_ARRAY = 11
+    # Digests to resume partitions after, scanning each digest's partition
+    DIGEST_ARRAY = 12
     INDEX_RANGE = 22
     INDEX_FILTER = 23
     INDEX_LIMIT = 24
@@ -76,6 +87,7 @@ class FieldTypes(IntEnum):
     PREDEXP = 43
 
 
+@slotted
 @dataclass
 class Field:
     FORMAT = Struct("!IB")
@@ -89,13 +101,17 @@ class Field:
     @classmethod
     def parse(cls: Type["Field"], data: bytes) -> "Field":
         length, field_type = cls.FORMAT.unpack(data[: cls.FORMAT.size])
-        data = data[cls.FORMAT.size : length]
+        data = data[cls.FORMAT.size : cls.FORMAT.size + length - 1]
         return cls(field_type=field_type, data=data)
 
     def __len__(self):
         return len(self.data) + self.FORMAT.size
 
 
+# Size prefix of fields and operations
+SIZE_FORMAT = Struct("!I")
+
+
 class OperationTypes(IntEnum):
     READ = 1
     WRITE = 2
@@ -112,6 +128,7 @@ class OperationTypes(IntEnum):
     DELETE = 14
 
 
+@slotted
 @dataclass
 class Bin:
     FORMAT = Struct("BBB")
@@ -143,6 +160,7 @@ class Bin:
         return cls(name=name, version=version, data=adata)
 
 
+@slotted
 @dataclass
 class Operation:
     # Size, Op, Bin data type, Bin version, Bin name length
@@ -166,6 +184,7 @@ class Operation:
         return len(self.data_bin) + self.FORMAT.size
 
 
+@slotted
 @dataclass
 class Message:
     FORMAT = Struct("!BBBBxBIIIHH")
@@ -202,7 +221,17 @@ class Message:
 
     @classmethod
     def parse(cls: Type["Message"], data: bytes) -> "Message":
-        parsed_tuple = cls.FORMAT.unpack(data[: cls.FORMAT.size])
+        return cls.parse_from(data)[0]
+
+    @classmethod
+    def parse_from(
+        cls: Type["Message"], data: bytes, offset: int = 0
+    ) -> Tuple["Message", int]:
+        """
+        Parses the message starting at offset,
+        returns it with the offset right after the message.
+        """
+        parsed_tuple = cls.FORMAT.unpack_from(data, offset)
         (
             _size,
             info1,
@@ -215,20 +244,22 @@ class Message:
             fields_count,
             operations_count,
         ) = parsed_tuple
-        data_left = data[cls.FORMAT.size :]
+        offset += cls.FORMAT.size
         fields = []
         operations = []
         for _i in range(0, fields_count):
-            f = Field.parse(data_left)
-            fields.append(f)
-            data_left = data[len(f) :]
+            length = SIZE_FORMAT.unpack_from(data, offset)[0]
+            end = offset + SIZE_FORMAT.size + length
+            fields.append(Field.parse(data[offset:end]))
+            offset = end
 
         for _i in range(0, operations_count):
-            op = Operation.parse(data_left)
-            operations.append(op)
-            data_left = data_left[len(op) :]
+            length = SIZE_FORMAT.unpack_from(data, offset)[0]
+            end = offset + SIZE_FORMAT.size + length
+            operations.append(Operation.parse(data[offset:end]))
+            offset = end
 
-        return cls(
+        message = cls(
             info1=info1,
             info2=info2,
             info3=info3,
@@ -239,10 +270,138 @@ class Message:
             fields=fields,
             operations=operations,
         )
+        return message, offset
+
+    @classmethod
+    def skip(cls: Type["Message"], data: bytes, offset: int = 0) -> int:
+        """
+        Returns the offset right after the message starting at offset,
+        without parsing its fields and operations.
+        """
+        fields_count, operations_count = COUNTS_FORMAT.unpack_from(
+            data, offset + COUNTS_OFFSET
+        )
+        offset += cls.FORMAT.size
+        for _i in range(fields_count + operations_count):
+            offset += (
+                SIZE_FORMAT.size + SIZE_FORMAT.unpack_from(data, offset)[0]
+            )
+        return offset
+
+    @classmethod
+    def parse_many(cls: Type["Message"], data: bytes) -> List["Message"]:
+        """
+        Parses consecutive messages, as sent by the server for multi-record
+        commands (batch, scan).
+        """
+        messages = []
+        offset = 0
+        while offset < len(data):
+            message, offset = cls.parse_from(data, offset)
+            messages.append(message)
+        return messages
+
+
+# Fields and operations count, at the end of the message header
+COUNTS_FORMAT = Struct("!HH")
+COUNTS_OFFSET = Message.FORMAT.size - COUNTS_FORMAT.size
+# Info3 and result code offsets in the message header
+INFO3_OFFSET = 3
+RESULT_CODE_OFFSET = 5
+# Batch responses carry the key's index in transaction_ttl (!I)
+TRANSACTION_TTL_OFFSET = 14
+
+
+class ExistsPolicy(IntEnum):
+    # Create the record or update its bins
+    UPDATE = 0
+    # Fail with KEY_NOT_FOUND if the record doesn't exist
+    UPDATE_ONLY = 1
+    # Create the record or replace all of its bins
+    REPLACE = 2
+    # Fail with KEY_NOT_FOUND if the record doesn't exist
+    REPLACE_ONLY = 3
+    # Fail with KEY_EXISTS if the record exists
+    CREATE_ONLY = 4
+
+
+class GenerationPolicy(IntEnum):
+    NONE = 0
+    # Fail with GENERATION_ERROR unless record generation == expected
+    EXPECT_GEN_EQUAL = 1
+    # Fail with GENERATION_ERROR unless expected > record generation
+    EXPECT_GEN_GT = 2
+
+
+EXISTS_POLICY_TO_INFO_FLAGS = {
+    ExistsPolicy.UPDATE: (Info2Flags.EMPTY, Info3Flags.EMPTY),
+    ExistsPolicy.UPDATE_ONLY: (Info2Flags.EMPTY, Info3Flags.UPDATE_ONLY),
+    ExistsPolicy.REPLACE: (Info2Flags.EMPTY, Info3Flags.CREATE_OR_REPLACE),
+    ExistsPolicy.REPLACE_ONLY: (Info2Flags.EMPTY, Info3Flags.REPLACE_ONLY),
+    ExistsPolicy.CREATE_ONLY: (Info2Flags.CREATE_ONLY, Info3Flags.EMPTY),
+}
+
+GENERATION_POLICY_TO_INFO_FLAGS = {
+    GenerationPolicy.NONE: Info2Flags.EMPTY,
+    GenerationPolicy.EXPECT_GEN_EQUAL: Info2Flags.GENERATION,
+    GenerationPolicy.EXPECT_GEN_GT: Info2Flags.GENERATION_GT,
+}
+
+
+@dataclass
+class WritePolicy:
+    exists: ExistsPolicy = ExistsPolicy.UPDATE
+    generation_policy: GenerationPolicy = GenerationPolicy.NONE
+    generation: int = 0
+    durable_delete: bool = False
+
+    @property
+    def info2(self) -> Info2Flags:
+        info2 = EXISTS_POLICY_TO_INFO_FLAGS[self.exists][0]
+        info2 |= GENERATION_POLICY_TO_INFO_FLAGS[self.generation_policy]
+        if self.durable_delete:
+            info2 |= Info2Flags.DURABLE_DELETE
+        return info2
+
+    @property
+    def info3(self) -> Info3Flags:
+        return EXISTS_POLICY_TO_INFO_FLAGS[self.exists][1]
+
+
+DEFAULT_WRITE_POLICY = WritePolicy()
+
+
+# Server void times are seconds since 2010-01-01 00:00:00 UTC
+CITRUSLEAF_EPOCH = 1262304000
+NO_EXPIRE_TTL = -1
+
+
+def void_time_to_ttl(void_time: int) -> int:
+    """
+    Converts record_ttl of a server response (void time) to seconds left,
+    returns NO_EXPIRE_TTL for records that never expire.
+    """
+    if void_time == 0:
+        return NO_EXPIRE_TTL
+    now = int(time.time()) - CITRUSLEAF_EPOCH
+    return void_time - now if void_time > now else 1
+
+
+@dataclass
+class RecordHeader:
+    generation: int
+    ttl: int
+
+
+def predexp_field(predexp: List[PredExp]) -> Field:
+    return Field(FieldTypes.PREDEXP, pack_predexps(predexp))
 
 
 def generate_namespace_set_key_fields(
-    namespace: str, set_name: str, key: AerospikeKeyType
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    predexp: Optional[List[PredExp]] = None,
 ) -> List[Field]:
     set_encoded = set_name.encode("utf-8")
     namespace_field = Field(FieldTypes.NAMESPACE, namespace.encode("utf-8"))
@@ -251,7 +410,10 @@ def generate_namespace_set_key_fields(
     aero_key = data_to_aerospike_type(key)
     key_field = Field(FieldTypes.DIGEST, aero_key.digest(set_name))
 
-    return [namespace_field, set_field, key_field]
+    fields = [namespace_field, set_field, key_field]
+    if predexp:
+        fields.append(predexp_field(predexp))
+    return fields
 
 
 def put_key(
@@ -260,8 +422,12 @@ def put_key(
     key: AerospikeKeyType,
     bin_: Dict[str, AerospikeValueType],
     ttl: int = 0,
+    policy: WritePolicy = DEFAULT_WRITE_POLICY,
+    predexp: Optional[List[PredExp]] = None,
 ) -> Message:
-    fields = generate_namespace_set_key_fields(namespace, set_name, key)
+    fields = generate_namespace_set_key_fields(
+        namespace, set_name, key, predexp
+    )
 
     ops = []
     for k, v in bin_.items():
@@ -270,20 +436,84 @@ def put_key(
 
     return Message(
         info1=Info1Flags.EMPTY,
-        info2=Info2Flags.WRITE,
-        info3=Info3Flags.EMPTY,
+        info2=Info2Flags.WRITE | policy.info2,
+        info3=policy.info3,
         transaction_ttl=1000,
         fields=fields,
         operations=ops,
+        generation=policy.generation,
         record_ttl=ttl,
     )
 
 
-def get_key(namespace: str, set_name: str, key: AerospikeKeyType) -> Message:
-    fields = generate_namespace_set_key_fields(namespace, set_name, key)
+def get_key(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    bins: Optional[List[str]] = None,
+    predexp: Optional[List[PredExp]] = None,
+) -> Message:
+    """
+    Reads all bins, or only the given bins when bins is set.
+    """
+    fields = generate_namespace_set_key_fields(
+        namespace, set_name, key, predexp
+    )
+
+    if bins:
+        info1 = Info1Flags.READ
+        ops = [
+            Operation(OperationTypes.READ, Bin.create(name=name, data=None))
+            for name in bins
+        ]
+    else:
+        info1 = Info1Flags.READ | Info1Flags.GET_ALL
+        ops = []
+
+    return Message(
+        info1=info1,
+        info2=Info2Flags.EMPTY,
+        info3=Info3Flags.EMPTY,
+        transaction_ttl=1000,
+        fields=fields,
+        operations=ops,
+    )
+
+
+def delete_key(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    policy: WritePolicy = DEFAULT_WRITE_POLICY,
+    predexp: Optional[List[PredExp]] = None,
+) -> Message:
+    fields = generate_namespace_set_key_fields(
+        namespace, set_name, key, predexp
+    )
+
+    return Message(
+        info1=Info1Flags.EMPTY,
+        info2=Info2Flags.DELETE | Info2Flags.WRITE | policy.info2,
+        info3=policy.info3,
+        transaction_ttl=1000,
+        fields=fields,
+        operations=[],
+        generation=policy.generation,
+    )
+
+
+def key_exists(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    predexp: Optional[List[PredExp]] = None,
+) -> Message:
+    fields = generate_namespace_set_key_fields(
+        namespace, set_name, key, predexp
+    )
 
     return Message(
-        info1=Info1Flags.READ | Info1Flags.GET_ALL,
+        info1=Info1Flags.READ | Info1Flags.DONT_GET_BIN_DATA,
         info2=Info2Flags.EMPTY,
         info3=Info3Flags.EMPTY,
         transaction_ttl=1000,
@@ -292,12 +522,44 @@ def get_key(namespace: str, set_name: str, key: AerospikeKeyType) -> Message:
     )
 
 
-def delete_key(namespace: str, set_name: str, key: AerospikeKeyType) -> Message:
-    fields = generate_namespace_set_key_fields(namespace, set_name, key)
+class UDFOperation(IntEnum):
+    KVS = 0
+    AGGREGATE = 1
+    BACKGROUND = 2
+
+
+def generate_udf_fields(
+    module: str, function: str, args: List[AerospikeValueType]
+) -> List[Field]:
+    return [
+        Field(FieldTypes.UDF_PACKAGE_NAME, module.encode("utf-8")),
+        Field(FieldTypes.UDF_FUNCTION, function.encode("utf-8")),
+        Field(FieldTypes.UDF_ARGLIST, AerospikeList(args).pack()),
+    ]
+
+
+def apply(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    module: str,
+    function: str,
+    args: List[AerospikeValueType],
+    predexp: Optional[List[PredExp]] = None,
+) -> Message:
+    """
+    Executes the record UDF module.function(record, *args) on the key,
+    the server responds with the return value in the SUCCESS bin,
+    or an error string in the FAILURE bin.
+    """
+    fields = generate_namespace_set_key_fields(
+        namespace, set_name, key, predexp
+    )
+    fields += generate_udf_fields(module, function, args)
 
     return Message(
         info1=Info1Flags.EMPTY,
-        info2=Info2Flags.DELETE | Info2Flags.WRITE,
+        info2=Info2Flags.WRITE,
         info3=Info3Flags.EMPTY,
         transaction_ttl=1000,
         fields=fields,
@@ -305,11 +567,156 @@ def delete_key(namespace: str, set_name: str, key: AerospikeKeyType) -> Message:
     )
 
 
-def key_exists(namespace: str, set_name: str, key: AerospikeKeyType) -> Message:
-    fields = generate_namespace_set_key_fields(namespace, set_name, key)
+# Priority << 4 | fail on cluster change << 3, scan percent
+SCAN_OPTIONS_FORMAT = Struct("!BB")
+TASK_ID_FORMAT = Struct("!Q")
+SCAN_RPS_FORMAT = Struct("!I")
+PARTITION_ID_FORMAT = Struct("<H")
+# RIPEMD-160 key digest
+DIGEST_SIZE = 20
+
+
+def scan_apply(
+    namespace: str,
+    set_name: str,
+    task_id: int,
+    module: str,
+    function: str,
+    args: List[AerospikeValueType],
+    predexp: Optional[List[PredExp]] = None,
+) -> Message:
+    """
+    Starts a background scan executing the record UDF on every record of
+    the set, progress can be followed using the task id in the "jobs"
+    info command.
+    """
+    fields = [
+        Field(FieldTypes.NAMESPACE, namespace.encode("utf-8")),
+        Field(FieldTypes.SETNAME, set_name.encode("utf-8")),
+        Field(FieldTypes.SCAN_OPTIONS, SCAN_OPTIONS_FORMAT.pack(0, 100)),
+        Field(FieldTypes.TASK_ID, TASK_ID_FORMAT.pack(task_id)),
+    ]
+    if predexp:
+        fields.append(predexp_field(predexp))
+    fields += generate_udf_fields(module, function, args)
+    fields.append(Field(FieldTypes.UDF_OP, bytes([UDFOperation.BACKGROUND])))
 
     return Message(
-        info1=Info1Flags.READ | Info1Flags.DONT_GET_BIN_DATA,
+        info1=Info1Flags.EMPTY,
+        info2=Info2Flags.WRITE,
+        info3=Info3Flags.EMPTY,
+        transaction_ttl=1000,
+        fields=fields,
+        operations=[],
+    )
+
+
+def scan(
+    namespace: str,
+    set_name: str,
+    task_id: int,
+    bins: Optional[List[str]] = None,
+    predexp: Optional[List[PredExp]] = None,
+    partitions: Optional[List[int]] = None,
+    digests: Optional[List[bytes]] = None,
+    records_per_second: int = 0,
+) -> Message:
+    """
+    Foreground scan streaming the set's records (all bins unless bins is
+    set), an empty set_name scans the whole namespace.
+    With partitions and/or digests only those partitions are scanned, each
+    digest's partition resuming after the digest, and every partition is
+    closed by an Info3Flags.PARTITION_DONE message.
+    records_per_second throttles the scan on the server, 0 for no limit.
+    """
+    fields = [Field(FieldTypes.NAMESPACE, namespace.encode("utf-8"))]
+    if set_name:
+        fields.append(Field(FieldTypes.SETNAME, set_name.encode("utf-8")))
+    fields += [
+        Field(FieldTypes.SCAN_OPTIONS, SCAN_OPTIONS_FORMAT.pack(0, 100)),
+        Field(FieldTypes.TASK_ID, TASK_ID_FORMAT.pack(task_id)),
+    ]
+    if records_per_second:
+        fields.append(
+            Field(FieldTypes.SCAN_RPS, SCAN_RPS_FORMAT.pack(records_per_second))
+        )
+    if partitions:
+        fields.append(
+            Field(
+                FieldTypes.PID_ARRAY,
+                b"".join(map(PARTITION_ID_FORMAT.pack, partitions)),
+            )
+        )
+    if digests:
+        fields.append(Field(FieldTypes.DIGEST_ARRAY, b"".join(digests)))
+    if predexp:
+        fields.append(predexp_field(predexp))
+    if bins:
+        info1 = Info1Flags.READ
+        ops = [
+            Operation(OperationTypes.READ, Bin.create(name=name, data=None))
+            for name in bins
+        ]
+    else:
+        info1 = Info1Flags.READ | Info1Flags.GET_ALL
+        ops = []
+    return Message(
+        info1=info1,
+        info2=Info2Flags.EMPTY,
+        info3=Info3Flags.EMPTY,
+        transaction_ttl=0,
+        fields=fields,
+        operations=ops,
+    )
+
+
+# Keys count, allow inline
+BATCH_FORMAT = Struct("!IB")
+# Index, digest, repeat previous record's namespace/set/bins
+BATCH_KEY_FORMAT = Struct("!I20sB")
+# Info1, fields count, operations count
+BATCH_RECORD_FORMAT = Struct("!BHH")
+
+
+def get_many(
+    namespace: str,
+    set_name: str,
+    keys: List[AerospikeKeyType],
+    bins: Optional[List[str]] = None,
+    predexp: Optional[List[PredExp]] = None,
+) -> Message:
+    """
+    Batch index read of the keys, the server responds with a message per key
+    (index in transaction_ttl) followed by a message flagged Info3Flags.LAST
+    """
+    if bins:
+        info1 = Info1Flags.READ
+        ops = [
+            Operation(OperationTypes.READ, Bin.create(name=name, data=None))
+            for name in bins
+        ]
+    else:
+        info1 = Info1Flags.READ | Info1Flags.GET_ALL
+        ops = []
+
+    record = [
+        BATCH_RECORD_FORMAT.pack(info1, 2, len(ops)),
+        Field(FieldTypes.NAMESPACE, namespace.encode("utf-8")).pack(),
+        Field(FieldTypes.SETNAME, set_name.encode("utf-8")).pack(),
+    ]
+    record += [op.pack() for op in ops]
+
+    batch = [BATCH_FORMAT.pack(len(keys), 1)]
+    for index, key in enumerate(keys):
+        digest = data_to_aerospike_type(key).digest(set_name)
+        batch.append(BATCH_KEY_FORMAT.pack(index, digest, index > 0))
+        if index == 0:
+            batch += record
+
+    fields = [predexp_field(predexp)] if predexp else []
+    fields.append(Field(FieldTypes.BATCH_INDEX_WITH_SET, b"".join(batch)))
+    return Message(
+        info1=info1 | Info1Flags.BATCH_INDEX,
         info2=Info2Flags.EMPTY,
         info3=Info3Flags.EMPTY,
         transaction_ttl=1000,
@@ -342,3 +749,99 @@ def operate(
         generation=generation,
         record_ttl=ttl,
     )
+
+
+def _modify_bins(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    operation_type: OperationTypes,
+    bins: Mapping[str, AerospikeValueType],
+    return_value: bool = False,
+    ttl: int = 0,
+) -> Message:
+    """
+    Builds a single-record message applying `operation_type` on each bin,
+    optionally reading back the bins in the same round trip.
+    """
+    fields = generate_namespace_set_key_fields(namespace, set_name, key)
+    ops = [
+        Operation(operation_type, Bin.create(name=k, data=v))
+        for k, v in bins.items()
+    ]
+    info1 = Info1Flags.EMPTY
+    if return_value:
+        info1 = Info1Flags.READ
+        ops += [
+            Operation(OperationTypes.READ, Bin.create(name=k, data=None))
+            for k in bins
+        ]
+
+    return Message(
+        info1=info1,
+        info2=Info2Flags.WRITE,
+        info3=Info3Flags.EMPTY,
+        transaction_ttl=1000,
+        fields=fields,
+        operations=ops,
+        record_ttl=ttl,
+    )
+
+
+def increment(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    bins: Dict[str, Union[int, float]],
+    return_value: bool = False,
+    ttl: int = 0,
+) -> Message:
+    return _modify_bins(
+        namespace,
+        set_name,
+        key,
+        OperationTypes.INCR,
+        bins,
+        return_value,
+        ttl,
+    )
+
+
+def append(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    bins: Dict[str, Union[str, bytes]],
+    ttl: int = 0,
+) -> Message:
+    return _modify_bins(
+        namespace, set_name, key, OperationTypes.APPEND, bins, ttl=ttl
+    )
+
+
+def prepend(
+    namespace: str,
+    set_name: str,
+    key: AerospikeKeyType,
+    bins: Dict[str, Union[str, bytes]],
+    ttl: int = 0,
+) -> Message:
+    return _modify_bins(
+        namespace, set_name, key, OperationTypes.PREPEND, bins, ttl=ttl
+    )
+
+
+def touch(
+    namespace: str, set_name: str, key: AerospikeKeyType, ttl: int = 0
+) -> Message:
+    fields = generate_namespace_set_key_fields(namespace, set_name, key)
+
+    return Message(
+        info1=Info1Flags.EMPTY,
+        info2=Info2Flags.WRITE,
+        info3=Info3Flags.EMPTY,
+        transaction_ttl=1000,
+        fields=fields,
+        operations=[Operation(OperationTypes.TOUCH, Bin.create("", None))],
+        record_ttl=ttl,
+    )
@@ -0,0 +1,73 @@
+from base64 import b64decode, b64encode
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# Records are spread over 4096 partitions by digest, each partition has a
+# master and replica nodes. Nodes report the partitions they hold per
+# replica index with the "replicas" info command:
+# <namespace>:<regime>,<replica count>,<base64 bitmap>,...;...
+# where bit i of the bitmap (most significant bit first) is partition i.
+N_PARTITIONS = 4096
+BITMAP_SIZE = N_PARTITIONS // 8
+
+
+def partition_id(digest: bytes) -> int:
+    return int.from_bytes(digest[:2], "little") & (N_PARTITIONS - 1)
+
+
+@dataclass
+class PartitionStatus:
+    """
+    Progress of a partition scan, resumed after digest when set
+    """
+
+    partition: int
+    # Digest of the last record handled
+    digest: Optional[bytes] = None
+    done: bool = False
+
+
+def owns_partition(bitmap: bytes, partition: int) -> bool:
+    return bool(bitmap[partition >> 3] & (0x80 >> (partition & 7)))
+
+
+def pack_bitmap(partitions: Iterable[int]) -> bytes:
+    bitmap = bytearray(BITMAP_SIZE)
+    for partition in partitions:
+        bitmap[partition >> 3] |= 0x80 >> (partition & 7)
+    return bytes(bitmap)
+
+
+def parse_replicas(value: str) -> Dict[str, List[bytes]]:
+    """
+    Returns namespace -> partition bitmap per replica index
+    """
+    replicas = {}
+    for entry in filter(None, value.split(";")):
+        namespace, _, maps = entry.partition(":")
+        _, count, *bitmaps = maps.split(",")
+        replicas[namespace] = [
+            b64decode(bitmap) for bitmap in bitmaps[: int(count)]
+        ]
+    return replicas
+
+
+def format_replicas(replicas: Dict[str, List[bytes]], regime: int = 0) -> str:
+    return ";".join(
+        ",".join(
+            [f"{namespace}:{regime}", str(len(bitmaps))]
+            + [b64encode(bitmap).decode("ascii") for bitmap in bitmaps]
+        )
+        for namespace, bitmaps in replicas.items()
+    )
+
+
+def parse_rack_ids(value: str) -> Dict[str, int]:
+    """
+    Parses the "rack-ids" info command: <namespace>:<rack id>;...
+    """
+    rack_ids = {}
+    for entry in filter(None, value.split(";")):
+        namespace, _, rack_id = entry.partition(":")
+        rack_ids[namespace] = int(rack_id)
+    return rack_ids
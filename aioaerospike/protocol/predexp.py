@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from enum import IntEnum, IntFlag
+from struct import Struct
+from typing import List
+
+from .datatypes import AerospikeString
+from .slots import slotted
+
+# Predicate expressions (PREDEXP field) are evaluated by the server to filter
+# records before they are returned or modified.
+# Expressions are given in postfix order, for example bin "age" > 21 is:
+# [integer_bin("age"), integer_value(21), integer_greater()]
+# Can read about the tags in as_predexp.c (C client)
+
+
+class PredExpTags(IntEnum):
+    AND = 1
+    OR = 2
+    NOT = 3
+    INTEGER_VALUE = 10
+    STRING_VALUE = 11
+    GEOJSON_VALUE = 12
+    INTEGER_BIN = 100
+    STRING_BIN = 101
+    GEOJSON_BIN = 102
+    LIST_BIN = 103
+    MAP_BIN = 104
+    INTEGER_VAR = 120
+    STRING_VAR = 121
+    GEOJSON_VAR = 122
+    REC_DEVICE_SIZE = 150
+    REC_LAST_UPDATE = 151
+    REC_VOID_TIME = 152
+    REC_DIGEST_MODULO = 153
+    INTEGER_EQUAL = 200
+    INTEGER_UNEQUAL = 201
+    INTEGER_GREATER = 202
+    INTEGER_GREATEREQ = 203
+    INTEGER_LESS = 204
+    INTEGER_LESSEQ = 205
+    STRING_EQUAL = 210
+    STRING_UNEQUAL = 211
+    STRING_REGEX = 212
+    GEOJSON_WITHIN = 220
+    GEOJSON_CONTAINS = 221
+    LIST_ITERATE_OR = 250
+    LIST_ITERATE_AND = 251
+    MAPKEY_ITERATE_OR = 252
+    MAPKEY_ITERATE_AND = 253
+    MAPVAL_ITERATE_OR = 254
+    MAPVAL_ITERATE_AND = 255
+
+
+class RegexFlags(IntFlag):
+    # POSIX regcomp flags
+    NONE = 0
+    EXTENDED = 1
+    ICASE = 2
+    NOSUB = 4
+    NEWLINE = 8
+
+
+@slotted
+@dataclass
+class PredExp:
+    FORMAT = Struct("!HI")
+    tag: PredExpTags
+    data: bytes = b""
+
+    def pack(self) -> bytes:
+        return self.FORMAT.pack(self.tag, len(self.data)) + self.data
+
+    @classmethod
+    def parse_many(cls, data: bytes) -> List["PredExp"]:
+        predexps = []
+        offset = 0
+        while offset < len(data):
+            tag, length = cls.FORMAT.unpack_from(data, offset)
+            offset += cls.FORMAT.size
+            predexps.append(cls(tag, data[offset : offset + length]))
+            offset += length
+        return predexps
+
+    def __len__(self):
+        return len(self.data) + self.FORMAT.size
+
+
+COUNT_FORMAT = Struct("!H")
+INTEGER_FORMAT = Struct("!q")
+UINT32_FORMAT = Struct("!I")
+
+
+def pack_predexps(predexps: List[PredExp]) -> bytes:
+    return b"".join(predexp.pack() for predexp in predexps)
+
+
+def predexp_and(count: int) -> PredExp:
+    """
+    Logical AND of the previous count expressions
+    """
+    return PredExp(PredExpTags.AND, COUNT_FORMAT.pack(count))
+
+
+def predexp_or(count: int) -> PredExp:
+    """
+    Logical OR of the previous count expressions
+    """
+    return PredExp(PredExpTags.OR, COUNT_FORMAT.pack(count))
+
+
+def predexp_not() -> PredExp:
+    return PredExp(PredExpTags.NOT)
+
+
+def integer_value(value: int) -> PredExp:
+    return PredExp(PredExpTags.INTEGER_VALUE, INTEGER_FORMAT.pack(value))
+
+
+def string_value(value: str) -> PredExp:
+    return PredExp(PredExpTags.STRING_VALUE, AerospikeString(value).pack())
+
+
+def integer_bin(name: str) -> PredExp:
+    return PredExp(PredExpTags.INTEGER_BIN, name.encode("utf-8"))
+
+
+def string_bin(name: str) -> PredExp:
+    return PredExp(PredExpTags.STRING_BIN, name.encode("utf-8"))
+
+
+def rec_device_size() -> PredExp:
+    return PredExp(PredExpTags.REC_DEVICE_SIZE)
+
+
+def rec_last_update() -> PredExp:
+    """
+    Record last update time, in nanoseconds since the unix epoch
+    """
+    return PredExp(PredExpTags.REC_LAST_UPDATE)
+
+
+def rec_void_time() -> PredExp:
+    """
+    Record expiration time, in nanoseconds since the unix epoch (0 for never)
+    """
+    return PredExp(PredExpTags.REC_VOID_TIME)
+
+
+def rec_digest_modulo(modulo: int) -> PredExp:
+    return PredExp(PredExpTags.REC_DIGEST_MODULO, UINT32_FORMAT.pack(modulo))
+
+
+def integer_equal() -> PredExp:
+    return PredExp(PredExpTags.INTEGER_EQUAL)
+
+
+def integer_unequal() -> PredExp:
+    return PredExp(PredExpTags.INTEGER_UNEQUAL)
+
+
+def integer_greater() -> PredExp:
+    return PredExp(PredExpTags.INTEGER_GREATER)
+
+
+def integer_greatereq() -> PredExp:
+    return PredExp(PredExpTags.INTEGER_GREATEREQ)
+
+
+def integer_less() -> PredExp:
+    return PredExp(PredExpTags.INTEGER_LESS)
+
+
+def integer_lesseq() -> PredExp:
+    return PredExp(PredExpTags.INTEGER_LESSEQ)
+
+
+def string_equal() -> PredExp:
+    return PredExp(PredExpTags.STRING_EQUAL)
+
+
+def string_unequal() -> PredExp:
+    return PredExp(PredExpTags.STRING_UNEQUAL)
+
+
+def string_regex(flags: RegexFlags = RegexFlags.NONE) -> PredExp:
+    return PredExp(PredExpTags.STRING_REGEX, UINT32_FORMAT.pack(flags))
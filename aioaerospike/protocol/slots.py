@@ -0,0 +1,21 @@
+from dataclasses import fields
+from typing import Any, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """
+    Recreates the dataclass with __slots__ for its fields, so instances don't
+    carry a __dict__ (dataclass(slots=True) needs Python 3.10).
+    Must be applied above @dataclass, and methods can't use super().
+    """
+    names = tuple(field.name for field in fields(cls))  # type: ignore
+    namespace = dict(cls.__dict__)
+    # Defaults are kept by the generated __init__, class attributes of the
+    # same name would conflict with the slots
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+    metaclass: Any = type(cls)
+    return metaclass(cls.__name__, cls.__bases__, namespace)
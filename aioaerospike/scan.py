@@ -0,0 +1,249 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .client import AerospikeClient
+from .cluster import ClusterClient
+from .protocol.datatypes import AerospikeValueType
+from .protocol.partition import N_PARTITIONS, PartitionStatus, partition_id
+from .protocol.predexp import PredExp
+
+# Records received by the scans but not consumed yet, shared by all scans
+QUEUE_SIZE = 1024
+# Times a ClusterClient's partition map is refreshed to scan the partitions
+# a node couldn't
+PARTITION_RETRIES = 2
+
+
+@dataclass
+class ScanCursor:
+    """
+    Progress of a partition scan, serializable with to_dict to resume it
+    """
+
+    namespace: str
+    set_name: str
+    partitions: List[PartitionStatus]
+
+    @classmethod
+    def create(
+        cls,
+        namespace: str,
+        set_name: str,
+        partitions: Optional[Iterable[int]] = None,
+    ) -> "ScanCursor":
+        """
+        Cursor at the start of the partitions, all of them by default
+        """
+        if partitions is None:
+            partitions = range(N_PARTITIONS)
+        return cls(
+            namespace,
+            set_name,
+            [PartitionStatus(partition) for partition in partitions],
+        )
+
+    @property
+    def done(self) -> bool:
+        return all(status.done for status in self.partitions)
+
+    def pending(self) -> List[PartitionStatus]:
+        return [status for status in self.partitions if not status.done]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "namespace": self.namespace,
+            "set_name": self.set_name,
+            "partitions": [
+                [
+                    status.partition,
+                    status.digest.hex() if status.digest else None,
+                    status.done,
+                ]
+                for status in self.partitions
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScanCursor":
+        return cls(
+            data["namespace"],
+            data["set_name"],
+            [
+                PartitionStatus(
+                    partition, bytes.fromhex(digest) if digest else None, done
+                )
+                for partition, digest, done in data["partitions"]
+            ],
+        )
+
+
+async def parallel_scan(
+    clients: Union[List[AerospikeClient], ClusterClient],
+    cursor: ScanCursor,
+    bins: Optional[List[str]] = None,
+    predexp: Optional[List[PredExp]] = None,
+    records_per_second: int = 0,
+    groups: Optional[int] = None,
+) -> AsyncIterator[Tuple[bytes, Dict[str, AerospikeValueType]]]:
+    """
+    Streams the records of the cursor's pending partitions as (digest, bins).
+    The partitions are split in groups of consecutive partitions (one per
+    client or node by default), scanned concurrently and sharing
+    records_per_second (0 for no limit).
+    clients are either connections to the same node, taking the groups in
+    turn, or a ClusterClient: each group is then scanned by the master of
+    its partitions, and partitions a node couldn't scan (migrated since
+    the partition map was loaded) are scanned again after a refresh, up to
+    PARTITION_RETRIES times.
+    The cursor only advances past records once the iteration resumes after
+    them, so it can be saved at any point and the scan resumed from it, the
+    records after the last handled one of each partition are then streamed
+    again. Partitions still not scanned in the end are left pending in the
+    cursor.
+    """
+    retries = PARTITION_RETRIES if isinstance(clients, ClusterClient) else 0
+    for attempt in range(1 + retries):
+        pending = cursor.pending()
+        if not pending:
+            return
+        if isinstance(clients, ClusterClient):
+            if attempt:
+                await clients.refresh()
+            scanners = _by_master(clients, cursor.namespace, pending, groups)
+        else:
+            size = -(-len(pending) // (groups or len(clients)))
+            work: Deque[List[PartitionStatus]] = deque(_split(pending, size))
+            scanners = [(client, work) for client in clients[: len(work)]]
+        records = _scan_groups(
+            scanners, cursor, bins, predexp, records_per_second
+        )
+        try:
+            async for record in records:
+                yield record
+        finally:
+            await records.aclose()
+
+
+def _split(
+    statuses: List[PartitionStatus], size: int
+) -> Iterator[List[PartitionStatus]]:
+    for start in range(0, len(statuses), size):
+        yield statuses[start : start + size]
+
+
+def _by_master(
+    cluster: ClusterClient,
+    namespace: str,
+    pending: List[PartitionStatus],
+    groups: Optional[int],
+) -> List[Tuple[AerospikeClient, Deque[List[PartitionStatus]]]]:
+    """
+    Returns (master's client, its groups) for the masters of the partitions
+    """
+    size = -(-len(pending) // (groups or len(cluster.nodes)))
+    owned: Dict[int, Tuple[AerospikeClient, List[PartitionStatus]]] = {}
+    for status in pending:
+        node = cluster.partition_nodes(namespace, status.partition)[0]
+        owned.setdefault(id(node), (node.client, []))[1].append(status)
+    return [
+        (client, deque(_split(statuses, size)))
+        for client, statuses in owned.values()
+    ]
+
+
+async def _scan_groups(
+    scanners: List[Tuple[AerospikeClient, Deque[List[PartitionStatus]]]],
+    cursor: ScanCursor,
+    bins: Optional[List[str]],
+    predexp: Optional[List[PredExp]],
+    records_per_second: int,
+) -> AsyncGenerator[Tuple[bytes, Dict[str, AerospikeValueType]], None]:
+    """
+    Runs a task per (client, work), each scanning groups taken from its
+    work until it's empty, streams their records
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    # Shares of records_per_second, a scan holds one while it runs so the
+    # scans never exceed the limit together, even with fewer records per
+    # second than scanners
+    rates: Optional[asyncio.Queue] = None
+    if records_per_second:
+        shares = min(len(scanners), records_per_second)
+        rates = asyncio.Queue()
+        for index in range(shares):
+            rates.put_nowait(
+                records_per_second // shares
+                + (index < records_per_second % shares)
+            )
+
+    async def scanner(
+        client: AerospikeClient, work: Deque[List[PartitionStatus]]
+    ) -> None:
+        try:
+            while work:
+                group = {status.partition: status for status in work.popleft()}
+                # The scan advances copies, the cursor follows the consumer
+                statuses = [replace(status) for status in group.values()]
+                rate = 0 if rates is None else await rates.get()
+                records = client.scan_partitions(
+                    cursor.namespace,
+                    cursor.set_name,
+                    statuses,
+                    bins,
+                    predexp,
+                    rate,
+                )
+                try:
+                    async for digest, record_bins in records:
+                        status = group[partition_id(digest)]
+                        await queue.put((status, digest, record_bins))
+                finally:
+                    # Frees the client's connection when cancelled
+                    await records.aclose()
+                    if rates is not None:
+                        rates.put_nowait(rate)
+                for scanned in statuses:
+                    if scanned.done:
+                        await queue.put((group[scanned.partition], None, None))
+        except Exception as error:
+            await queue.put(error)
+        else:
+            await queue.put(None)
+
+    tasks = [
+        asyncio.ensure_future(scanner(client, work))
+        for client, work in scanners
+    ]
+    running = len(tasks)
+    try:
+        while running:
+            item = await queue.get()
+            if item is None:
+                running -= 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            status, digest, record_bins = item
+            if digest is None:
+                status.done = True
+                continue
+            yield digest, record_bins
+            status.digest = digest
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
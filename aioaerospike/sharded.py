@@ -0,0 +1,397 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import socket
+from dataclasses import dataclass, field
+from functools import wraps
+from itertools import count
+from struct import Struct
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .client import AerospikeClient
+from .protocol.datatypes import (
+    AerospikeKeyType,
+    AerospikeValueType,
+    data_to_aerospike_type,
+)
+from .protocol.predexp import PredExp
+
+# Front <-> worker frames are a 4 byte size followed by a pickled object.
+# Requests: (request id, route, method name, args, kwargs), None to stop.
+# Responses: (request id, succeeded, result or exception), the first frame
+# of a worker is None once connected, or the exception it failed with.
+FRAME_FORMAT = Struct("!I")
+
+
+def shard_hash(set_name: str, key: AerospikeKeyType) -> int:
+    digest = data_to_aerospike_type(key).digest(set_name)
+    return int.from_bytes(digest[:4], "little")
+
+
+def _write_frame(writer: asyncio.StreamWriter, obj: Any) -> None:
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(FRAME_FORMAT.pack(len(data)) + data)
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Any:
+    header = await reader.readexactly(FRAME_FORMAT.size)
+    (size,) = FRAME_FORMAT.unpack(header)
+    return pickle.loads(await reader.readexactly(size))
+
+
+async def _serve(
+    sock: socket.socket,
+    connections: int,
+    client_args: Tuple[Any, ...],
+    client_kwargs: Dict[str, Any],
+) -> None:
+    reader, writer = await asyncio.open_connection(sock=sock)
+    clients = [
+        AerospikeClient(*client_args, **client_kwargs)
+        for _ in range(connections)
+    ]
+    try:
+        for client in clients:
+            await client.connect()
+    except Exception as e:
+        _write_frame(writer, e)
+        await writer.drain()
+        writer.close()
+        return
+    _write_frame(writer, None)
+    # StreamWriter.drain can't be awaited concurrently before Python 3.10
+    drain_lock = asyncio.Lock()
+
+    async def handle(
+        request_id: int,
+        client: AerospikeClient,
+        method: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        try:
+            result = await getattr(client, method)(*args, **kwargs)
+            response: Tuple[int, bool, Any] = (request_id, True, result)
+        except Exception as e:
+            response = (request_id, False, e)
+        try:
+            _write_frame(writer, response)
+        except Exception as e:
+            # Result or exception can't be pickled
+            _write_frame(writer, (request_id, False, Exception(repr(e))))
+        try:
+            # Waits for the front to keep up, instead of buffering
+            async with drain_lock:
+                await writer.drain()
+        except ConnectionError:
+            # The front is gone, nobody is waiting for the response
+            pass
+
+    tasks: Set[asyncio.Task] = set()
+    try:
+        while True:
+            request = await _read_frame(reader)
+            if request is None:
+                break
+            request_id, route, method, args, kwargs = request
+            task = asyncio.ensure_future(
+                handle(
+                    request_id,
+                    clients[route % connections],
+                    method,
+                    args,
+                    kwargs,
+                )
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for client in clients:
+            await client.close()
+        writer.close()
+
+
+def _worker_main(
+    sock: socket.socket,
+    connections: int,
+    client_args: Tuple[Any, ...],
+    client_kwargs: Dict[str, Any],
+) -> None:
+    asyncio.run(_serve(sock, connections, client_args, client_kwargs))
+
+
+@dataclass
+class Shard:
+    process: multiprocessing.process.BaseProcess
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    futures: Dict[int, asyncio.Future] = field(default_factory=dict)
+    task: Optional[asyncio.Task] = None
+    # StreamWriter.drain can't be awaited concurrently before Python 3.10
+    drain_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def _routed(method: Callable) -> Callable:
+    """
+    Forwards the method to the worker owning the key
+    """
+    name = method.__name__
+
+    @wraps(method)
+    async def wrapper(
+        self: "ShardedClient",
+        namespace: str,
+        set_name: str,
+        key: AerospikeKeyType,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        return await self._call(
+            shard_hash(set_name, key),
+            name,
+            (namespace, set_name, key) + args,
+            kwargs,
+        )
+
+    return wrapper
+
+
+class ShardedClient:
+    """
+    AerospikeClient compatible facade spreading commands over worker
+    processes, each running its own loop and connections_per_process
+    connections, so message encoding/decoding scales with cores.
+    Commands are sharded by key digest, commands on the same key always run
+    on the same worker connection and keep their order.
+    Arguments and results cross the process boundary pickled over a
+    socketpair, so they have to be picklable.
+    Client arguments (host, user, password, port...) are passed to the
+    AerospikeClient of every worker.
+    """
+
+    def __init__(
+        self,
+        *client_args: Any,
+        processes: Optional[int] = None,
+        connections_per_process: int = 1,
+        **client_kwargs: Any,
+    ) -> None:
+        self.processes = processes or os.cpu_count() or 1
+        self.connections_per_process = connections_per_process
+        self._client_args = client_args
+        self._client_kwargs = client_kwargs
+        self._shards: List[Shard] = []
+        self._request_ids = count()
+
+    async def __aenter__(self) -> "ShardedClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        for index in range(self.processes):
+            parent_sock, child_sock = socket.socketpair()
+            process = context.Process(
+                target=_worker_main,
+                args=(
+                    child_sock,
+                    self.connections_per_process,
+                    self._client_args,
+                    self._client_kwargs,
+                ),
+                name=f"aioaerospike-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_sock.close()
+            reader, writer = await asyncio.open_connection(sock=parent_sock)
+            self._shards.append(Shard(process, reader, writer))
+
+        try:
+            for shard in self._shards:
+                error = await _read_frame(shard.reader)
+                if error is not None:
+                    raise error
+                shard.task = asyncio.ensure_future(self._read_responses(shard))
+        except BaseException:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        """
+        Stops the workers once their in flight commands are done
+        """
+        shards, self._shards = self._shards, []
+        for shard in shards:
+            if not shard.writer.is_closing():
+                _write_frame(shard.writer, None)
+        loop = asyncio.get_event_loop()
+        for shard in shards:
+            if shard.task is not None:
+                await shard.task
+            shard.writer.close()
+            await loop.run_in_executor(None, shard.process.join)
+
+    async def _read_responses(self, shard: Shard) -> None:
+        try:
+            while True:
+                request_id, succeeded, result = await _read_frame(shard.reader)
+                future = shard.futures.pop(request_id)
+                if future.done():
+                    continue
+                if succeeded:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        for future in shard.futures.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Shard worker exited"))
+        shard.futures.clear()
+
+    async def _call(
+        self,
+        route: int,
+        method: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        shards = self._connected_shards()
+        shard = shards[route % len(shards)]
+        request_id = next(self._request_ids)
+        # Raises before writing anything when the arguments can't be pickled
+        _write_frame(
+            shard.writer,
+            (request_id, route // len(shards), method, args, kwargs),
+        )
+        future = asyncio.get_event_loop().create_future()
+        shard.futures[request_id] = future
+        try:
+            # Waits for the worker to keep up, instead of buffering
+            async with shard.drain_lock:
+                await shard.writer.drain()
+        except BaseException:
+            future.cancel()
+            raise
+        return await future
+
+    def _connected_shards(self) -> List[Shard]:
+        if not self._shards:
+            raise ConnectionError("ShardedClient is not connected")
+        return self._shards
+
+    def _group_by_shard(
+        self, set_name: str, keys: List[AerospikeKeyType]
+    ) -> Dict[int, List[int]]:
+        """
+        Returns first key hash -> indexes of the keys owned by that shard
+        """
+        groups: Dict[int, List[int]] = {}
+        first_hash: Dict[int, int] = {}
+        shards = len(self._connected_shards())
+        for index, key in enumerate(keys):
+            key_hash = shard_hash(set_name, key)
+            shard = key_hash % shards
+            route = first_hash.setdefault(shard, key_hash)
+            groups.setdefault(route, []).append(index)
+        return groups
+
+    put_key = _routed(AerospikeClient.put_key)
+    get_key = _routed(AerospikeClient.get_key)
+    get_header = _routed(AerospikeClient.get_header)
+    delete_key = _routed(AerospikeClient.delete_key)
+    key_exists = _routed(AerospikeClient.key_exists)
+    operate = _routed(AerospikeClient.operate)
+    increment = _routed(AerospikeClient.increment)
+    append = _routed(AerospikeClient.append)
+    prepend = _routed(AerospikeClient.prepend)
+    touch = _routed(AerospikeClient.touch)
+    apply = _routed(AerospikeClient.apply)
+
+    async def get_many(
+        self,
+        namespace: str,
+        set_name: str,
+        keys: List[AerospikeKeyType],
+        bins: Optional[List[str]] = None,
+        predexp: Optional[List[PredExp]] = None,
+    ) -> List[Dict[str, AerospikeValueType]]:
+        """
+        Same as AerospikeClient.get_many, one batch per shard
+        """
+        groups = self._group_by_shard(set_name, keys)
+        parts = await asyncio.gather(
+            *(
+                self._call(
+                    route,
+                    "get_many",
+                    (
+                        namespace,
+                        set_name,
+                        [keys[index] for index in indexes],
+                        bins,
+                        predexp,
+                    ),
+                    {},
+                )
+                for route, indexes in groups.items()
+            )
+        )
+        results: List[Dict[str, AerospikeValueType]] = [{} for _ in keys]
+        for indexes, part in zip(groups.values(), parts):
+            for index, record in zip(indexes, part):
+                results[index] = record
+        return results
+
+    async def increment_many(
+        self,
+        namespace: str,
+        set_name: str,
+        counters: Dict[AerospikeKeyType, Dict[str, Union[int, float]]],
+        return_value: bool = False,
+        ttl: int = 0,
+    ) -> Dict[AerospikeKeyType, Dict[str, Union[int, float]]]:
+        keys = list(counters)
+        groups = self._group_by_shard(set_name, keys)
+        parts = await asyncio.gather(
+            *(
+                self._call(
+                    route,
+                    "increment_many",
+                    (
+                        namespace,
+                        set_name,
+                        {
+                            keys[index]: counters[keys[index]]
+                            for index in indexes
+                        },
+                        return_value,
+                        ttl,
+                    ),
+                    {},
+                )
+                for route, indexes in groups.items()
+            )
+        )
+        results: Dict[AerospikeKeyType, Dict[str, Union[int, float]]] = {}
+        for part in parts:
+            results.update(part)
+        return results
+
+    async def info(self, *commands: str) -> Dict[str, str]:
+        return await self._call(0, "info", commands, {})
+
+    async def register_udf(self, filename: str, content: bytes) -> None:
+        await self._call(0, "register_udf", (filename, content), {})
+
+    async def scan_apply(self, *args: Any, **kwargs: Any) -> int:
+        return await self._call(0, "scan_apply", args, kwargs)
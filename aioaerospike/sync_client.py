@@ -0,0 +1,95 @@
+from asyncio import new_event_loop, run_coroutine_threadsafe
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import wraps
+from threading import Thread
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from .client import AerospikeClient
+
+T = TypeVar("T")
+
+
+def _blocking(async_method: Callable[..., Awaitable[T]]) -> Callable[..., T]:
+    @wraps(async_method)
+    def method(self: "SyncAerospikeClient", *args: Any, **kwargs: Any) -> T:
+        return self._run(async_method(self.client, *args, **kwargs))
+
+    return method
+
+
+class SyncAerospikeClient:
+    """
+    Blocking facade over AerospikeClient for synchronous code.
+    A single event loop runs in a background thread and owns the connection,
+    every method hands its command over to that loop and waits for the
+    result, so any number of threads can share one client (and socket).
+    Takes the same arguments as AerospikeClient, timeout bounds the wait
+    of each call in seconds: a call timing out is cancelled in the loop and
+    raises concurrent.futures.TimeoutError.
+    """
+
+    def __init__(
+        self, *args: Any, timeout: Optional[float] = None, **kwargs: Any
+    ) -> None:
+        self.timeout = timeout
+        self._loop = new_event_loop()
+        self._thread = Thread(
+            target=self._loop.run_forever,
+            name="aioaerospike-loop",
+            daemon=True,
+        )
+        self._thread.start()
+        self.client: AerospikeClient = self._run(
+            self._create_client(*args, **kwargs)
+        )
+
+    @staticmethod
+    async def _create_client(*args: Any, **kwargs: Any) -> AerospikeClient:
+        # The client has to be created in the loop's thread
+        return AerospikeClient(*args, **kwargs)
+
+    def __enter__(self) -> "SyncAerospikeClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _run(self, coroutine: Awaitable[T]) -> T:
+        future = run_coroutine_threadsafe(coroutine, self._loop)  # type: ignore
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            # Otherwise the command keeps running, holding the connection
+            future.cancel()
+            raise
+
+    def connect(self) -> None:
+        self._run(self.client.connect())
+
+    def close(self) -> None:
+        """
+        Closes the connection and stops the loop thread
+        """
+        if not self._loop.is_running():
+            return
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    put_key = _blocking(AerospikeClient.put_key)
+    get_key = _blocking(AerospikeClient.get_key)
+    get_many = _blocking(AerospikeClient.get_many)
+    get_header = _blocking(AerospikeClient.get_header)
+    delete_key = _blocking(AerospikeClient.delete_key)
+    key_exists = _blocking(AerospikeClient.key_exists)
+    operate = _blocking(AerospikeClient.operate)
+    increment = _blocking(AerospikeClient.increment)
+    increment_many = _blocking(AerospikeClient.increment_many)
+    append = _blocking(AerospikeClient.append)
+    prepend = _blocking(AerospikeClient.prepend)
+    touch = _blocking(AerospikeClient.touch)
+    info = _blocking(AerospikeClient.info)
+    register_udf = _blocking(AerospikeClient.register_udf)
+    apply = _blocking(AerospikeClient.apply)
+    scan_apply = _blocking(AerospikeClient.scan_apply)
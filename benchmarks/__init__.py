@@ -0,0 +1,3 @@
+"""
+Benchmarks for aioaerospike, run with python -m benchmarks --help
+"""
@@ -0,0 +1,103 @@
+import argparse
+
+from . import client, codec, footprint, scan, sharded
+from .common import SHAPES, dump_results, print_results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "suites",
+        nargs="*",
+        help="suites to run (codec, client, sharded, scan, footprint), "
+        "all by default",
+    )
+    parser.add_argument("--json", help="write results as JSON to this path")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="seconds per codec benchmark",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=2,
+        help="seconds per client benchmark and concurrency level",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 16, 64]
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="worker process counts of the sharded suite",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="connection counts of the scan suite",
+    )
+    parser.add_argument(
+        "--shapes", nargs="+", choices=list(SHAPES), default=["small_bins"]
+    )
+    parser.add_argument(
+        "--host", help="benchmark a live server instead of the fake server"
+    )
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument(
+        "--transports",
+        nargs="+",
+        choices=["protocol", "streams"],
+        default=["protocol", "streams"],
+        help="client connection implementations to compare",
+    )
+    parser.add_argument(
+        "--uvloop", action="store_true", help="run the event loop on uvloop"
+    )
+    args = parser.parse_args()
+
+    all_suites = ["codec", "client", "sharded", "scan", "footprint"]
+    suites = args.suites or all_suites
+    for suite in suites:
+        if suite not in all_suites:
+            parser.error(f"unknown suite {suite}")
+    if args.uvloop:
+        import uvloop
+
+        uvloop.install()
+    results = []
+    if "footprint" in suites:
+        results += footprint.run()
+    if "codec" in suites:
+        results += codec.run(args.min_time)
+    if "client" in suites:
+        results += client.run(
+            args.concurrency,
+            args.duration,
+            args.shapes,
+            args.host,
+            args.port,
+            args.transports,
+        )
+    if "sharded" in suites:
+        results += sharded.run(
+            args.processes,
+            max(args.concurrency),
+            args.duration,
+            args.shapes,
+            args.host,
+            args.port,
+        )
+    if "scan" in suites:
+        results += scan.run(args.connections, args.shapes, args.host, args.port)
+    print_results(results)
+    dump_results(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.fake_server import FakeAerospikeServer
+from aioaerospike.protocol.message import (
+    Bin,
+    Info1Flags,
+    Info2Flags,
+    Info3Flags,
+    Operation,
+    OperationTypes,
+)
+
+from .common import SHAPES, Result, percentile
+
+Command = Callable[[AerospikeClient, int], Awaitable[object]]
+
+# Distinct keys per worker, so workers don't contend on the same records
+KEYS_PER_WORKER = 100
+
+
+def commands(set_name: str, shape: str) -> List[Tuple[str, Command]]:
+    bins = SHAPES[shape]
+    first_bin = next(iter(bins))
+    operations = [
+        Operation(OperationTypes.WRITE, Bin.create("counter", 1)),
+        Operation(OperationTypes.READ, Bin.create(first_bin, None)),
+    ]
+
+    async def put(client: AerospikeClient, key: int) -> object:
+        return await client.put_key("test", set_name, key, bins)
+
+    async def get(client: AerospikeClient, key: int) -> object:
+        return await client.get_key("test", set_name, key)
+
+    async def operate(client: AerospikeClient, key: int) -> object:
+        return await client.operate(
+            "test",
+            set_name,
+            key,
+            Info1Flags.READ,
+            Info2Flags.WRITE,
+            Info3Flags.EMPTY,
+            operations,
+        )
+
+    return [("put_key", put), ("get_key", get), ("operate", operate)]
+
+
+async def run_command(
+    host: str,
+    port: int,
+    command: Command,
+    concurrency: int,
+    duration: float,
+    use_streams: bool = False,
+) -> dict:
+    """
+    Runs command in concurrency workers, each with its own connection,
+    for duration seconds. Returns throughput and latency percentiles.
+    """
+    clients = [
+        AerospikeClient(
+            host, "admin", "admin", port=port, use_streams=use_streams
+        )
+        for _ in range(concurrency)
+    ]
+    for client in clients:
+        await client.connect()
+
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int, client: AerospikeClient) -> None:
+        base = index * KEYS_PER_WORKER
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await command(client, base + i % KEYS_PER_WORKER)
+            latencies.append(time.perf_counter() - start)
+            i += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(worker(index, client) for index, client in enumerate(clients))
+    )
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed,
+        "p50_us": percentile(latencies, 50) * 1e6,
+        "p99_us": percentile(latencies, 99) * 1e6,
+    }
+
+
+async def run_async(
+    concurrency_levels: List[int],
+    duration: float,
+    shapes: List[str],
+    host: Optional[str],
+    port: int,
+    transports: List[str],
+) -> List[Result]:
+    server = None
+    if host is None:
+        server = FakeAerospikeServer()
+        await server.start()
+        host, port = server.host, server.port
+
+    results = []
+    try:
+        for shape in shapes:
+            set_name = f"bench_{shape}"
+            for name, command in commands(set_name, shape):
+                for transport in transports:
+                    for concurrency in concurrency_levels:
+                        metrics = await run_command(
+                            host,
+                            port,
+                            command,
+                            concurrency,
+                            duration,
+                            transport == "streams",
+                        )
+                        results.append(
+                            Result(
+                                "client",
+                                name,
+                                shape,
+                                params={
+                                    "concurrency": concurrency,
+                                    "transport": transport,
+                                    "server": "fake" if server else "live",
+                                },
+                                metrics=metrics,
+                            )
+                        )
+    finally:
+        if server is not None:
+            await server.stop()
+    return results
+
+
+def run(
+    concurrency_levels: List[int],
+    duration: float,
+    shapes: List[str],
+    host: Optional[str] = None,
+    port: int = 3000,
+    transports: Optional[List[str]] = None,
+) -> List[Result]:
+    """
+    End to end client benchmarks, against the in-process fake server unless
+    host is given. Note the fake server shares the event loop (and core)
+    with the client, so absolute numbers are lower than against a real node.
+    transports are "protocol" (default connection) and/or "streams".
+    """
+    return asyncio.run(
+        run_async(
+            concurrency_levels,
+            duration,
+            shapes,
+            host,
+            port,
+            transports or ["protocol"],
+        )
+    )
@@ -0,0 +1,168 @@
+from typing import List
+
+from aioaerospike.columnar import ColumnarResult
+from aioaerospike.protocol.datatypes import (
+    AerospikeList,
+    AerospikeMap,
+    data_to_aerospike_type,
+)
+from aioaerospike.protocol.general import AerospikeHeader, AerospikeMessage
+from aioaerospike.protocol.message import (
+    Bin,
+    Info1Flags,
+    Info2Flags,
+    Info3Flags,
+    Message,
+    Operation,
+    OperationTypes,
+    put_key,
+)
+
+from .common import SHAPES, Result, measure
+
+# Records per batch of the batch_decode benchmarks
+BATCH_RECORDS = 1000
+
+
+def response_for(bins: dict) -> Message:
+    """
+    Builds the server response of reading a record with the given bins
+    """
+    return Message(
+        info1=Info1Flags.EMPTY,
+        info2=Info2Flags.EMPTY,
+        info3=Info3Flags.EMPTY,
+        transaction_ttl=0,
+        fields=[],
+        operations=[
+            Operation(OperationTypes.READ, Bin.create(name, value))
+            for name, value in bins.items()
+        ],
+        generation=1,
+    )
+
+
+def run(min_time: float) -> List[Result]:
+    results = []
+
+    for key in ("string_key", b"bytes_key", 123456, 123.456):
+        aero_key = data_to_aerospike_type(key)
+        results.append(
+            Result(
+                "codec",
+                "digest",
+                params={"key_type": type(key).__name__},
+                metrics=measure(lambda: aero_key.digest("set"), min_time),
+            )
+        )
+
+    header = AerospikeHeader(message_type=3, length=1234)
+    packed_header = header.pack()
+    results.append(
+        Result("codec", "header_pack", metrics=measure(header.pack, min_time))
+    )
+    results.append(
+        Result(
+            "codec",
+            "header_parse",
+            metrics=measure(
+                lambda: AerospikeHeader.parse(packed_header), min_time
+            ),
+        )
+    )
+
+    for shape, bins in SHAPES.items():
+        request = put_key("test", "set", "key", bins)
+        results.append(
+            Result(
+                "codec",
+                "request_build_pack",
+                shape,
+                metrics=measure(
+                    lambda: AerospikeMessage(
+                        put_key("test", "set", "key", bins)
+                    ).pack(),
+                    min_time,
+                ),
+            )
+        )
+        results.append(
+            Result(
+                "codec",
+                "message_pack",
+                shape,
+                metrics=measure(request.pack, min_time),
+            )
+        )
+        packed_response = AerospikeMessage(response_for(bins)).pack()
+        results.append(
+            Result(
+                "codec",
+                "response_parse",
+                shape,
+                metrics=measure(
+                    lambda: AerospikeMessage.parse(packed_response), min_time
+                ),
+            )
+        )
+
+    for shape, bins in SHAPES.items():
+        for value in bins.values():
+            if isinstance(value, dict):
+                cdt = AerospikeMap(value)
+            elif isinstance(value, list):
+                cdt = AerospikeList(value)
+            else:
+                continue
+            packed = cdt.pack()
+            results.append(
+                Result(
+                    "codec",
+                    "cdt_pack",
+                    shape,
+                    metrics=measure(cdt.pack, min_time),
+                )
+            )
+            results.append(
+                Result(
+                    "codec",
+                    "cdt_parse",
+                    shape,
+                    metrics=measure(lambda: type(cdt).parse(packed), min_time),
+                )
+            )
+
+    # Decoding a batch read's records to a dict per record (get_many) and
+    # to columns (get_many_columnar)
+    records = [
+        response_for({"id": i, "score": i / 3, "name": f"user_{i}"}).pack()
+        for i in range(BATCH_RECORDS)
+    ]
+
+    def decode_dicts() -> list:
+        return [
+            {
+                op.data_bin.name: op.data_bin.data.value
+                for op in Message.parse(record).operations
+            }
+            for record in records
+        ]
+
+    def decode_columns() -> ColumnarResult:
+        result = ColumnarResult(len(records))
+        for row, record in enumerate(records):
+            result.add(record, row)
+        result.finish()
+        return result
+
+    for name, decode in (("dicts", decode_dicts), ("columns", decode_columns)):
+        results.append(
+            Result(
+                "codec",
+                "batch_decode",
+                params={"records": BATCH_RECORDS, "result": name},
+                metrics=measure(decode, min_time),
+            )
+        )
+
+    return results
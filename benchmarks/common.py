@@ -0,0 +1,106 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Record shapes used across benchmarks
+SHAPES: Dict[str, Dict[str, Any]] = {
+    "small_bins": {f"bin_{i}": i if i % 2 else f"value_{i}" for i in range(50)},
+    "huge_blob": {"blob": b"x" * 1024 * 1024},
+    "deep_map": {"map": {}},
+}
+
+
+def _deep_map(depth: int, width: int) -> Dict[str, Any]:
+    if depth == 0:
+        return {f"leaf_{i}": i for i in range(width)}
+    return {f"level_{i}": _deep_map(depth - 1, width) for i in range(2)}
+
+
+SHAPES["deep_map"] = {"map": _deep_map(6, 8)}
+
+
+@dataclass
+class Result:
+    benchmark: str
+    name: str
+    shape: str = ""
+    params: Dict[str, Any] = field(default_factory=dict)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+def measure(
+    func: Callable[[], Any], min_time: float = 0.2, max_iterations: int = 100000
+) -> Dict[str, float]:
+    """
+    Runs func repeatedly for at least min_time seconds,
+    returns ns/op and the tracemalloc blocks/bytes retained by its results
+    per op.
+    """
+    func()
+    iterations = 0
+    start = time.perf_counter_ns()
+    deadline = start + min_time * 1e9
+    while iterations < max_iterations:
+        func()
+        iterations += 1
+        if time.perf_counter_ns() >= deadline:
+            break
+    elapsed = time.perf_counter_ns() - start
+
+    alloc_iterations = min(iterations, 100)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [func() for _ in range(alloc_iterations)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del results
+    stats = after.compare_to(before, "filename")
+    blocks = sum(max(stat.count_diff, 0) for stat in stats)
+    size = sum(max(stat.size_diff, 0) for stat in stats)
+    return {
+        "iterations": iterations,
+        "ns_per_op": elapsed / iterations,
+        "retained_blocks_per_op": blocks / alloc_iterations,
+        "retained_bytes_per_op": size / alloc_iterations,
+    }
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+
+def print_results(results: List[Result]) -> None:
+    for result in results:
+        name = " ".join(
+            filter(None, [result.benchmark, result.name, result.shape])
+        )
+        params = " ".join(f"{k}={v}" for k, v in result.params.items())
+        metrics = " ".join(
+            f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+            for k, v in result.metrics.items()
+        )
+        print(f"{name:40} {params:20} {metrics}")
+
+
+def dump_results(results: List[Result], path: Optional[str]) -> None:
+    """
+    Writes results as JSON, for tracking regressions between releases.
+    """
+    if path is None:
+        return
+    document = {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
@@ -0,0 +1,100 @@
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from aioaerospike.protocol.datatypes import AerospikeInteger
+from aioaerospike.protocol.general import AerospikeHeader
+from aioaerospike.protocol.message import (
+    Bin,
+    Field,
+    FieldTypes,
+    Message,
+    Operation,
+    OperationTypes,
+)
+
+from .codec import response_for
+from .common import Result
+
+# Modules the client shouldn't load until they're needed
+HEAVY_MODULES = ("bcrypt", "construct", "msgpack", "numpy")
+OBJECTS = 10000
+
+IMPORT_SCRIPT = f"""
+import sys, time
+start = time.perf_counter()
+import aioaerospike.client
+elapsed = time.perf_counter() - start
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure_import(runs: int) -> Dict[str, Any]:
+    """
+    Imports the client in fresh interpreters, returns the median time
+    """
+    times = []
+    loaded = ""
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ""
+    return {
+        "import_ms": statistics.median(times) * 1e3,
+        "heavy_modules_loaded": len(loaded.split(",")) if loaded else 0,
+    }
+
+
+def measure_objects(create: Callable[[], Any]) -> Dict[str, float]:
+    """
+    Returns the bytes allocated per object created by create
+    """
+    tracemalloc.start()
+    objects = [create() for _ in range(OBJECTS)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return {"bytes_per_object": size / OBJECTS}
+
+
+def run(import_runs: int = 10) -> List[Result]:
+    """
+    Client import time in a fresh interpreter, and memory per wire object
+    """
+    results = [
+        Result(
+            "footprint",
+            "import_client",
+            params={"runs": import_runs},
+            metrics=measure_import(import_runs),
+        )
+    ]
+    response = response_for({f"bin_{i}": i for i in range(100)}).pack()
+    objects = {
+        "integer": lambda: AerospikeInteger(1),
+        "header": lambda: AerospikeHeader(3, 100),
+        "field": lambda: Field(FieldTypes.DIGEST, b"x" * 20),
+        "operation": lambda: Operation(
+            OperationTypes.READ, Bin.create("bin", 1)
+        ),
+        # Parsed response of 100 integer bins
+        "message_100_bins": lambda: Message.parse(response),
+    }
+    for name, create in objects.items():
+        results.append(
+            Result(
+                "footprint",
+                "object_memory",
+                params={"object": name},
+                metrics=measure_objects(create),
+            )
+        )
+    return results
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.fake_server import FakeAerospikeServer
+from aioaerospike.scan import ScanCursor, parallel_scan
+
+from .common import SHAPES, Result
+
+# Records per shape, keeping the scanned data size reasonable
+RECORDS = {"small_bins": 5000, "huge_blob": 100, "deep_map": 1000}
+
+
+async def run_scan(
+    host: str, port: int, set_name: str, connections: int
+) -> dict:
+    clients = [
+        AerospikeClient(host, "admin", "admin", port=port)
+        for _ in range(connections)
+    ]
+    for client in clients:
+        await client.connect()
+    records = 0
+    start = time.perf_counter()
+    cursor = ScanCursor.create("test", set_name)
+    async for _ in parallel_scan(clients, cursor):
+        records += 1
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return {"records": records, "records_per_sec": records / elapsed}
+
+
+async def run_async(
+    connection_counts: List[int],
+    shapes: List[str],
+    host: Optional[str],
+    port: int,
+) -> List[Result]:
+    server = None
+    if host is None:
+        server = FakeAerospikeServer()
+        await server.start()
+        host, port = server.host, server.port
+
+    results = []
+    try:
+        for shape in shapes:
+            set_name = f"bench_scan_{shape}"
+            client = AerospikeClient(host, "admin", "admin", port=port)
+            await client.connect()
+            for key in range(RECORDS[shape]):
+                await client.put_key("test", set_name, key, SHAPES[shape])
+            await client.close()
+            for connections in connection_counts:
+                metrics = await run_scan(host, port, set_name, connections)
+                results.append(
+                    Result(
+                        "scan",
+                        "parallel_scan",
+                        shape,
+                        params={
+                            "connections": connections,
+                            "server": "fake" if server else "live",
+                        },
+                        metrics=metrics,
+                    )
+                )
+    finally:
+        if server is not None:
+            await server.stop()
+    return results
+
+
+def run(
+    connection_counts: List[int],
+    shapes: List[str],
+    host: Optional[str] = None,
+    port: int = 3000,
+) -> List[Result]:
+    """
+    parallel_scan throughput per number of connections, each scanning its
+    share of the partitions. The in-process fake server builds each scan
+    response at once on the same loop, so scaling only shows with a live
+    server.
+    """
+    return asyncio.run(run_async(connection_counts, shapes, host, port))
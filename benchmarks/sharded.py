@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+import time
+from typing import List, Optional
+
+from aioaerospike.fake_server import FakeAerospikeServer
+from aioaerospike.sharded import ShardedClient
+
+from .common import SHAPES, Result
+
+KEYS = 1000
+
+
+async def _serve_fake(ports: multiprocessing.Queue) -> None:
+    async with FakeAerospikeServer() as server:
+        ports.put(server.port)
+        await asyncio.Event().wait()
+
+
+def _fake_server_main(ports: multiprocessing.Queue) -> None:
+    asyncio.run(_serve_fake(ports))
+
+
+async def run_sharded(
+    host: str,
+    port: int,
+    processes: int,
+    concurrency: int,
+    duration: float,
+    shape: str,
+) -> dict:
+    set_name = f"bench_sharded_{shape}"
+    bins = SHAPES[shape]
+    async with ShardedClient(
+        host,
+        "admin",
+        "admin",
+        port=port,
+        processes=processes,
+        connections_per_process=4,
+    ) as client:
+        await asyncio.gather(
+            *(
+                client.put_key("test", set_name, key, bins)
+                for key in range(KEYS)
+            )
+        )
+        ops = 0
+        deadline = time.perf_counter() + duration
+
+        async def worker(index: int) -> None:
+            nonlocal ops
+            key = index
+            while time.perf_counter() < deadline:
+                await client.get_key("test", set_name, key % KEYS)
+                key += concurrency
+                ops += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {"ops": ops, "ops_per_sec": ops / elapsed}
+
+
+def run(
+    process_counts: List[int],
+    concurrency: int,
+    duration: float,
+    shapes: List[str],
+    host: Optional[str] = None,
+    port: int = 3000,
+) -> List[Result]:
+    """
+    get_key throughput of ShardedClient per number of worker processes.
+    Without host, the fake server runs in its own process, and with a single
+    core it becomes the bottleneck well before the client does.
+    """
+    server = None
+    if host is None:
+        context = multiprocessing.get_context("spawn")
+        ports: multiprocessing.Queue = context.Queue()
+        server = context.Process(
+            target=_fake_server_main, args=(ports,), daemon=True
+        )
+        server.start()
+        host, port = "127.0.0.1", ports.get()
+
+    results = []
+    try:
+        for shape in shapes:
+            for processes in process_counts:
+                metrics = asyncio.run(
+                    run_sharded(
+                        host, port, processes, concurrency, duration, shape
+                    )
+                )
+                results.append(
+                    Result(
+                        "sharded",
+                        "get_key",
+                        shape,
+                        params={
+                            "processes": processes,
+                            "concurrency": concurrency,
+                            "server": "fake" if server else "live",
+                        },
+                        metrics=metrics,
+                    )
+                )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+    return results
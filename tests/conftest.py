@@ -1,13 +1,40 @@
+import os
 import uuid
 
 import pytest
 
 from aioaerospike.client import AerospikeClient
+from aioaerospike.fake_server import FakeAerospikeServer
+
+# Run the suite against the in-process fake server instead of a live one
+USE_FAKE_SERVER = bool(os.environ.get("AIOAEROSPIKE_FAKE_SERVER"))
+
+
+@pytest.fixture
+async def fake_server():
+    async with FakeAerospikeServer() as server:
+        yield server
+
+
+@pytest.fixture
+def server(request):
+    """
+    Fake server the suite runs against, None when running against a live one
+    (the fake server isn't started then)
+    """
+    if USE_FAKE_SERVER:
+        return request.getfixturevalue("fake_server")
+    return None
 
 
 @pytest.fixture
-async def client(scope="module"):
-    client = AerospikeClient("127.0.0.1", "admin", "admin", port=3000)
+async def client(server, scope="module"):
+    if server is not None:
+        client = AerospikeClient(
+            server.host, "admin", "admin", port=server.port
+        )
+    else:
+        client = AerospikeClient("127.0.0.1", "admin", "admin", port=3000)
     await client.connect()
     return client
 
@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from aioaerospike.backup import MAGIC, backup, read_records, restore
+from aioaerospike.client import AerospikeClient
+from aioaerospike.protocol.result_code import ResultCode
+
+
+async def connect(server):
+    client = AerospikeClient(server.host, "admin", "admin", port=server.port)
+    await client.connect()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_backup_restore(fake_server, tmp_path):
+    client = await connect(fake_server)
+    for i in range(50):
+        await client.put_key(
+            "test", "set", i, {"bin": i, "list": [i, "x"]}, ttl=1000 * (i % 2)
+        )
+    path = str(tmp_path / "set.bak")
+    stats = await backup(client, "test", "set", path)
+    assert stats.records == 50
+    with open(path, "rb") as f:
+        assert f.read(len(MAGIC)) == MAGIC
+
+    # Newer data is kept
+    fake_server.clear()
+    await client.put_key("test", "set", 0, {"bin": "new"})
+    await client.put_key("test", "set", 0, {"bin": "newer"})
+    clients = [await connect(fake_server) for _ in range(2)]
+    stats = await restore(clients, path, batch_size=8)
+    assert (stats.restored, stats.skipped, stats.failed) == (49, 1, 0)
+    assert await client.get_key("test", "set", 0) == {"bin": "newer"}
+    for i in range(1, 50):
+        assert await client.get_key("test", "set", i) == {
+            "bin": i,
+            "list": [i, "x"],
+        }
+    ttls = [(await client.get_header("test", "set", i)).ttl for i in (1, 2)]
+    assert 990 <= ttls[0] <= 1000
+    assert ttls[1] == -1
+    for restore_client in clients:
+        await restore_client.close()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_resume(fake_server, tmp_path):
+    client = await connect(fake_server)
+    for i in range(20):
+        await client.put_key("test", "set", i, {"bin": i})
+    path = str(tmp_path / "set.bak")
+    await backup(client, "test", "set", path)
+
+    # Previous restore stopped after the first 5 records
+    with open(path, "rb") as f:
+        f.seek(len(MAGIC))
+        offsets = [offset for _, offset in read_records(f)]
+    state_path = str(tmp_path / "set.state")
+    with open(state_path, "w") as f:
+        json.dump({"offset": offsets[4]}, f)
+
+    fake_server.clear()
+    stats = await restore([client], path, batch_size=4, state_path=state_path)
+    assert stats.restored == 15
+    assert len(fake_server.records) == 15
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retried(fake_server, tmp_path):
+    client = await connect(fake_server)
+    for i in range(20):
+        await client.put_key("test", "set", i, {"bin": i})
+    path = str(tmp_path / "set.bak")
+    await backup(client, "test", "set", path)
+    with open(path, "rb") as f:
+        f.seek(len(MAGIC))
+        offsets = [offset for _, offset in read_records(f)]
+    state_path = str(tmp_path / "set.state")
+    with open(state_path, "w") as f:
+        json.dump({"offset": offsets[3]}, f)
+
+    # The first write fails, progress stays before its batch
+    fake_server.clear()
+    fake_server.faults.next_errors = [ResultCode.DEVICE_OVERLOAD]
+    stats = await restore([client], path, batch_size=4, state_path=state_path)
+    assert (stats.restored, stats.failed) == (15, 1)
+    assert stats.result_codes == {ResultCode.DEVICE_OVERLOAD: 1}
+    with open(state_path) as f:
+        assert json.load(f) == {"offset": offsets[3]}
+
+    stats = await restore([client], path, batch_size=4, state_path=state_path)
+    assert (stats.restored, stats.skipped, stats.failed) == (1, 15, 0)
+    assert len(fake_server.records) == 16
+    assert not os.path.exists(state_path)
+    await client.close()
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from aioaerospike.batcher import WriteBatcher
+from aioaerospike.client import AerospikeClient
+from aioaerospike.exceptions import RecordNotFound
+from aioaerospike.protocol.message import ExistsPolicy, WritePolicy
+
+
+@pytest.mark.asyncio
+async def test_coalesce(namespace, set_name, client):
+    async with WriteBatcher(client, max_delay=0.01) as batcher:
+        generations = await asyncio.gather(
+            *[
+                batcher.put_key(namespace, set_name, i, {"bin": i})
+                for i in range(10)
+            ]
+        )
+    assert generations == [1] * 10
+    for i in range(10):
+        assert await client.get_key(namespace, set_name, i) == {"bin": i}
+
+
+@pytest.mark.asyncio
+async def test_max_batch(namespace, set_name, key, client):
+    batcher = WriteBatcher(client, max_delay=60, max_batch=3)
+    values = await asyncio.gather(
+        *[
+            batcher.increment(
+                namespace, set_name, key, "bin", return_value=True
+            )
+            for _ in range(3)
+        ]
+    )
+    assert values == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_errors_dispatched(namespace, set_name, key, client):
+    policy = WritePolicy(exists=ExistsPolicy.UPDATE_ONLY)
+    async with WriteBatcher(client) as batcher:
+        missing = batcher.put_key(
+            namespace, set_name, key, {"bin": 1}, policy=policy
+        )
+        created = batcher.put_key(namespace, set_name, key, {"bin": 2})
+        results = await asyncio.gather(missing, created, return_exceptions=True)
+    assert isinstance(results[0], RecordNotFound)
+    assert results[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush(fake_server):
+    client = AerospikeClient(
+        fake_server.host, "admin", "admin", port=fake_server.port
+    )
+    await client.connect()
+    fake_server.faults.latency = 0.05
+    batcher = WriteBatcher(client, max_batch=1)
+    put = asyncio.ensure_future(batcher.put_key("test", "set", 1, {"bin": 1}))
+    await asyncio.sleep(0.01)
+    for flush in batcher._flushes:
+        flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(put, 1)
+    await client.close()
@@ -0,0 +1,104 @@
+import pytest
+
+from aioaerospike.cache import ReadCache, cache_key
+from aioaerospike.client import AerospikeClient
+from aioaerospike.exceptions import ServerTimeout
+from aioaerospike.protocol.result_code import ResultCode
+
+
+@pytest.fixture
+async def cached_client(fake_server):
+    client = AerospikeClient(
+        fake_server.host,
+        "admin",
+        "admin",
+        port=fake_server.port,
+        read_cache=ReadCache(max_size=2, max_staleness=60),
+    )
+    await client.connect()
+    yield client
+    await client.close()
+
+
+def test_lru():
+    cache = ReadCache(max_size=2)
+    keys = [cache_key("test", "set", i) for i in range(3)]
+    cache.put(keys[0], {"bin": 0}, 1)
+    cache.put(keys[1], {"bin": 1}, 1)
+    cache.get(keys[0])
+    cache.put(keys[2], {"bin": 2}, 1)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]).bins == {"bin": 0}
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_hits(fake_server, cached_client):
+    await cached_client.put_key("test", "set", "key", {"bin": 1, "other": 2})
+    assert await cached_client.get_key("test", "set", "key") == {
+        "bin": 1,
+        "other": 2,
+    }
+    result = await cached_client.get_key("test", "set", "key", bins=["bin"])
+    assert result == {"bin": 1}
+    assert fake_server.commands["single"] == 2
+    assert cached_client.read_cache.stats.hits == 1
+    assert cached_client.read_cache.stats.misses == 1
+
+    # Returned records are copies
+    result["bin"] = 5
+    assert await cached_client.get_key("test", "set", "key") == {
+        "bin": 1,
+        "other": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates(fake_server, cached_client):
+    await cached_client.put_key("test", "set", "key", {"bin": 1})
+    await cached_client.get_key("test", "set", "key")
+    await cached_client.increment("test", "set", "key", "bin")
+    assert await cached_client.get_key("test", "set", "key") == {"bin": 2}
+    await cached_client.delete_key("test", "set", "key")
+    assert await cached_client.get_key("test", "set", "key") == {}
+    assert cached_client.read_cache.stats.invalidations == 2
+
+
+@pytest.mark.asyncio
+async def test_revalidate(fake_server, cached_client):
+    cache = cached_client.read_cache
+    await cached_client.put_key("test", "set", "key", {"bin": 1})
+    await cached_client.get_key("test", "set", "key")
+
+    cache.max_staleness = 0
+    assert await cached_client.get_key("test", "set", "key") == {"bin": 1}
+    assert cache.stats.revalidations == 1
+
+    # Written by another client, generation changed
+    other = AerospikeClient(
+        fake_server.host, "admin", "admin", port=fake_server.port
+    )
+    await other.connect()
+    await other.put_key("test", "set", "key", {"bin": 2})
+    await other.close()
+    assert await cached_client.get_key("test", "set", "key") == {"bin": 2}
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_error_keeps_entry(fake_server, cached_client):
+    cache = cached_client.read_cache
+    await cached_client.put_key("test", "set", "key", {"bin": 1})
+    await cached_client.get_key("test", "set", "key")
+
+    cache.max_staleness = 0
+    fake_server.faults.next_errors = [ResultCode.TIMEOUT, ResultCode.TIMEOUT]
+    with pytest.raises(ServerTimeout):
+        await cached_client.get_key("test", "set", "key")
+    assert cache.get(cache_key("test", "set", "key")).bins == {"bin": 1}
+    assert cache.stats.invalidations == 0
+
+    fake_server.faults.next_errors = [ResultCode.TIMEOUT]
+    with pytest.raises(ServerTimeout):
+        await cached_client.get_key("test", "set", "other")
+    assert cache.get(cache_key("test", "set", "other")) is None
@@ -0,0 +1,172 @@
+import asyncio
+import time
+
+import pytest
+
+from aioaerospike.cluster import ClusterClient, ReadPolicy
+from aioaerospike.exceptions import CircuitOpenError, DeviceOverload
+from aioaerospike.fake_server import FakeAerospikeServer
+from aioaerospike.overload import BreakerPolicy
+from aioaerospike.protocol.partition import (
+    N_PARTITIONS,
+    format_replicas,
+    pack_bitmap,
+    parse_replicas,
+    partition_id,
+)
+from aioaerospike.protocol.result_code import ResultCode
+
+
+@pytest.fixture
+async def cluster():
+    """
+    Two nodes sharing their records, first masters every partition and is in
+    rack 1, second holds the replicas in rack 2.
+    """
+    all_partitions = pack_bitmap(range(N_PARTITIONS))
+    no_partitions = pack_bitmap([])
+    master = FakeAerospikeServer(node_id="BB9FAKE00000001", rack_id=1)
+    replica = FakeAerospikeServer(node_id="BB9FAKE00000002", rack_id=2)
+    master.replicas["test"] = [all_partitions, no_partitions]
+    replica.replicas["test"] = [no_partitions, all_partitions]
+    replica.records = master.records
+    async with master, replica:
+        yield master, replica
+
+
+async def connect(cluster, **kwargs):
+    client = ClusterClient(
+        [(server.host, server.port) for server in cluster],
+        "admin",
+        "admin",
+        **kwargs,
+    )
+    await client.connect()
+    return client
+
+
+def test_partitions():
+    assert partition_id(b"\xff\x0f" + b"\x00" * 18) == 4095
+    bitmap = pack_bitmap([0, 9, 4095])
+    assert parse_replicas(format_replicas({"test": [bitmap]})) == {
+        "test": [bitmap]
+    }
+
+
+@pytest.mark.asyncio
+async def test_master_reads(cluster):
+    master, replica = cluster
+    client = await connect(cluster)
+    await client.put_key("test", "set", "key", {"bin": 1})
+    assert await client.get_key("test", "set", "key") == {"bin": 1}
+    assert master.commands["single"] == 2
+    assert replica.commands["single"] == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_prefer_rack(cluster):
+    master, replica = cluster
+    client = await connect(
+        cluster, rack_id=2, read_policy=ReadPolicy.PREFER_RACK
+    )
+    await client.put_key("test", "set", "key", {"bin": 1})
+    assert await client.get_key("test", "set", "key") == {"bin": 1}
+    assert await client.get_many("test", "set", ["key", "missing"]) == [
+        {"bin": 1},
+        {},
+    ]
+    assert master.commands["single"] == 1
+    assert replica.commands["single"] == 1
+    assert replica.commands["batch"] == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_lowest_latency(cluster):
+    master, replica = cluster
+    master.faults.latency = 0.02
+    client = await connect(cluster, read_policy=ReadPolicy.LOWEST_LATENCY)
+    await client.put_key("test", "set", "key", {"bin": 1})
+    for _ in range(5):
+        assert await client.get_key("test", "set", "key") == {"bin": 1}
+    assert master.commands["single"] == 1
+    assert replica.commands["single"] == 5
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_reroutes_reads(cluster):
+    master, replica = cluster
+    client = await connect(
+        cluster,
+        breaker_policy=BreakerPolicy(failure_threshold=2, reset_timeout=60),
+    )
+    await client.put_key("test", "set", "key", {"bin": 1})
+    master.faults.next_errors = [ResultCode.DEVICE_OVERLOAD] * 2
+    for _ in range(2):
+        with pytest.raises(DeviceOverload):
+            await client.get_header("test", "set", "key")
+    assert await client.get_key("test", "set", "key") == {"bin": 1}
+    assert replica.commands["single"] == 1
+    with pytest.raises(CircuitOpenError):
+        await client.put_key("test", "set", "key", {"bin": 2})
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_replica_dies_mid_read(cluster):
+    master, replica = cluster
+    client = await connect(
+        cluster,
+        rack_id=2,
+        read_policy=ReadPolicy.PREFER_RACK,
+        use_streams=True,
+    )
+    await client.put_key("test", "set", "key", {"bin": 1})
+    replica.faults.latency = 0.05
+    read = asyncio.ensure_future(client.get_key("test", "set", "key"))
+    await asyncio.sleep(0.01)
+    await replica.stop()
+    assert await read == {"bin": 1}
+    assert master.commands["single"] == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_replica(cluster):
+    master, replica = cluster
+    client = await connect(
+        cluster,
+        rack_id=2,
+        read_policy=ReadPolicy.PREFER_RACK,
+        replica_timeout=0.05,
+    )
+    await client.put_key("test", "set", "key", {"bin": 1})
+    replica.faults.latency = 1
+    start = time.monotonic()
+    assert await client.get_key("test", "set", "key") == {"bin": 1}
+    assert await client.get_many("test", "set", ["key", "missing"]) == [
+        {"bin": 1},
+        {},
+    ]
+    assert time.monotonic() - start < 0.5
+    assert master.commands["single"] == 2
+    assert master.commands["batch"] == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_replica_down_batch(cluster):
+    master, replica = cluster
+    client = await connect(
+        cluster, rack_id=2, read_policy=ReadPolicy.PREFER_RACK
+    )
+    await client.put_key("test", "set", "key", {"bin": 1})
+    await replica.stop()
+    assert await client.get_many("test", "set", ["key", "missing"]) == [
+        {"bin": 1},
+        {},
+    ]
+    assert master.commands["batch"] == 1
+    await client.close()
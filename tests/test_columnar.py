@@ -0,0 +1,100 @@
+from array import array
+
+import pytest
+
+from aioaerospike import columnar
+from aioaerospike.client import AerospikeClient
+from aioaerospike.columnar import BinaryColumn, NumericColumn, ObjectColumn
+from aioaerospike.protocol.datatypes import data_to_aerospike_type
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """
+    Array type of numeric columns, with numpy or its array.array fallback
+    """
+    if request.param == "numpy":
+        return pytest.importorskip("numpy").ndarray
+    monkeypatch.setattr(columnar, "_numpy", lambda: None)
+    return array
+
+
+async def connect(server):
+    client = AerospikeClient(server.host, "admin", "admin", port=server.port)
+    await client.connect()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_get_many_columnar(fake_server, backend):
+    client = await connect(fake_server)
+    for i in range(5):
+        bins = {"int": i - 2, "float": i / 2, "str": f"é{i}", "list": [i]}
+        if i % 2:
+            bins["blob"] = bytes([i]) * i
+        await client.put_key("test", "set", i, bins)
+    result = await client.get_many_columnar("test", "set", [4, 0, 9, 1, 3])
+    assert len(result) == 5
+    assert [bool(found) for found in result.found] == [1, 1, 0, 1, 1]
+
+    assert isinstance(result["int"], NumericColumn)
+    assert isinstance(result["int"].values, backend)
+    assert list(result["int"].values) == [2, -2, 0, -1, 1]
+    assert list(result["float"].values) == [2.0, 0.0, 0.0, 0.5, 1.5]
+    assert result["int"][2] is None
+
+    column = result["str"]
+    assert isinstance(column, BinaryColumn)
+    assert [column[row] for row in range(5)] == ["é4", "é0", None, "é1", "é3"]
+    assert column.data.decode("utf-8") == "é4é0é1é3"
+    column = result["blob"]
+    assert [column[row] for row in range(5)] == [
+        None,
+        None,
+        None,
+        b"\x01",
+        b"\x03" * 3,
+    ]
+    assert [bool(present) for present in column.present] == [0, 0, 0, 1, 1]
+
+    assert isinstance(result["list"], ObjectColumn)
+    assert result["list"].values == [[4], [0], None, [1], [3]]
+
+    result = await client.get_many_columnar("test", "set", [0, 1], ["int"])
+    assert list(result.columns) == ["int"]
+    assert list(result["int"].values) == [-2, -1]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_scan_columnar(fake_server):
+    client = await connect(fake_server)
+    for i in range(300):
+        await client.put_key("test", "set", i, {"int": i, "str": str(i)})
+    result = await client.scan_columnar("test", "set")
+    assert len(result) == 300
+    assert sorted(result["int"].values) == list(range(300))
+    for row in range(len(result)):
+        value = result["int"][row]
+        assert result["str"][row] == str(value)
+        assert result.digest(row) == data_to_aerospike_type(value).digest("set")
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_mixed_types(fake_server, backend):
+    client = await connect(fake_server)
+    await client.put_key("test", "set", 0, {"num": 1, "str": "a", "int": 0})
+    await client.put_key("test", "set", 1, {"str": "b", "int": 1})
+    await client.put_key("test", "set", 2, {"num": 2.5, "str": 3, "int": 2})
+    await client.put_key("test", "set", 3, {"num": [4], "str": "d", "int": 3})
+    result = await client.get_many_columnar("test", "set", [0, 1, 2, 3, 4])
+    for name in ("num", "str"):
+        assert isinstance(result[name], ObjectColumn)
+        assert result[name].particle_type is None
+    assert result["num"].values == [1, None, 2.5, [4], None]
+    assert result["str"].values == ["a", "b", 3, "d", None]
+    assert isinstance(result["int"], NumericColumn)
+    assert isinstance(result["int"].values, backend)
+    assert list(result["int"].values) == [0, 1, 2, 3, 0]
+    await client.close()
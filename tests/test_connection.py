@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.connection import READ_BUFFER_LIMIT, ProtocolConnection
+from aioaerospike.metrics import ClientMetrics
+from aioaerospike.protocol.general import AerospikeMessage
+from aioaerospike.protocol.info import InfoMessage
+from aioaerospike.protocol.message import Message, key_exists
+
+
+@pytest.mark.asyncio
+async def test_framing():
+    data = AerospikeMessage(key_exists("test", "set", "key")).pack()
+    data += AerospikeMessage(InfoMessage(["node"])).pack()
+    connection = ProtocolConnection()
+    # Two frames, split mid header and mid body
+    connection.data_received(data[:5])
+    connection.data_received(data[5:40])
+    assert not connection._frames
+    connection.data_received(data[40:])
+    assert not connection._buffer
+
+    message_type, body = await connection.read_frame()
+    assert Message.parse(body) == key_exists("test", "set", "key")
+    message_type, body = await connection.read_frame()
+    assert InfoMessage.parse(body).commands == ["node"]
+
+
+class FakeTransport:
+    def __init__(self):
+        self.reading = True
+
+    def pause_reading(self):
+        self.reading = False
+
+    def resume_reading(self):
+        self.reading = True
+
+
+@pytest.mark.asyncio
+async def test_read_backpressure():
+    frame = AerospikeMessage(InfoMessage(["x" * 1000])).pack()
+    connection = ProtocolConnection()
+    transport = FakeTransport()
+    connection.connection_made(transport)
+    frames = 0
+    while transport.reading:
+        connection.data_received(frame)
+        frames += 1
+    assert frames * len(frame) > READ_BUFFER_LIMIT
+
+    while not transport.reading:
+        await connection.read_frame()
+        frames -= 1
+    assert len(connection._frames) == frames
+    assert frames * len(frame) > READ_BUFFER_LIMIT // 2 - len(frame)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_streams", [False, True])
+async def test_transports(fake_server, use_streams):
+    client = AerospikeClient(
+        fake_server.host,
+        "admin",
+        "admin",
+        port=fake_server.port,
+        use_streams=use_streams,
+    )
+    await client.connect()
+    await client.put_key("test", "set", "key", {"bin": 1})
+    assert await client.get_key("test", "set", "key") == {"bin": 1}
+    assert await client.get_many("test", "set", ["key", "missing"]) == [
+        {"bin": 1},
+        {},
+    ]
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_streams", [False, True])
+@pytest.mark.parametrize("metrics", [None, ClientMetrics])
+async def test_interrupted_command(fake_server, use_streams, metrics):
+    client = AerospikeClient(
+        fake_server.host,
+        "admin",
+        "admin",
+        port=fake_server.port,
+        use_streams=use_streams,
+        metrics=metrics and metrics(),
+    )
+    await client.connect()
+    await client.put_key("test", "set", "a", {"who": "a"})
+    await client.put_key("test", "set", "b", {"who": "b"})
+
+    # The reply of a timed out command isn't read by the next one
+    fake_server.faults.latency = 0.05
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(client.get_key("test", "set", "a"), 0.01)
+    fake_server.faults.latency = 0
+    assert await client.get_key("test", "set", "b") == {"who": "b"}
+
+    fake_server.faults.latency = 0.05
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            client.increment_many("test", "set", {"a": {"n": 1}}), 0.01
+        )
+    fake_server.faults.latency = 0
+    assert await client.get_key("test", "set", "b") == {"who": "b"}
+    await client.close()
@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_increment(namespace, set_name, key, client):
+    value = await client.increment(namespace, set_name, key, "counter", 5)
+    assert value == 5
+    value = await client.increment(namespace, set_name, key, "counter", -2)
+    assert value == 3
+    value = await client.increment(
+        namespace, set_name, key, "counter", return_value=False
+    )
+    assert value is None
+
+    result = await client.get_key(namespace, set_name, key)
+    assert result["counter"] == 4
+
+
+@pytest.mark.asyncio
+async def test_increment_many(namespace, set_name, client):
+    counters = {f"counter_{i}": {"hits": i, "misses": 1} for i in range(10)}
+    result = await client.increment_many(
+        namespace, set_name, counters, return_value=True
+    )
+    assert result == counters
+
+    result = await client.increment_many(namespace, set_name, counters)
+    assert result == {}
+    record = await client.get_key(namespace, set_name, "counter_3")
+    assert record == {"hits": 6, "misses": 2}
+
+
+@pytest.mark.asyncio
+async def test_append_prepend(namespace, set_name, key, client):
+    await client.put_key(namespace, set_name, key, {"text": "middle"})
+    await client.append(namespace, set_name, key, "text", "_end")
+    await client.prepend(namespace, set_name, key, "text", "start_")
+
+    result = await client.get_key(namespace, set_name, key)
+    assert result["text"] == "start_middle_end"
+
+
+@pytest.mark.asyncio
+async def test_touch(namespace, set_name, key, client):
+    await client.put_key(namespace, set_name, key, {"bin": "value"}, ttl=100)
+    before = await client.get_header(namespace, set_name, key)
+    await client.touch(namespace, set_name, key, ttl=1000)
+
+    after = await client.get_header(namespace, set_name, key)
+    assert after.generation == before.generation + 1
+    assert before.ttl <= 100
+    assert 990 <= after.ttl <= 1000
+    result = await client.get_key(namespace, set_name, key)
+    assert result["bin"] == "value"
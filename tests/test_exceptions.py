@@ -0,0 +1,81 @@
+import pytest
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.exceptions import (
+    AerospikeError,
+    DeviceOverload,
+    KeyBusy,
+    OverloadError,
+    RecordNotFound,
+    SecurityError,
+    ServerTimeout,
+    raise_for_result_code,
+)
+from aioaerospike.protocol.result_code import ResultCode
+
+
+def test_dispatch():
+    with pytest.raises(RecordNotFound) as exc_info:
+        raise_for_result_code(ResultCode.KEY_NOT_FOUND)
+    assert exc_info.value.result_code == ResultCode.KEY_NOT_FOUND
+    assert not exc_info.value.is_retryable
+    assert "KEY_NOT_FOUND" in str(exc_info.value)
+
+    with pytest.raises(SecurityError):
+        raise_for_result_code(ResultCode.NOT_AUTHENTICATED)
+
+    with pytest.raises(AerospikeError) as exc_info:
+        raise_for_result_code(255)
+    assert type(exc_info.value) is AerospikeError
+
+
+@pytest.mark.parametrize(
+    "result_code, exception_class",
+    [
+        (ResultCode.KEY_BUSY, KeyBusy),
+        (ResultCode.DEVICE_OVERLOAD, DeviceOverload),
+    ],
+)
+def test_overload(result_code, exception_class):
+    with pytest.raises(OverloadError) as exc_info:
+        raise_for_result_code(result_code)
+    assert type(exc_info.value) is exception_class
+    assert exc_info.value.is_retryable
+    assert exc_info.value.is_overload
+
+
+def test_in_doubt():
+    with pytest.raises(ServerTimeout) as exc_info:
+        raise_for_result_code(ResultCode.TIMEOUT, write=True)
+    assert exc_info.value.in_doubt
+    assert exc_info.value.is_retryable
+    assert not exc_info.value.is_overload
+
+    with pytest.raises(ServerTimeout) as exc_info:
+        raise_for_result_code(ResultCode.TIMEOUT)
+    assert not exc_info.value.in_doubt
+
+    with pytest.raises(KeyBusy) as exc_info:
+        raise_for_result_code(ResultCode.KEY_BUSY, write=True)
+    assert not exc_info.value.in_doubt
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "result_code, exception_class",
+    [
+        (ResultCode.TIMEOUT, ServerTimeout),
+        (ResultCode.DEVICE_OVERLOAD, DeviceOverload),
+    ],
+)
+async def test_get_key_error(fake_server, result_code, exception_class):
+    client = AerospikeClient(
+        fake_server.host, "admin", "admin", port=fake_server.port
+    )
+    await client.connect()
+    await client.put_key("test", "set", "key", {"bin": 1})
+    fake_server.faults.next_errors = [result_code]
+    with pytest.raises(exception_class):
+        await client.get_key("test", "set", "key")
+    assert await client.get_key("test", "set", "key") == {"bin": 1}
+    await client.close()
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.exceptions import (
+    AerospikeError,
+    DeviceOverload,
+    ParameterError,
+)
+from aioaerospike.fake_server import RECORDS_PER_FRAME
+from aioaerospike.protocol.admin import AdminCommandsType, AdminMessage
+from aioaerospike.protocol.general import (
+    AerospikeHeader,
+    AerospikeMessage,
+    MessageType,
+)
+from aioaerospike.protocol.predexp import PredExp, PredExpTags
+
+
+@pytest.fixture
+async def fake_client(fake_server):
+    client = AerospikeClient(
+        fake_server.host, "admin", "admin", port=fake_server.port
+    )
+    await client.connect()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_records_by_digest(fake_server, fake_client):
+    await fake_client.put_key("test", "set", "key", {"bin": 1})
+    assert len(fake_server.records) == 1
+    assert await fake_client.get_key("test", "set", "key") == {"bin": 1}
+    assert fake_server.commands["single"] == 2
+
+
+@pytest.mark.asyncio
+async def test_latency(fake_server, fake_client):
+    fake_server.faults.latency = 0.05
+    start = time.monotonic()
+    await fake_client.key_exists("test", "set", "key")
+    assert time.monotonic() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_errors(fake_server, fake_client):
+    fake_server.faults.next_errors = [18]
+    with pytest.raises(DeviceOverload):
+        await fake_client.put_key("test", "set", "key", {"bin": 1})
+    await fake_client.put_key("test", "set", "key", {"bin": 1})
+
+    fake_server.faults.error_rate = 1
+    with pytest.raises(AerospikeError):
+        await fake_client.put_key("test", "set", "key", {"bin": 1})
+
+
+@pytest.mark.asyncio
+async def test_unsupported_predexp(fake_server, fake_client):
+    await fake_client.put_key("test", "set", "key", {"bin": 1})
+    unsupported = [PredExp(PredExpTags.GEOJSON_BIN, b"bin")]
+    # The failed record comes frames ahead of the last one
+    keys = ["key"] + [f"missing{i}" for i in range(2 * RECORDS_PER_FRAME)]
+    connection = fake_client._connection
+    with pytest.raises(ParameterError):
+        await fake_client.get_many("test", "set", keys, predexp=unsupported)
+    with pytest.raises(ParameterError):
+        await fake_client.get_many_columnar(
+            "test", "set", keys, predexp=unsupported
+        )
+    # The rest of the response was read, the connection is kept
+    assert await fake_client.get_key("test", "set", "key") == {"bin": 1}
+    assert fake_client._connection is connection
+    with pytest.raises(ParameterError):
+        async for _ in fake_client.scan("test", "set", predexp=unsupported):
+            pass
+    assert await fake_client.get_key("test", "set", "key") == {"bin": 1}
+
+
+@pytest.mark.asyncio
+async def test_info(fake_server, fake_client):
+    result = await fake_client.info("node", "namespaces")
+    assert result == {"node": fake_server.node_id, "namespaces": "test"}
+
+
+@pytest.mark.asyncio
+async def test_login(fake_server):
+    reader, writer = await asyncio.open_connection(
+        fake_server.host, fake_server.port
+    )
+    login = AdminMessage.login("admin", "admin")
+    header = AerospikeHeader(message_type=MessageType.ADMIN, length=len(login))
+    writer.write(header.pack() + login)
+    header_data = await reader.readexactly(AerospikeHeader.FORMAT.size)
+    header = AerospikeHeader.parse(header_data)
+    data = await reader.readexactly(header.length)
+    response = AerospikeMessage.parse(header_data + data).message
+    assert response.command_type == AdminCommandsType.LOGIN
+    assert response.result_code == 0
+    writer.close()
@@ -0,0 +1,35 @@
+import pytest
+
+from aioaerospike.protocol.message import NO_EXPIRE_TTL
+
+
+@pytest.mark.asyncio
+async def test_get_selected_bins(namespace, set_name, key, client):
+    await client.put_key(
+        namespace,
+        set_name,
+        key,
+        {"small": 1, "other": "a", "blob": b"x" * 1000},
+    )
+
+    result = await client.get_key(namespace, set_name, key, bins=["small"])
+    assert result == {"small": 1}
+
+    result = await client.get_key(
+        namespace, set_name, key, bins=["small", "other"]
+    )
+    assert result == {"small": 1, "other": "a"}
+
+
+@pytest.mark.asyncio
+async def test_get_header(namespace, set_name, key, client):
+    header = await client.get_header(namespace, set_name, key)
+    assert header is None
+
+    await client.put_key(namespace, set_name, key, {"bin": 1}, ttl=1000)
+    await client.put_key(namespace, set_name, key, {"bin": 2}, ttl=1000)
+
+    header = await client.get_header(namespace, set_name, key)
+    assert header.generation == 2
+    assert 0 < header.ttl <= 1000
+    assert header.ttl != NO_EXPIRE_TTL
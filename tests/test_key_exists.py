@@ -1,5 +1,9 @@
 import pytest
 
+from aioaerospike.protocol.general import AerospikeMessage
+from aioaerospike.protocol.message import key_exists
+from aioaerospike.protocol.result_code import ResultCode
+
 
 @pytest.mark.asyncio
 async def test_key_exists(namespace, set_name, key, client):
@@ -7,8 +11,25 @@ async def test_key_exists(namespace, set_name, key, client):
     assert not exists
 
     await client.put_key(
-        namespace, set_name, key, {"bin_to_exists": "test_bin_value_to_exists"},
+        namespace,
+        set_name,
+        key,
+        {"bin_to_exists": "test_bin_value_to_exists"},
     )
 
     exists = await client.key_exists(namespace, set_name, key)
     assert exists
+
+
+@pytest.mark.asyncio
+async def test_execute_raw(namespace, set_name, key, client):
+    await client.put_key(namespace, set_name, key, {"bin": 1})
+    messages = [
+        AerospikeMessage(key_exists(namespace, set_name, k)).pack()
+        for k in (key, f"{key}_missing")
+    ]
+    responses = await client.execute_raw(messages)
+    assert [response.result_code for response in responses] == [
+        ResultCode.OK,
+        ResultCode.KEY_NOT_FOUND,
+    ]
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.metrics import (
+    PHASES,
+    ClientMetrics,
+    LatencyHistogram,
+    MetricsHook,
+)
+
+
+def test_histogram():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+    assert histogram.count == 1000
+    assert histogram.max == 1000000
+    assert 500000 <= histogram.percentile(50) <= 500000 * 1.125
+    assert 990000 <= histogram.percentile(99) <= 1000000
+    assert histogram.percentile(100) == 1000000
+
+
+def test_histogram_buckets():
+    for value in (0, 1, 7, 8, 15, 16, 17, 1000, 123456789, 2**62):
+        index = LatencyHistogram.bucket_index(value)
+        assert value <= LatencyHistogram.bucket_upper_bound(index)
+        if index:
+            assert value > LatencyHistogram.bucket_upper_bound(index - 1)
+
+
+class RecordingHook(MetricsHook):
+    def __init__(self):
+        self.samples = []
+
+    def on_command(self, sample):
+        self.samples.append(sample)
+
+
+@pytest.mark.asyncio
+async def test_client_metrics(fake_server):
+    hook = RecordingHook()
+    client = AerospikeClient(
+        fake_server.host,
+        "admin",
+        "admin",
+        port=fake_server.port,
+        metrics=ClientMetrics(hooks=[hook]),
+    )
+    await client.connect()
+
+    await asyncio.gather(
+        *(client.put_key("test", "set", i, {"bin": i}) for i in range(20))
+    )
+    await client.get_key("test", "set", "missing")
+    await client.get_many("test", "set", list(range(20)))
+
+    snapshot = client.metrics.snapshot()[client.node]
+    assert snapshot["put_key"]["count"] == 20
+    assert snapshot["put_key"]["result_codes"] == {0: 20}
+    assert snapshot["get_key"]["result_codes"] == {2: 1}
+    assert snapshot["get_many"]["count"] == 1
+    assert snapshot["get_many"]["bytes_in"] > snapshot["get_many"]["bytes_out"]
+    assert set(snapshot["put_key"]["phases_ns"]) == set(PHASES)
+    # Concurrent callers queue on the connection
+    assert snapshot["put_key"]["phases_ns"]["connection_wait"]["max"] > 0
+    assert len(hook.samples) == 22
+    await client.close()
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.exceptions import (
+    CircuitOpenError,
+    ClientOverloadError,
+    DeviceOverload,
+)
+from aioaerospike.metrics import ClientMetrics
+from aioaerospike.overload import (
+    AdaptiveLimiter,
+    BreakerPolicy,
+    CircuitBreaker,
+    CircuitState,
+    LimitPolicy,
+)
+from aioaerospike.protocol.result_code import ResultCode
+
+
+@pytest.mark.asyncio
+async def test_limiter_aimd():
+    limiter = AdaptiveLimiter(
+        LimitPolicy(initial_limit=2, max_limit=3, max_queue=1)
+    )
+    starts = [await limiter.acquire(), await limiter.acquire()]
+    queued = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    with pytest.raises(ClientOverloadError):
+        await limiter.acquire()
+
+    # Saturated and not congested, grows by 1 / limit and admits the queued
+    limiter.release(starts[0], False)
+    assert limiter.limit == 2.5
+    starts[0] = await queued
+    assert limiter.in_flight == 2
+
+    # A single decrease for commands admitted before it
+    limiter.release(starts[0], True)
+    limiter.release(starts[1], True)
+    assert limiter.limit == 1.25
+    assert limiter.in_flight == 0
+    limiter.release(await limiter.acquire(), True)
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_timeout():
+    limiter = AdaptiveLimiter(LimitPolicy(initial_limit=1, queue_timeout=0))
+    start = await limiter.acquire()
+    with pytest.raises(ClientOverloadError):
+        await limiter.acquire()
+    assert limiter.queued == 0
+    limiter.release(start, False)
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker():
+    breaker = CircuitBreaker(
+        BreakerPolicy(failure_threshold=2, reset_timeout=0.01)
+    )
+    breaker.record(True)
+    assert not breaker.allow()
+    breaker.record(True)
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    await asyncio.sleep(0.01)
+    assert not breaker.is_open
+    assert breaker.allow()
+    # Others fail fast while the probe is in flight
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CircuitState.OPEN
+
+    await asyncio.sleep(0.01)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == CircuitState.CLOSED
+    assert not breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_client_overload(fake_server):
+    metrics = ClientMetrics()
+    client = AerospikeClient(
+        fake_server.host,
+        "admin",
+        "admin",
+        port=fake_server.port,
+        metrics=metrics,
+        limit_policy=LimitPolicy(initial_limit=8, max_queue=4),
+        breaker_policy=BreakerPolicy(failure_threshold=3, reset_timeout=60),
+    )
+    await client.connect()
+    await asyncio.gather(
+        *(client.put_key("test", "set", i, {"bin": i}) for i in range(12))
+    )
+    assert fake_server.commands["single"] == 12
+    assert client.limiter.in_flight == 0
+
+    # Over the limit and queue, commands are shed without being sent
+    results = await asyncio.gather(
+        *(client.get_key("test", "set", i) for i in range(13)),
+        return_exceptions=True,
+    )
+    assert [type(result) for result in results[12:]] == [ClientOverloadError]
+    assert fake_server.commands["single"] == 24
+
+    # Grown while saturated
+    limit = client.limiter.limit
+    assert limit > 8
+    fake_server.faults.next_errors = [ResultCode.DEVICE_OVERLOAD] * 3
+    for _ in range(3):
+        with pytest.raises(DeviceOverload):
+            await client.get_header("test", "set", 0)
+    assert client.limiter.limit == limit * 0.5**3
+    with pytest.raises(CircuitOpenError):
+        await client.get_many("test", "set", [0, 1])
+    assert fake_server.commands["single"] == 24
+
+    load = metrics.load_snapshot()[client.node]
+    assert load["limit"] == 1
+    assert load["in_flight"] == load["queued"] == 0
+    assert load["circuit"] == CircuitState.OPEN
+    assert load["shed"] == {"overload": 1, "circuit_open": 1}
+    await client.close()
@@ -0,0 +1,64 @@
+import pytest
+
+from aioaerospike.exceptions import FilteredOut
+from aioaerospike.protocol import predexp
+
+
+def test_pack():
+    expressions = [
+        predexp.integer_bin("age"),
+        predexp.integer_value(21),
+        predexp.integer_greater(),
+        predexp.string_bin("name"),
+        predexp.string_value("^jo"),
+        predexp.string_regex(predexp.RegexFlags.ICASE),
+        predexp.predexp_and(2),
+    ]
+    packed = predexp.pack_predexps(expressions)
+    assert packed[:9] == b"\x00\x64\x00\x00\x00\x03age"
+    assert predexp.PredExp.parse_many(packed) == expressions
+
+
+@pytest.mark.asyncio
+async def test_get_key_predexp(namespace, set_name, key, client):
+    await client.put_key(namespace, set_name, key, {"age": 30})
+
+    older = [
+        predexp.integer_bin("age"),
+        predexp.integer_value(21),
+        predexp.integer_greater(),
+    ]
+    result = await client.get_key(namespace, set_name, key, predexp=older)
+    assert result == {"age": 30}
+
+    younger = older[:2] + [predexp.integer_less()]
+    result = await client.get_key(namespace, set_name, key, predexp=younger)
+    assert result == {}
+
+    with pytest.raises(FilteredOut):
+        await client.put_key(
+            namespace, set_name, key, {"age": 10}, predexp=younger
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_many_predexp(namespace, set_name, client):
+    for i in range(5):
+        await client.put_key(namespace, set_name, i, {"value": i})
+
+    result = await client.get_many(namespace, set_name, [0, 1, 2, 3, 4, 5])
+    assert result == [{"value": i} for i in range(5)] + [{}]
+
+    expressions = [
+        predexp.integer_bin("value"),
+        predexp.integer_value(2),
+        predexp.integer_greatereq(),
+        predexp.rec_last_update(),
+        predexp.integer_value(0),
+        predexp.integer_greater(),
+        predexp.predexp_and(2),
+    ]
+    result = await client.get_many(
+        namespace, set_name, [0, 1, 2, 3, 4], predexp=expressions
+    )
+    assert result == [{}, {}, {"value": 2}, {"value": 3}, {"value": 4}]
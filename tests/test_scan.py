@@ -0,0 +1,229 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.cluster import ClusterClient
+from aioaerospike.fake_server import FakeAerospikeServer
+from aioaerospike.protocol.message import Message
+from aioaerospike.protocol.partition import (
+    N_PARTITIONS,
+    PartitionStatus,
+    pack_bitmap,
+    partition_id,
+)
+from aioaerospike.scan import ScanCursor, parallel_scan
+
+
+async def connect(server):
+    client = AerospikeClient(server.host, "admin", "admin", port=server.port)
+    await client.connect()
+    return client
+
+
+async def fill(client, count):
+    for i in range(count):
+        await client.put_key("test", "set", i, {"bin": i})
+    await client.put_key("test", "other", 0, {"bin": -1})
+
+
+@pytest.mark.asyncio
+async def test_scan(fake_server):
+    client = await connect(fake_server)
+    for i in range(5):
+        await client.put_key("test", "set", i, {"bin": i, "name": f"n{i}"})
+    await client.put_key("test", "other", 0, {"bin": 0})
+    records = [bins async for _, bins in client.scan("test", "set")]
+    assert sorted(records, key=lambda bins: bins["bin"]) == [
+        {"bin": i, "name": f"n{i}"} for i in range(5)
+    ]
+    records = [bins async for _, bins in client.scan("test", "", ["bin"])]
+    assert len(records) == 6
+    assert all(list(bins) == ["bin"] for bins in records)
+    records = [record async for record in client.scan_raw("test", "set")]
+    assert sorted(
+        Message.parse(record).operations[0].data_bin.data.value
+        for record in records
+    ) == list(range(5))
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_scan_partitions(fake_server):
+    client = await connect(fake_server)
+    await fill(client, 50)
+    statuses = [PartitionStatus(partition) for partition in range(2048)]
+    records = [
+        (digest, bins)
+        async for digest, bins in client.scan_partitions(
+            "test", "set", statuses
+        )
+    ]
+    assert all(partition_id(digest) < 2048 for digest, _ in records)
+    assert all(status.done for status in statuses)
+    statuses += [PartitionStatus(partition) for partition in range(2048, 4096)]
+    records += [
+        (digest, bins)
+        async for digest, bins in client.scan_partitions(
+            "test", "set", statuses
+        )
+    ]
+    assert sorted(bins["bin"] for _, bins in records) == list(range(50))
+
+    # Resumes each partition after its digest
+    digest = records[0][0]
+    status = PartitionStatus(partition_id(digest), digest)
+    resumed = [
+        digest
+        async for digest, _ in client.scan_partitions("test", "set", [status])
+    ]
+    assert digest not in resumed
+    assert status.done
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_resume(fake_server):
+    clients = [await connect(fake_server) for _ in range(3)]
+    await fill(clients[0], 100)
+    cursor = ScanCursor.create("test", "set")
+    seen = []
+    async for digest, bins in parallel_scan(clients, cursor, groups=6):
+        seen.append(bins["bin"])
+        if len(seen) == 40:
+            break
+    saved = json.loads(json.dumps(cursor.to_dict()))
+    assert not cursor.done
+
+    cursor = ScanCursor.from_dict(saved)
+    async for _, bins in parallel_scan(clients, cursor, ["bin"]):
+        seen.append(bins["bin"])
+    assert cursor.done
+    assert set(seen) == set(range(100))
+    # Only the records in flight when interrupted are streamed again
+    assert len(seen) < 100 + 6
+    for client in clients:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_unavailable_partitions(fake_server):
+    fake_server.replicas["test"] = [pack_bitmap(range(N_PARTITIONS // 2))]
+    clients = [await connect(fake_server) for _ in range(2)]
+    await fill(clients[0], 50)
+    cursor = ScanCursor.create("test", "set")
+    digests = [digest async for digest, _ in parallel_scan(clients, cursor)]
+    assert all(partition_id(digest) < N_PARTITIONS // 2 for digest in digests)
+    assert [status.partition for status in cursor.pending()] == list(
+        range(N_PARTITIONS // 2, N_PARTITIONS)
+    )
+    for client in clients:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_records_per_second(fake_server):
+    clients = [await connect(fake_server) for _ in range(2)]
+    await fill(clients[0], 40)
+    start = time.perf_counter()
+    cursor = ScanCursor.create("test", "set")
+    count = len(
+        [_ async for _ in parallel_scan(clients, cursor, None, None, 400)]
+    )
+    assert count == 40
+    # Each scan gets half the budget
+    assert time.perf_counter() - start >= 0.05
+    for client in clients:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_records_per_second_below_scans(
+    fake_server, monkeypatch
+):
+    clients = [await connect(fake_server) for _ in range(3)]
+    await fill(clients[0], 40)
+    scan_partitions = AerospikeClient.scan_partitions
+    rates = []
+    running = 0
+
+    async def recording_scan(self, *args):
+        nonlocal running
+        *args, records_per_second = args
+        rates.append((records_per_second, running))
+        running += 1
+        try:
+            # Scanned unthrottled, the test only checks the shares
+            async for record in scan_partitions(self, *args, 0):
+                await asyncio.sleep(0)
+                yield record
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(AerospikeClient, "scan_partitions", recording_scan)
+    cursor = ScanCursor.create("test", "set")
+    records = [_ async for _ in parallel_scan(clients, cursor, None, None, 2)]
+    assert len(records) == 40
+    # Two scans of one record per second at a time, instead of three
+    assert all(rate == 1 and before < 2 for rate, before in rates)
+    for client in clients:
+        await client.close()
+
+
+@pytest.fixture
+async def two_nodes():
+    """
+    Two nodes sharing their records, first masters every partition
+    """
+    first = FakeAerospikeServer(node_id="BB9FAKE00000001")
+    second = FakeAerospikeServer(node_id="BB9FAKE00000002")
+    first.replicas["test"] = [pack_bitmap(range(N_PARTITIONS))]
+    second.replicas["test"] = [pack_bitmap([])]
+    second.records = first.records
+    async with first, second:
+        cluster = ClusterClient(
+            [(first.host, first.port), (second.host, second.port)],
+            "admin",
+            "admin",
+        )
+        await cluster.connect()
+        yield first, second, cluster
+        await cluster.close()
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_cluster(two_nodes):
+    first, second, cluster = two_nodes
+    await fill(cluster.nodes[0].client, 50)
+    first.replicas["test"] = [pack_bitmap(range(N_PARTITIONS // 2))]
+    second.replicas["test"] = [
+        pack_bitmap(range(N_PARTITIONS // 2, N_PARTITIONS))
+    ]
+    await cluster.refresh()
+
+    cursor = ScanCursor.create("test", "set")
+    records = [bins async for _, bins in parallel_scan(cluster, cursor)]
+    assert sorted(bins["bin"] for bins in records) == list(range(50))
+    assert cursor.done
+    assert (first.commands["scan"], second.commands["scan"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_cluster_migrated(two_nodes):
+    first, second, cluster = two_nodes
+    await fill(cluster.nodes[0].client, 50)
+    # Half the partitions migrated, the client's map is out of date
+    first.replicas["test"] = [pack_bitmap(range(N_PARTITIONS // 2))]
+    second.replicas["test"] = [
+        pack_bitmap(range(N_PARTITIONS // 2, N_PARTITIONS))
+    ]
+
+    cursor = ScanCursor.create("test", "set")
+    records = [bins async for _, bins in parallel_scan(cluster, cursor)]
+    assert sorted(bins["bin"] for bins in records) == list(range(50))
+    assert cursor.done
+    # Both groups went to the first node, its unavailable partitions then
+    # to the second
+    assert (first.commands["scan"], second.commands["scan"]) == (2, 2)
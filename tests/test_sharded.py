@@ -0,0 +1,87 @@
+import asyncio
+import pickle
+
+import pytest
+
+from aioaerospike.exceptions import RecordExists
+from aioaerospike.protocol.message import (
+    Bin,
+    ExistsPolicy,
+    Info1Flags,
+    Info2Flags,
+    Info3Flags,
+    Operation,
+    OperationTypes,
+    WritePolicy,
+)
+from aioaerospike.sharded import ShardedClient
+
+
+@pytest.fixture
+async def sharded_client(fake_server):
+    client = ShardedClient(
+        fake_server.host,
+        "admin",
+        "admin",
+        port=fake_server.port,
+        processes=2,
+        connections_per_process=2,
+    )
+    async with client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_sharded(fake_server, sharded_client):
+    keys = list(range(20))
+    await asyncio.gather(
+        *(sharded_client.put_key("test", "set", k, {"bin": k}) for k in keys)
+    )
+    assert fake_server.connections == 4
+    assert await sharded_client.get_key("test", "set", 3) == {"bin": 3}
+    results = await sharded_client.get_many("test", "set", keys + ["missing"])
+    assert results == [{"bin": k} for k in keys] + [{}]
+
+    counters = {k: {"bin": 1} for k in keys}
+    results = await sharded_client.increment_many(
+        "test", "set", counters, return_value=True
+    )
+    assert results == {k: {"bin": k + 1} for k in keys}
+
+    response = await sharded_client.operate(
+        "test",
+        "set",
+        3,
+        Info1Flags.READ,
+        Info2Flags.EMPTY,
+        Info3Flags.EMPTY,
+        [Operation(OperationTypes.READ, Bin.create("bin", None))],
+    )
+    assert response.message.operations[0].data_bin.data.value == 4
+
+
+@pytest.mark.asyncio
+async def test_sharded_errors(sharded_client):
+    policy = WritePolicy(exists=ExistsPolicy.CREATE_ONLY)
+    await sharded_client.put_key("test", "set", "key", {"bin": 1})
+    with pytest.raises(RecordExists):
+        await sharded_client.put_key(
+            "test", "set", "key", {"bin": 1}, policy=policy
+        )
+
+
+@pytest.mark.asyncio
+async def test_sharded_closed(sharded_client):
+    await sharded_client.close()
+    with pytest.raises(ConnectionError):
+        await sharded_client.get_key("test", "set", "key")
+    with pytest.raises(ConnectionError):
+        await sharded_client.get_many("test", "set", ["key"])
+
+
+@pytest.mark.asyncio
+async def test_sharded_unpicklable(sharded_client):
+    with pytest.raises((AttributeError, pickle.PicklingError)):
+        await sharded_client.put_key("test", "set", "key", {"bin": lambda: 1})
+    assert not any(shard.futures for shard in sharded_client._shards)
+    await sharded_client.put_key("test", "set", "key", {"bin": 1})
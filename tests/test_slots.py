@@ -0,0 +1,43 @@
+import pickle
+
+import pytest
+
+from aioaerospike.protocol.datatypes import AerospikeList
+from aioaerospike.protocol.general import AerospikeHeader, MessageType
+from aioaerospike.protocol.message import (
+    Bin,
+    Info1Flags,
+    Info2Flags,
+    Info3Flags,
+    Message,
+    Operation,
+    OperationTypes,
+)
+from aioaerospike.protocol.predexp import PredExp, PredExpTags
+
+
+def test_slotted_wire_objects():
+    operation = Operation(OperationTypes.WRITE, Bin.create("bin", [1, "a"]))
+    message = Message(
+        Info1Flags.EMPTY,
+        Info2Flags.WRITE,
+        Info3Flags.EMPTY,
+        0,
+        fields=[],
+        operations=[operation],
+    )
+    for instance in (message, operation, operation.data_bin.data):
+        assert not hasattr(instance, "__dict__")
+    assert message.result_code == 0
+    assert Message.parse(message.pack()).pack() == message.pack()
+    assert isinstance(operation.data_bin.data, AerospikeList)
+    predexp = PredExp(PredExpTags.AND)
+    assert pickle.loads(pickle.dumps(predexp)) == predexp
+
+
+def test_header():
+    header = AerospikeHeader(MessageType.MESSAGE, 1234)
+    assert len(header.pack()) == AerospikeHeader.FORMAT.size
+    assert AerospikeHeader.parse(header.pack()) == header
+    with pytest.raises(ValueError):
+        AerospikeHeader.parse(b"\x01" + header.pack()[1:])
@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
+
+import pytest
+
+from aioaerospike.exceptions import RecordExists
+from aioaerospike.protocol.message import ExistsPolicy, WritePolicy
+from aioaerospike.sync_client import SyncAerospikeClient
+
+
+def use_sync_client(server):
+    with SyncAerospikeClient(
+        server.host, "admin", "admin", port=server.port
+    ) as client:
+        client.connect()
+        assert client.put_key("test", "set", "key", {"bin": 1}) == 1
+        assert client.get_key("test", "set", "key") == {"bin": 1}
+        with pytest.raises(RecordExists):
+            client.put_key(
+                "test",
+                "set",
+                "key",
+                {"bin": 2},
+                policy=WritePolicy(exists=ExistsPolicy.CREATE_ONLY),
+            )
+
+        # Threads share the client and its connection
+        with ThreadPoolExecutor(8) as executor:
+            list(
+                executor.map(
+                    lambda _: client.increment("test", "set", "key", "bin"),
+                    range(100),
+                )
+            )
+        assert client.get_many("test", "set", ["key", "missing"]) == [
+            {"bin": 101},
+            {},
+        ]
+        assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_client(fake_server):
+    # The fake server runs on this loop, so block in another thread
+    await asyncio.get_event_loop().run_in_executor(
+        None, use_sync_client, fake_server
+    )
+
+
+def use_sync_client_timeout(server):
+    with SyncAerospikeClient(
+        server.host, "admin", "admin", port=server.port, timeout=0.05
+    ) as client:
+        client.connect()
+        client.put_key("test", "set", "key", {"bin": 1})
+        server.faults.latency = 0.2
+        with pytest.raises(FutureTimeoutError):
+            client.get_key("test", "set", "key")
+        # The timed out command was cancelled instead of holding the
+        # connection until its response
+        server.faults.latency = 0
+        assert client.get_key("test", "set", "key") == {"bin": 1}
+
+
+@pytest.mark.asyncio
+async def test_sync_client_timeout(fake_server):
+    await asyncio.get_event_loop().run_in_executor(
+        None, use_sync_client_timeout, fake_server
+    )
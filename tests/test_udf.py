@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from aioaerospike.client import AerospikeClient
+from aioaerospike.exceptions import UDFError
+from aioaerospike.protocol.result_code import ResultCode
+
+UDF_MODULE = b"""
+function add(rec, bin, value)
+    rec[bin] = (rec[bin] or 0) + value
+    if aerospike:exists(rec) then
+        aerospike:update(rec)
+    else
+        aerospike:create(rec)
+    end
+    return rec[bin]
+end
+
+function fail(rec)
+    error("failed on purpose")
+end
+"""
+
+
+def add(bins, bin_, value):
+    bins[bin_] = bins.get(bin_, 0) + value
+    return bins[bin_]
+
+
+def fail(bins):
+    raise Exception("failed on purpose")
+
+
+@pytest.fixture
+async def udf_client(client, server):
+    await client.register_udf("aioaerospike_test.lua", UDF_MODULE)
+    if server is not None:
+        server.register_udf("aioaerospike_test", "add", add)
+        server.register_udf("aioaerospike_test", "fail", fail)
+    else:
+        # Let the module propagate
+        await asyncio.sleep(1)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_apply(namespace, set_name, key, udf_client):
+    result = await udf_client.apply(
+        namespace, set_name, key, "aioaerospike_test", "add", ["counter", 5]
+    )
+    assert result == 5
+    result = await udf_client.apply(
+        namespace, set_name, key, "aioaerospike_test", "add", ["counter", 2]
+    )
+    assert result == 7
+
+    with pytest.raises(UDFError) as exc_info:
+        await udf_client.apply(
+            namespace, set_name, key, "aioaerospike_test", "fail"
+        )
+    assert "failed on purpose" in exc_info.value.msg
+
+
+@pytest.mark.asyncio
+async def test_scan_apply(namespace, set_name, udf_client):
+    for i in range(5):
+        await udf_client.put_key(namespace, set_name, i, {"counter": i})
+
+    task_id = await udf_client.scan_apply(
+        namespace, set_name, "aioaerospike_test", "add", ["counter", 10]
+    )
+    command = f"jobs:module=scan;cmd=get-job;trid={task_id}"
+    for _ in range(50):
+        response = await udf_client.info(command)
+        if "status=done" in response[command]:
+            break
+        await asyncio.sleep(0.1)
+
+    result = await udf_client.get_many(namespace, set_name, list(range(5)))
+    assert result == [{"counter": i + 10} for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_register_udf_error(client, monkeypatch):
+    async def info(self, *commands):
+        return {command: "error=compile_error;line=1" for command in commands}
+
+    monkeypatch.setattr(AerospikeClient, "info", info)
+    with pytest.raises(UDFError) as exc_info:
+        await client.register_udf("broken.lua", b"function")
+    assert exc_info.value.result_code == ResultCode.UDF_BAD_RESPONSE
+    assert exc_info.value.msg == "error=compile_error;line=1"
@@ -0,0 +1,68 @@
+import pytest
+
+from aioaerospike.exceptions import (
+    GenerationError,
+    RecordExists,
+    RecordNotFound,
+)
+from aioaerospike.protocol.message import (
+    ExistsPolicy,
+    GenerationPolicy,
+    WritePolicy,
+)
+
+
+@pytest.mark.asyncio
+async def test_put_returns_generation(namespace, set_name, key, client):
+    generation = await client.put_key(namespace, set_name, key, {"bin": 1})
+    assert generation == 1
+    generation = await client.put_key(namespace, set_name, key, {"bin": 2})
+    assert generation == 2
+
+
+@pytest.mark.asyncio
+async def test_create_only(namespace, set_name, key, client):
+    policy = WritePolicy(exists=ExistsPolicy.CREATE_ONLY)
+    await client.put_key(namespace, set_name, key, {"bin": 1}, policy=policy)
+    with pytest.raises(RecordExists):
+        await client.put_key(
+            namespace, set_name, key, {"bin": 2}, policy=policy
+        )
+
+
+@pytest.mark.asyncio
+async def test_update_only(namespace, set_name, key, client):
+    policy = WritePolicy(exists=ExistsPolicy.UPDATE_ONLY)
+    with pytest.raises(RecordNotFound):
+        await client.put_key(
+            namespace, set_name, key, {"bin": 1}, policy=policy
+        )
+    await client.put_key(namespace, set_name, key, {"bin": 1})
+    await client.put_key(namespace, set_name, key, {"bin": 2}, policy=policy)
+
+
+@pytest.mark.asyncio
+async def test_replace(namespace, set_name, key, client):
+    await client.put_key(namespace, set_name, key, {"bin": 1, "other": 2})
+    policy = WritePolicy(exists=ExistsPolicy.REPLACE)
+    await client.put_key(namespace, set_name, key, {"bin": 3}, policy=policy)
+    result = await client.get_key(namespace, set_name, key)
+    assert result == {"bin": 3}
+
+
+@pytest.mark.asyncio
+async def test_compare_and_set(namespace, set_name, key, client):
+    generation = await client.put_key(namespace, set_name, key, {"bin": 1})
+    policy = WritePolicy(
+        generation_policy=GenerationPolicy.EXPECT_GEN_EQUAL,
+        generation=generation,
+    )
+    await client.put_key(namespace, set_name, key, {"bin": 2}, policy=policy)
+    with pytest.raises(GenerationError):
+        await client.put_key(
+            namespace, set_name, key, {"bin": 3}, policy=policy
+        )
+    with pytest.raises(GenerationError):
+        await client.delete_key(namespace, set_name, key, policy=policy)
+    result = await client.get_key(namespace, set_name, key)
+    assert result["bin"] == 2